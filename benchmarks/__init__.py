@@ -0,0 +1 @@
+"""Suite de benchmarks reproducibles para vistas y servicios del registro de estudiantes."""
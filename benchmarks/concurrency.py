@@ -0,0 +1,142 @@
+"""Prueba de concurrencia mixta lectura/escritura sobre SQLite con varios hilos y procesos.
+
+Compara el perfil ``default`` (journal DELETE, sin busy_timeout propio)
+contra ``production`` (WAL y pragmas de ``students/db.py``) usando una base
+en archivo nueva para cada perfil::
+
+    python -m benchmarks.concurrency --processes 4 --threads 4 --seconds 5 --size 10k
+
+Cada hilo alterna lecturas (página del listado y estadísticas) con
+escrituras (cambio de estado de un estudiante vía ``save()``, con sus
+señales) y cuenta operaciones y errores "database is locked".
+"""
+from __future__ import annotations
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+def _configure(profile: str, db_path: str) -> None:
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'student_registry.settings'
+    os.environ['SQLITE_PROFILE'] = profile
+    os.environ['DJANGO_SQLITE_PATH'] = db_path
+    import django
+
+    django.setup()
+
+
+def prepare(profile: str, db_path: str, size: int) -> None:
+    """Crea el esquema y siembra los datos sintéticos en un proceso aparte."""
+    _configure(profile, db_path)
+    from django.core.management import call_command
+
+    from benchmarks.synthetic import seed_students
+
+    call_command('migrate', verbosity=0)
+    seed_students(size)
+
+
+def worker(profile: str, db_path: str, threads: int, seconds: float, write_ratio: float, seed: int) -> dict:
+    """Ejecuta ``threads`` hilos durante ``seconds`` y devuelve los contadores del proceso."""
+    _configure(profile, db_path)
+    from django.db import OperationalError, connection, transaction
+
+    from students.models import Student
+    from students.services import compute_dashboard_stats, paginate_students
+
+    max_pk = Student.objects.order_by('-pk').values_list('pk', flat=True).first() or 1
+    statuses = [value for value, _ in Student.STATUS_CHOICES]
+    totals = {'reads': 0, 'writes': 0, 'locked': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def run(thread_seed: int) -> None:
+        rnd = random.Random(thread_seed)
+        reads = writes = locked = 0
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    if rnd.random() < write_ratio:
+                        with transaction.atomic():
+                            student = Student.objects.filter(pk__gte=rnd.randint(1, max_pk)).first()
+                            if student is not None:
+                                student.estado = rnd.choice(statuses)
+                                student.save()
+                        writes += 1
+                    else:
+                        paginate_students(Student.objects.select_related('carrera'), page_size=50)
+                        compute_dashboard_stats()
+                        reads += 1
+                except OperationalError as exc:
+                    if 'locked' not in str(exc):
+                        raise
+                    locked += 1
+        finally:
+            connection.close()
+            with lock:
+                totals['reads'] += reads
+                totals['writes'] += writes
+                totals['locked'] += locked
+
+    pool = [threading.Thread(target=run, args=(seed * 1000 + index,)) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return totals
+
+
+def run_profile(profile: str, args: argparse.Namespace, workdir: Path) -> dict:
+    db_path = str(workdir / f'concurrency_{profile}.sqlite3')
+    for suffix in ('', '-wal', '-shm'):
+        Path(db_path + suffix).unlink(missing_ok=True)
+
+    context = multiprocessing.get_context('spawn')
+    setup = context.Process(target=prepare, args=(profile, db_path, args.size))
+    setup.start()
+    setup.join()
+    if setup.exitcode:
+        raise SystemExit(f"No se pudo preparar la base para el perfil {profile}.")
+
+    with context.Pool(args.processes) as pool:
+        results = pool.starmap(
+            worker,
+            [(profile, db_path, args.threads, args.seconds, args.write_ratio, index) for index in range(args.processes)],
+        )
+    summary = {key: sum(result[key] for result in results) for key in ('reads', 'writes', 'locked')}
+    summary['ops_per_second'] = round((summary['reads'] + summary['writes']) / args.seconds, 1)
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    from benchmarks.run import parse_size
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4, help="Hilos por proceso")
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--write-ratio', type=float, default=0.2, help="Fracción de operaciones que escriben")
+    parser.add_argument('--size', default='10000', help="Estudiantes a sembrar: 10k, 100k, 1m o un número")
+    parser.add_argument('--profiles', nargs='+', default=['default', 'production'])
+    args = parser.parse_args(argv)
+    args.size = parse_size(args.size)
+
+    print(f"{'perfil':<12}{'lecturas':>10}{'escrituras':>12}{'bloqueos':>10}{'ops/s':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for profile in args.profiles:
+            summary = run_profile(profile, args, Path(workdir))
+            print(
+                f"{profile:<12}{summary['reads']:>10}{summary['writes']:>12}"
+                f"{summary['locked']:>10}{summary['ops_per_second']:>10.1f}"
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
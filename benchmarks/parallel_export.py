@@ -0,0 +1,103 @@
+"""Compara la exportación secuencial contra la exportación en paralelo por rangos.
+
+Siembra una base en archivo nueva y mide CSV y Excel con distinto número de
+procesos::
+
+    python -m benchmarks.parallel_export --size 1m --workers 1 2 4 8 --chunk-size 50000
+
+La aceleración se calcula contra la exportación secuencial actual
+(``stream_students_csv`` y ``export_students_excel_file``) sobre el mismo
+orden; también se verifica que el CSV en paralelo sea idéntico byte a byte.
+La aceleración depende de los núcleos disponibles (``os.cpu_count()``).
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _configure(db_path: str) -> None:
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'student_registry.settings'
+    os.environ['DJANGO_SQLITE_PATH'] = db_path
+    import django
+
+    django.setup()
+
+
+def prepare(db_path: str, size: int) -> None:
+    """Crea el esquema y siembra los datos sintéticos en un proceso aparte."""
+    _configure(db_path)
+    from django.core.management import call_command
+
+    from benchmarks.synthetic import seed_students
+
+    call_command('migrate', verbosity=0)
+    seed_students(size)
+
+
+def _digest(path: Path) -> str:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def main(argv: list[str] | None = None) -> int:
+    from benchmarks.run import parse_size
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='100k', help="Estudiantes a sembrar: 10k, 100k, 1m o un número")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunk-size', type=int, default=50000, help="Filas por rango")
+    parser.add_argument('--formats', nargs='+', default=['csv', 'xlsx'], choices=['csv', 'xlsx'])
+    args = parser.parse_args(argv)
+    size = parse_size(args.size)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        db_path = str(workdir / 'parallel_export.sqlite3')
+        setup = multiprocessing.get_context('spawn').Process(target=prepare, args=(db_path, size))
+        setup.start()
+        setup.join()
+        if setup.exitcode:
+            raise SystemExit("No se pudo preparar la base del benchmark.")
+
+        _configure(db_path)
+        from students.models import Student
+        from students.parallel_export import export_students_csv_parallel, export_students_excel_parallel
+        from students.services import LIST_ORDERING, export_students_excel_file, stream_students_csv
+
+        students = Student.objects.order_by(*LIST_ORDERING)
+        print(f"{size} estudiantes, {os.cpu_count()} núcleos, rangos de {args.chunk_size} filas")
+        print(f"{'formato':<8}{'modo':<14}{'segundos':>10}{'filas/s':>12}{'aceleración':>13}{'idéntico':>10}")
+        for formato in args.formats:
+            serial_path = workdir / f'serial.{formato}'
+            started = time.perf_counter()
+            if formato == 'csv':
+                with serial_path.open('wb') as handle:
+                    for chunk in stream_students_csv(students):
+                        handle.write(chunk)
+            else:
+                export_students_excel_file(students, output=str(serial_path))
+            serial = time.perf_counter() - started
+            print(f"{formato:<8}{'secuencial':<14}{serial:>10.2f}{size / serial:>12.0f}{1.0:>13.2f}{'-':>10}")
+
+            export = export_students_csv_parallel if formato == 'csv' else export_students_excel_parallel
+            for workers in args.workers:
+                path = workdir / f'parallel_{workers}.{formato}'
+                started = time.perf_counter()
+                export(students, path, workers=workers, chunk_size=args.chunk_size)
+                elapsed = time.perf_counter() - started
+                # El xlsx incluye la fecha de creación en sus metadatos, así que solo se compara el CSV
+                same = ('sí' if _digest(path) == _digest(serial_path) else 'no') if formato == 'csv' else '-'
+                print(
+                    f"{formato:<8}{f'{workers} procesos':<14}{elapsed:>10.2f}"
+                    f"{size / elapsed:>12.0f}{serial / elapsed:>13.2f}{same:>10}"
+                )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Compara instancias de ``Student`` contra las filas ligeras de ``students/read_models.py``.
+
+Siembra una base en archivo nueva y mide, para el mismo queryset::
+
+    python -m benchmarks.read_models --size 10k
+    python -m benchmarks.read_models --size 1m --cases load dataframe
+
+- ``load``: materializar las filas (``select_related`` contra ``values_list``),
+  con bytes por fila medidos con ``tracemalloc``.
+- ``render``: pintar ``student_list.html`` con todas las filas.
+- ``dataframe``: ``dataframe_from_students`` contra el armado anterior con
+  instancias y diccionarios por fila (pico de memoria incluido).
+
+Los tiempos son la mediana de ``--repeat`` ejecuciones.
+"""
+from __future__ import annotations
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+CASES = ('load', 'render', 'dataframe')
+
+
+def _configure(db_path: str) -> None:
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'student_registry.settings'
+    os.environ['DJANGO_SQLITE_PATH'] = db_path
+    import django
+
+    django.setup()
+
+
+def prepare(db_path: str, size: int) -> None:
+    """Crea el esquema y siembra los datos sintéticos en un proceso aparte."""
+    _configure(db_path)
+    from django.core.management import call_command
+
+    from benchmarks.synthetic import seed_students
+
+    call_command('migrate', verbosity=0)
+    seed_students(size)
+
+
+def _measure(func: Callable[[], object], repeat: int) -> tuple[float, int]:
+    """Mediana de segundos y pico de memoria (bytes) de una ejecución aparte bajo ``tracemalloc``."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def _legacy_dataframe(students):
+    """El armado anterior de ``dataframe_from_students``: una instancia y un ``dict`` por fila."""
+    import pandas as pd
+    from django.utils import timezone
+
+    from students import catalog
+
+    return pd.DataFrame([
+        {
+            'Nombre': s.nombre,
+            'Apellido paterno': s.apellido_paterno,
+            'Apellido materno': s.apellido_materno,
+            'Carrera': catalog.career_name(s.carrera_id),
+            'Matrícula': s.matricula,
+            'Correo': s.correo,
+            'Teléfono': s.telefono,
+            'Grupo': catalog.group_code(s.grupo_id),
+            'Estado': s.estado,
+            'Fecha de nacimiento': s.fecha_nacimiento,
+            'Fecha de inscripción': s.fecha_inscripcion,
+            'Dirección': s.direccion,
+            'Registrado': timezone.make_naive(s.created_at) if timezone.is_aware(s.created_at) else s.created_at,
+        }
+        for s in students
+    ])
+
+
+def run_cases(cases: list[str], size: int, repeat: int) -> list[tuple[str, str, float, int]]:
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+
+    from students.models import Student
+    from students.read_models import StudentListRow, iter_rows
+    from students.services import LIST_ORDERING, dataframe_from_students
+
+    students = Student.objects.order_by(*LIST_ORDERING)
+    request = RequestFactory().get('/estudiantes/')
+    results = []
+    for case in cases:
+        if case == 'load':
+            variants = {
+                'modelo': lambda: list(students.select_related('carrera', 'grupo')),
+                'fila': lambda: list(iter_rows(students, StudentListRow)),
+            }
+        elif case == 'render':
+            models = list(students.select_related('carrera', 'grupo'))
+            rows = list(iter_rows(students, StudentListRow))
+            variants = {
+                'modelo': lambda: render_to_string('students/student_list.html', {'students': models}, request),
+                'fila': lambda: render_to_string('students/student_list.html', {'students': rows}, request),
+            }
+        else:
+            variants = {
+                'modelo': lambda: _legacy_dataframe(students.iterator(chunk_size=2000)),
+                'fila': lambda: dataframe_from_students(students),
+            }
+        for variant, func in variants.items():
+            seconds, peak = _measure(func, repeat)
+            results.append((case, variant, seconds, peak))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    from benchmarks.run import parse_size
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='10k', help="Estudiantes a sembrar: 10k, 100k, 1m o un número")
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=CASES)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+    size = parse_size(args.size)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = str(Path(workdir) / 'read_models.sqlite3')
+        setup = multiprocessing.get_context('spawn').Process(target=prepare, args=(db_path, size))
+        setup.start()
+        setup.join()
+        if setup.exitcode:
+            raise SystemExit("No se pudo preparar la base del benchmark.")
+
+        _configure(db_path)
+        print(f"{size} estudiantes, mediana de {args.repeat} ejecuciones")
+        print(f"{'caso':<11}{'variante':<10}{'segundos':>10}{'pico MB':>10}{'bytes/fila':>12}{'mejora':>9}")
+        baseline: dict[str, float] = {}
+        for case, variant, seconds, peak in run_cases(args.cases, size, args.repeat):
+            baseline.setdefault(case, seconds)
+            print(
+                f"{case:<11}{variant:<10}{seconds:>10.3f}{peak / 2**20:>10.1f}"
+                f"{peak / size:>12.0f}{baseline[case] / seconds:>8.2f}x"
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
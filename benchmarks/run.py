@@ -0,0 +1,318 @@
+"""Ejecuta los benchmarks y compara contra una línea base.
+
+Uso::
+
+    python -m benchmarks.run --size 10k --output resultados.json
+    python -m benchmarks.run --size 10k --baseline resultados.json --threshold 0.2
+
+Los datos se siembran en una base de pruebas aparte (``--db`` para
+conservarla entre ejecuciones con ``--keepdb``), nunca en ``db.sqlite3``.
+Para cada caso se reportan p50/p95 en ms, consultas SQL por iteración,
+memoria pico (tracemalloc) y rendimiento.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_registry.settings")
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+
+@dataclass
+class Result:
+    """Métricas de un caso de benchmark."""
+
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    queries: int
+    peak_memory_kb: float
+    ops_per_second: float
+    rows_per_second: float | None = None
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(func: Callable[[], int | None], iterations: int, warmup: int = 1) -> Result:
+    """Mide ``func``; si devuelve un entero se interpreta como filas procesadas."""
+    from django.db import connection
+
+    for _ in range(warmup):
+        func()
+
+    samples: list[float] = []
+    rows = None
+    for _ in range(iterations):
+        started = time.perf_counter()
+        rows = func()
+        samples.append(time.perf_counter() - started)
+
+    # Consultas y memoria se miden en corridas aparte para no sesgar los tiempos
+    # (execute_wrapper sobrevive al reset_queries que dispara cada petición)
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_queries):
+        func()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    mean = statistics.fmean(samples)
+    return Result(
+        iterations=iterations,
+        p50_ms=round(percentile(samples, 0.50) * 1000, 3),
+        p95_ms=round(percentile(samples, 0.95) * 1000, 3),
+        mean_ms=round(mean * 1000, 3),
+        queries=queries,
+        peak_memory_kb=round(peak / 1024, 1),
+        ops_per_second=round(1 / mean, 2) if mean else 0.0,
+        rows_per_second=round(rows / mean, 1) if rows and mean else None,
+    )
+
+
+class _StubHipolabs(BaseHTTPRequestHandler):
+    """Servidor local que imita ``/search`` de Hipolabs con una latencia fija."""
+
+    latency = 0.02
+    payload = json.dumps([
+        {
+            'name': f'Universidad {index}',
+            'country': ['Mexico', 'Canada', 'United States'][index % 3],
+            'alpha_two_code': ['MX', 'CA', 'US'][index % 3],
+            'web_pages': [f'http://u{index}.example.com/'],
+            'domains': [f'u{index}.example.com'],
+        }
+        for index in range(60)
+    ]).encode('utf-8')
+
+    def do_GET(self):  # noqa: N802 - nombre impuesto por BaseHTTPRequestHandler
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _consume(response) -> int:
+    """Lee por completo la respuesta (normal o en streaming) y devuelve los bytes."""
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def run_benchmarks(iterations: int, export_iterations: int, only: list[str] | None) -> dict[str, Result]:
+    from django.db import transaction
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    from students.forms import StudentForm
+    from students.models import Career, Group, Student
+    from asgiref.sync import async_to_sync
+
+    from students.services import fetch_universities, fetch_universities_many
+    from students.university_client import get_client
+
+    client = Client()
+    total = Student.objects.count()
+    career_id = Career.objects.values_list('pk', flat=True).first()
+    group_id = Group.objects.values_list('pk', flat=True).first()
+    list_url = reverse('students:student_list')
+
+    def get(url: str, params: dict | None = None) -> None:
+        _consume(client.get(url, params or {}))
+
+    def export(url: str) -> int:
+        _consume(client.get(url))
+        return total
+
+    cases: dict[str, tuple[Callable[[], int | None], int]] = {
+        'dashboard': (lambda: get(reverse('students:dashboard')), iterations),
+        'student_list': (lambda: get(list_url), iterations),
+        'student_list_filtered': (
+            lambda: get(list_url, {'q': 'gar', 'group': '3B', 'status': 'Inscrito'}),
+            iterations,
+        ),
+        'export_csv': (lambda: export(reverse('students:export_csv')), export_iterations),
+        'export_excel': (lambda: export(reverse('students:export_excel')), export_iterations),
+    }
+
+    counter = iter(range(10**9))
+
+    def form_save() -> None:
+        index = next(counter)
+        form = StudentForm(data={
+            'nombre': 'Benchmark',
+            'apellido_paterno': 'Pérez',
+            'apellido_materno': 'Núñez',
+            'matricula': f'BENCH{index}',
+            'correo': f'bench{index}@example.com',
+            'telefono': '+5215512345678',
+            'direccion': 'Calle 1',
+            'fecha_nacimiento': '2000-01-01',
+            'grupo': group_id,
+            'carrera': career_id,
+            'estado': 'Inscrito',
+            'fecha_inscripcion': '2024-01-01',
+        })
+        if not form.is_valid():
+            raise RuntimeError(form.errors.as_json())
+        # Se revierte para que cada iteración vea la misma tabla
+        with transaction.atomic():
+            form.save()
+            transaction.set_rollback(True)
+
+    cases['form_save'] = (form_save, iterations)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHipolabs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f'http://127.0.0.1:{server.server_port}'
+
+    def universities_cold() -> None:
+        get_client().clear()
+        fetch_universities(country='Mexico')
+
+    def universities_warm() -> None:
+        fetch_universities(country='Mexico')
+
+    def universities_many_cold() -> None:
+        # Cuatro búsquedas en paralelo: la latencia debería acercarse a la de una sola
+        get_client().clear()
+        async_to_sync(fetch_universities_many)([(country, None) for country in ('Mexico', 'Canada', 'Peru', 'Chile')])
+
+    cases['fetch_universities_cold'] = (universities_cold, iterations)
+    cases['fetch_universities_warm'] = (universities_warm, iterations)
+    cases['fetch_universities_many_cold'] = (universities_many_cold, iterations)
+
+    results: dict[str, Result] = {}
+    try:
+        with override_settings(UNIVERSITIES_API_BASE_URL=stub_url):
+            for name, (func, count) in cases.items():
+                if only and name not in only:
+                    continue
+                print(f"  {name}...", file=sys.stderr, flush=True)
+                results[name] = measure(func, count)
+    finally:
+        server.shutdown()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Lista los casos cuyo p50 empeoró más que ``threshold`` respecto a la línea base."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get('p50_ms'):
+            continue
+        change = (current['p50_ms'] - previous['p50_ms']) / previous['p50_ms']
+        if change > threshold:
+            regressions.append(
+                f"{name}: p50 {previous['p50_ms']:.2f}ms -> {current['p50_ms']:.2f}ms (+{change:.0%})"
+            )
+    return regressions
+
+
+def parse_size(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='10k', help="Estudiantes a sembrar: 10k, 100k, 1m o un número")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--export-iterations', type=int, default=3)
+    parser.add_argument('--only', nargs='*', help="Ejecuta solo estos casos")
+    parser.add_argument('--db', help="Archivo SQLite para la base de benchmarks (por defecto en memoria)")
+    parser.add_argument('--keepdb', action='store_true', help="Conserva la base de benchmarks entre ejecuciones")
+    parser.add_argument('--output', help="Guarda los resultados en este archivo JSON")
+    parser.add_argument('--baseline', help="JSON de una ejecución previa para detectar regresiones")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Tolerancia de p50 antes de marcar regresión")
+    args = parser.parse_args(argv)
+
+    import django
+    from django.conf import settings
+
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from benchmarks.synthetic import seed_students
+
+    if args.db:
+        settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = args.db
+    setup_test_environment()
+    database_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=args.keepdb)
+
+    size = parse_size(args.size)
+    started = time.perf_counter()
+    total = seed_students(size, seed=args.seed)
+    print(f"Base sembrada con {total} estudiantes en {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    results = run_benchmarks(args.iterations, args.export_iterations, args.only)
+    report = {
+        'meta': {
+            'size': size,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': {name: asdict(result) for name, result in results.items()},
+    }
+
+    print(f"{'caso':<26}{'p50 ms':>10}{'p95 ms':>10}{'SQL':>6}{'pico KB':>12}{'ops/s':>10}{'filas/s':>12}")
+    for name, result in results.items():
+        rows = f"{result.rows_per_second:,.0f}" if result.rows_per_second else '-'
+        print(
+            f"{name:<26}{result.p50_ms:>10.2f}{result.p95_ms:>10.2f}{result.queries:>6}"
+            f"{result.peak_memory_kb:>12,.0f}{result.ops_per_second:>10.1f}{rows:>12}"
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2, ensure_ascii=False)
+
+    if not args.keepdb:
+        connection.creation.destroy_test_db(database_name, verbosity=0)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+        regressions = compare(report['results'], baseline.get('results', {}), args.threshold)
+        for line in regressions:
+            print(f"REGRESIÓN {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Generador determinista de datos sintéticos para benchmarks.
+
+Con la misma semilla se generan exactamente los mismos estudiantes, de modo
+que los resultados son comparables entre ejecuciones. Los valores respetan
+las validaciones de ``StudentForm`` (nombres con acentos y ñ incluidos).
+"""
+from __future__ import annotations
+import datetime
+import random
+from typing import Iterator
+
+from students.models import Career, Group, Student
+
+CAREERS = [
+    ("Ingeniería en Sistemas", "ISC"),
+    ("Ingeniería Industrial", "IIN"),
+    ("Arquitectura", "ARQ"),
+    ("Administración", "ADM"),
+    ("Ciencia de Datos", "CDA"),
+    ("Ciberseguridad", "CIB"),
+    ("Contaduría", "CON"),
+    ("Derecho", "DER"),
+]
+FIRST_NAMES = [
+    "Ana", "Bruno", "Carla", "Diego", "Elena", "Fernando", "Gabriela", "Héctor", "Inés", "José",
+    "Karla", "Luis", "María", "Nicolás", "Olga", "Pablo", "Raúl", "Sofía", "Tomás", "Úrsula",
+    "Valeria", "Ximena", "Yolanda", "Zoé", "Begoña", "Iñaki", "Jesús", "Mónica", "Óscar", "Ángel",
+]
+LAST_NAMES = [
+    "García", "Hernández", "López", "Martínez", "González", "Pérez", "Rodríguez", "Sánchez",
+    "Ramírez", "Cruz", "Flores", "Gómez", "Morales", "Vázquez", "Jiménez", "Reyes", "Díaz",
+    "Torres", "Gutiérrez", "Ruiz", "Mendoza", "Aguilar", "Ortiz", "Núñez", "Castillo", "Muñoz",
+    "Romero", "Álvarez", "Peña", "Güemes",
+]
+GROUPS = [f"{semester}{letter}" for semester in range(1, 10) for letter in "ABCD"]
+STATUS_WEIGHTS = [("Inscrito", 70), ("Baja temporal", 10), ("Baja definitiva", 5), ("Egresado", 15)]
+
+
+def ensure_careers() -> list[int]:
+    """Crea las carreras del catálogo sintético que falten y devuelve sus ids."""
+    existing = set(Career.objects.values_list('clave', flat=True))
+    Career.objects.bulk_create(
+        Career(nombre=nombre, clave=clave) for nombre, clave in CAREERS if clave not in existing
+    )
+    return list(Career.objects.filter(clave__in=[clave for _, clave in CAREERS]).values_list('pk', flat=True))
+
+
+def ensure_groups() -> list[int]:
+    """Crea los grupos del catálogo sintético que falten y devuelve sus ids."""
+    existing = {codigo.lower() for codigo in Group.objects.values_list('codigo', flat=True)}
+    Group.objects.bulk_create(Group(codigo=codigo) for codigo in GROUPS if codigo.lower() not in existing)
+    return list(Group.objects.filter(codigo__in=GROUPS).values_list('pk', flat=True))
+
+
+def iter_students(
+    count: int, career_ids: list[int], group_ids: list[int], seed: int = 42, start: int = 0
+) -> Iterator[Student]:
+    """Genera instancias sin guardar; la ``i``-ésima depende solo de la semilla y de ``i``."""
+    statuses = [status for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+    base_birth = datetime.date(1995, 1, 1)
+    base_enrollment = datetime.date(2015, 1, 1)
+    for index in range(start, start + count):
+        rnd = random.Random(seed * 1_000_003 + index)
+        yield Student(
+            nombre=rnd.choice(FIRST_NAMES),
+            apellido_paterno=rnd.choice(LAST_NAMES),
+            apellido_materno=rnd.choice(LAST_NAMES),
+            matricula=f"S{seed:02d}{index:08d}",
+            correo=f"alumno{index}.s{seed}@example.com",
+            telefono=f"+52155{rnd.randrange(10**7, 10**8)}",
+            direccion=f"Calle {rnd.randint(1, 300)} #{rnd.randint(1, 999)}, Ciudad",
+            fecha_nacimiento=base_birth + datetime.timedelta(days=rnd.randrange(0, 3650)),
+            grupo_id=rnd.choice(group_ids),
+            carrera_id=rnd.choice(career_ids),
+            estado=rnd.choices(statuses, weights)[0],
+            fecha_inscripcion=base_enrollment + datetime.timedelta(days=rnd.randrange(0, 3650)),
+        )
+
+
+def seed_students(count: int, seed: int = 42, batch_size: int = 5000) -> int:
+    """Inserta ``count`` estudiantes sintéticos con ``bulk_create`` y devuelve el total en la tabla.
+
+    Si ya existen estudiantes de esta semilla se continúa desde el último
+    índice, así que sembrar 10k y luego 100k reutiliza los primeros 10k.
+    """
+    from students.stats import rebuild_stats
+
+    career_ids = sorted(ensure_careers())
+    group_ids = sorted(ensure_groups())
+    start = Student.objects.filter(matricula__startswith=f"S{seed:02d}").count()
+    batch: list[Student] = []
+    for student in iter_students(max(count - start, 0), career_ids, group_ids, seed=seed, start=start):
+        batch.append(student)
+        if len(batch) >= batch_size:
+            Student.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Student.objects.bulk_create(batch)
+    # bulk_create no envía señales; se recalcula la tabla materializada
+    rebuild_stats()
+    return Student.objects.count()
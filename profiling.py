@@ -2,7 +2,6 @@
 import os
 import cProfile
 import pstats
-from pathlib import Path
 from timeit import timeit
 
 # Configuramos Django para poder importar vistas/modelos sin runserver
@@ -15,7 +14,9 @@ from django.test import RequestFactory
 
 from students.views import dashboard
 from students.services import generate_group_stats
-from students.models import Student
+from students.models import Career
+
+from benchmarks.synthetic import CAREERS, GROUPS, iter_students
 
 
 def run_cprofile_dashboard():
@@ -29,11 +30,11 @@ def run_cprofile_dashboard():
 
 def measure_group_stats_time():
     """Mide con timeit la generación de estadísticas con pandas."""
-    # Crear datos simulados
-    students = [
-        Student(first_name='Test', last_name=str(i), matricula=f'M{i}', email=f'test{i}@example.com', phone='55555', group='A', status='activo')
-        for i in range(50)
-    ]
+    # Datos simulados en memoria (sin tocar la base) con el generador de benchmarks
+    careers = [Career(pk=index, nombre=nombre, clave=clave) for index, (nombre, clave) in enumerate(CAREERS, start=1)]
+    students = list(iter_students(50, [career.pk for career in careers], list(range(1, len(GROUPS) + 1))))
+    for index, student in enumerate(students):
+        student.carrera = careers[index % len(careers)]
     duration = timeit(lambda: generate_group_stats(students), number=50)
     print(f"Tiempo acumulado en generar estadísticas 50 veces: {duration:.4f} segundos")
 
@@ -28,6 +28,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero para medir la petición completa; se desactiva solo si PERFORMANCE_INSTRUMENTATION es False
+    'students.instrumentation.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,11 +61,33 @@ WSGI_APPLICATION = 'student_registry.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        # Backend sqlite3 de Django con soporte para BEGIN IMMEDIATE (ver SQLITE_TRANSACTION_MODE)
+        'ENGINE': 'student_registry.sqlite_backend',
+        'NAME': os.getenv('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        # Conexiones persistentes; se verifican antes de reutilizarse en cada petición
+        'CONN_MAX_AGE': int(os.getenv('DJANGO_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Segundos que sqlite3 espera un bloqueo antes de lanzar "database is locked"
+            'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')) / 1000,
+        },
     }
 }
 
+# Perfil de conexión SQLite aplicado en cada conexión nueva (ver students/db.py).
+# "production" activa WAL y pragmas de rendimiento; "default" deja la configuración de SQLite.
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'production')
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+    'cache_size': -int(os.getenv('SQLITE_CACHE_KB', '65536')),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_BYTES', str(256 * 1024 * 1024))),
+    'temp_store': 'MEMORY',
+} if SQLITE_PROFILE == 'production' else {}
+# Las transacciones toman el bloqueo de escritura al iniciar para que esperen en lugar de fallar
+SQLITE_TRANSACTION_MODE = 'IMMEDIATE' if SQLITE_PROFILE == 'production' else ''
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -93,5 +117,59 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Caché de Django; con DJANGO_CACHE_DIR se usa una caché en archivos compartida por todos los procesos
+if os.getenv('DJANGO_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('DJANGO_CACHE_DIR'),
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', '5000'))},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'student-registry',
+        }
+    }
+
+# Caché versionada de fragmentos (dashboard, gráficas y detalle): 'lru' (por proceso), 'django' u 'off'
+STUDENTS_FRAGMENT_CACHE = os.getenv('STUDENTS_FRAGMENT_CACHE', 'lru')
+STUDENTS_FRAGMENT_CACHE_SIZE = int(os.getenv('STUDENTS_FRAGMENT_CACHE_SIZE', '1024'))
+STUDENTS_FRAGMENT_CACHE_ALIAS = 'default'
+
+# Feed de cambios: margen para transacciones en curso y retención de bajas (compact_tombstones)
+CHANGE_FEED_SETTLE_SECONDS = int(os.getenv('CHANGE_FEED_SETTLE_SECONDS', '2'))
+CHANGE_FEED_TOMBSTONE_RETENTION_DAYS = int(os.getenv('CHANGE_FEED_TOMBSTONE_RETENTION_DAYS', '30'))
+
+# Exportaciones en segundo plano (run_export_worker): carpeta de archivos, limpieza y detección de workers caídos
+EXPORT_JOBS_DIR = Path(os.getenv('EXPORT_JOBS_DIR', BASE_DIR / 'exports'))
+EXPORT_JOBS_MAX_AGE_HOURS = float(os.getenv('EXPORT_JOBS_MAX_AGE_HOURS', '24'))
+EXPORT_JOBS_MAX_TOTAL_MB = float(os.getenv('EXPORT_JOBS_MAX_TOTAL_MB', '1024'))
+EXPORT_JOBS_STALE_SECONDS = int(os.getenv('EXPORT_JOBS_STALE_SECONDS', '300'))
+EXPORT_JOBS_POLL_SECONDS = float(os.getenv('EXPORT_JOBS_POLL_SECONDS', '2'))
+# Exportación en paralelo por rangos (parallel_export): procesos por trabajo, filas por rango y tamaño mínimo
+EXPORT_PARALLEL_WORKERS = int(os.getenv('EXPORT_PARALLEL_WORKERS', '1'))
+EXPORT_PARALLEL_CHUNK_SIZE = int(os.getenv('EXPORT_PARALLEL_CHUNK_SIZE', '50000'))
+EXPORT_PARALLEL_MIN_ROWS = int(os.getenv('EXPORT_PARALLEL_MIN_ROWS', '100000'))
+
+# Snapshot columnar para análisis (refresh_snapshot): carpeta con los arreglos .npy
+STUDENTS_SNAPSHOT_DIR = Path(os.getenv('STUDENTS_SNAPSHOT_DIR', BASE_DIR / 'snapshot'))
+
 # Configuración de API de Universidades (Hipolabs)
 UNIVERSITIES_API_BASE_URL = os.getenv('UNIVERSITIES_API_BASE_URL', 'https://universities.hipolabs.com')
+# Timeouts (conexión, lectura) en segundos y caché del cliente de universidades
+UNIVERSITIES_API_TIMEOUT = (
+    float(os.getenv('UNIVERSITIES_API_CONNECT_TIMEOUT', '3.05')),
+    float(os.getenv('UNIVERSITIES_API_READ_TIMEOUT', '12')),
+)
+UNIVERSITIES_CACHE_TTL = int(os.getenv('UNIVERSITIES_CACHE_TTL', '900'))
+UNIVERSITIES_CACHE_SIZE = int(os.getenv('UNIVERSITIES_CACHE_SIZE', '256'))
+# Búsquedas simultáneas contra la API por petición y plazo (segundos) de cada una en la vista async
+UNIVERSITIES_ASYNC_CONCURRENCY = int(os.getenv('UNIVERSITIES_ASYNC_CONCURRENCY', '4'))
+UNIVERSITIES_ASYNC_DEADLINE = float(os.getenv('UNIVERSITIES_ASYNC_DEADLINE', '8'))
+
+# Instrumentación de rendimiento por petición (Server-Timing, histogramas y log de peticiones lentas)
+PERFORMANCE_INSTRUMENTATION = os.getenv('PERFORMANCE_INSTRUMENTATION', 'False') == 'True'
+PERFORMANCE_SLOW_REQUEST_MS = int(os.getenv('PERFORMANCE_SLOW_REQUEST_MS', '500'))
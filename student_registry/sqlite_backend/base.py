@@ -0,0 +1,16 @@
+"""Backend SQLite que permite abrir transacciones con ``BEGIN IMMEDIATE``.
+
+Con ``BEGIN`` (diferido) una transacción que primero lee y luego escribe
+puede fallar al instante con "database is locked" si otro proceso escribió
+entretanto, sin respetar ``busy_timeout``. ``BEGIN IMMEDIATE`` toma el
+bloqueo de escritura al inicio y sí espera. Equivale a la opción
+``transaction_mode`` que Django agrega a partir de la versión 5.1.
+"""
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        mode = getattr(settings, 'SQLITE_TRANSACTION_MODE', '')
+        self.cursor().execute(f"BEGIN {mode}".strip())
@@ -1,6 +1,6 @@
 """Configuración del panel de administración para estudiantes."""
 from django.contrib import admin
-from .models import Career, Student
+from .models import Career, Group, Student
 
 
 @admin.register(Career)
@@ -10,6 +10,14 @@ class CareerAdmin(admin.ModelAdmin):
     ordering = ('nombre',)
 
 
+@admin.register(Group)
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('codigo', 'carrera', 'periodo', 'created_at')
+    search_fields = ('codigo',)
+    list_filter = ('carrera', 'periodo')
+    ordering = ('codigo',)
+
+
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = (
@@ -22,6 +30,7 @@ class StudentAdmin(admin.ModelAdmin):
         'estado',
         'created_at',
     )
-    search_fields = ('nombre', 'apellido_paterno', 'apellido_materno', 'matricula', 'correo', 'grupo')
+    search_fields = ('nombre', 'apellido_paterno', 'apellido_materno', 'matricula', 'correo', 'grupo__codigo')
     list_filter = ('estado', 'grupo', 'carrera')
+    list_select_related = ('grupo',)
     ordering = ('apellido_paterno', 'apellido_materno', 'nombre')
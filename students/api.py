@@ -0,0 +1,233 @@
+"""API JSON de solo lectura para el frontend (listado, detalle, dashboard y carreras).
+
+Las consultas usan ``values_list()`` con solo los campos pedidos en
+``?fields=`` (más los del orden del listado, necesarios para el cursor), así
+que no se crean instancias del modelo. En SQLite cada fila del listado sale
+ya serializada con ``json_object`` (y las fechas como texto ISO 8601 con
+``strftime``), así que Python solo une los textos; en otros motores se arma
+un ``dict`` por fila y se serializa con ``JsonResponse``. El listado reutiliza los filtros ``q``, ``group`` y
+``status`` y la paginación por cursor del listado HTML, y las respuestas se
+comprimen con gzip cuando el cliente lo acepta.
+"""
+from __future__ import annotations
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import CharField, Func, Value
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition, require_GET
+
+from . import fragment_cache
+from .changefeed import DEFAULT_BATCH_SIZE, CursorExpired, InvalidCursor, fetch_changes, latest_cursor
+from .conditional import api_list_etag, api_student_etag, list_last_modified, student_last_modified
+from .models import Career, Student
+from .reports import COHORTS, ENROLLMENTS, age_distribution, build_reports, period_report
+from .services import (
+    API_MAX_PAGE_SIZE,
+    DEFAULT_PAGE_SIZE,
+    LIST_ORDERING,
+    compute_dashboard_stats,
+    count_students_capped,
+    filter_students,
+    paginate_students,
+)
+from .views import _list_filters
+
+
+class IsoFormat(Func):
+    """Formatea una fecha como texto ISO 8601 en la base de datos.
+
+    En SQLite usa ``strftime``; en otros motores devuelve la columna tal cual
+    y ``JsonResponse`` la serializa.
+    """
+
+    function = 'strftime'
+    output_field = CharField()
+
+    def __init__(self, field: str, template: str) -> None:
+        super().__init__(Value(template), field)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return compiler.compile(self.source_expressions[1])
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+class JsonObject(Func):
+    """``json_object('campo', valor, ...)`` de SQLite: serializa la fila en la base de datos."""
+
+    function = 'json_object'
+    output_field = CharField()
+
+    def __init__(self, pairs: dict) -> None:
+        arguments = []
+        for name, expression in pairs.items():
+            arguments += [Value(name), expression]
+        super().__init__(*arguments)
+
+
+# Campos públicos -> ruta o expresión para values_list()
+STUDENT_FIELDS = {
+    'id': 'id',
+    'nombre': 'nombre',
+    'apellido_paterno': 'apellido_paterno',
+    'apellido_materno': 'apellido_materno',
+    'matricula': 'matricula',
+    'correo': 'correo',
+    'telefono': 'telefono',
+    'direccion': 'direccion',
+    'fecha_nacimiento': IsoFormat('fecha_nacimiento', '%Y-%m-%d'),
+    'grupo': 'grupo__codigo',
+    'grupo_id': 'grupo_id',
+    'carrera_id': 'carrera_id',
+    'carrera_nombre': 'carrera__nombre',
+    'estado': 'estado',
+    'fecha_inscripcion': IsoFormat('fecha_inscripcion', '%Y-%m-%d'),
+    # Las fechas con hora se guardan en UTC
+    'created_at': IsoFormat('created_at', '%Y-%m-%dT%H:%M:%fZ'),
+    'updated_at': IsoFormat('updated_at', '%Y-%m-%dT%H:%M:%fZ'),
+}
+LIST_DEFAULT_FIELDS = (
+    'id', 'nombre', 'apellido_paterno', 'apellido_materno', 'matricula', 'correo', 'grupo', 'carrera_nombre', 'estado',
+)
+
+
+class FieldSelectionError(ValueError):
+    """``?fields=`` contiene campos que no existen en la API."""
+
+
+def _selected_fields(request: HttpRequest, default: tuple[str, ...]) -> list[str]:
+    raw = request.GET.get('fields', '').strip()
+    if not raw:
+        return list(default)
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in STUDENT_FIELDS]
+    if unknown:
+        raise FieldSelectionError(f"Campos desconocidos: {', '.join(unknown)}")
+    return fields
+
+
+def _project(students, fields: list[str], prefix: tuple[str, ...] = ()):
+    """Aplica ``values_list()`` con los campos ``prefix`` seguidos de los pedidos."""
+    return students.values_list(*prefix, *(STUDENT_FIELDS[name] for name in fields))
+
+
+def _error(message: str, status: int) -> JsonResponse:
+    return JsonResponse({'error': message}, status=status)
+
+
+@require_GET
+@gzip_page
+@condition(etag_func=api_list_etag, last_modified_func=list_last_modified)
+def student_list_api(request: HttpRequest) -> JsonResponse:
+    """Página de estudiantes con los filtros del listado y cursores ``after``/``before``."""
+    try:
+        fields = _selected_fields(request, LIST_DEFAULT_FIELDS)
+        page_size = int(request.GET.get('page_size', DEFAULT_PAGE_SIZE))
+    except FieldSelectionError as exc:
+        return _error(str(exc), 400)
+    except ValueError:
+        return _error("page_size debe ser un entero.", 400)
+
+    query, group_filter, status_filter = _list_filters(request)
+    students = filter_students(Student.objects.all(), query=query, group=group_filter, status=status_filter)
+    serialize_in_db = connection.vendor == 'sqlite'
+    if serialize_in_db:
+        rows = students.values_list(*LIST_ORDERING, JsonObject({name: STUDENT_FIELDS[name] for name in fields}))
+    else:
+        rows = _project(students, fields, prefix=LIST_ORDERING)
+    # Las columnas del orden van primero para que paginate_students arme los cursores
+    page = paginate_students(
+        rows,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        page_size=page_size,
+        max_page_size=API_MAX_PAGE_SIZE,
+    )
+    total, total_capped = count_students_capped(students)
+    envelope = {
+        'count': total,
+        'count_capped': total_capped,
+        'page_size': page['page_size'],
+        'next_cursor': page['next_cursor'],
+        'previous_cursor': page['previous_cursor'],
+    }
+    offset = len(LIST_ORDERING)
+    if not serialize_in_db:
+        envelope['results'] = [dict(zip(fields, row[offset:])) for row in page['items']]
+        return JsonResponse(envelope)
+
+    head = json.dumps(envelope, cls=DjangoJSONEncoder)[:-1]
+    results = ','.join(row[offset] for row in page['items'])
+    return HttpResponse(f'{head}, "results": [{results}]}}', content_type='application/json')
+
+
+@require_GET
+@gzip_page
+@condition(etag_func=api_student_etag, last_modified_func=student_last_modified)
+def student_detail_api(request: HttpRequest, pk: int) -> JsonResponse:
+    try:
+        fields = _selected_fields(request, tuple(STUDENT_FIELDS))
+    except FieldSelectionError as exc:
+        return _error(str(exc), 400)
+    row = _project(Student.objects.filter(pk=pk), fields).first()
+    if row is None:
+        return _error("Estudiante no encontrado.", 404)
+    return JsonResponse(dict(zip(fields, row)))
+
+
+@require_GET
+@gzip_page
+def dashboard_api(request: HttpRequest) -> JsonResponse:
+    """Métricas del dashboard (las mismas del HTML, desde la caché de fragmentos)."""
+    stats = fragment_cache.get_or_set('api_dashboard', (), compute_dashboard_stats)
+    return JsonResponse(stats)
+
+
+@require_GET
+@gzip_page
+def career_list_api(request: HttpRequest) -> JsonResponse:
+    careers = fragment_cache.get_or_set(
+        'api_careers', (), lambda: list(Career.objects.values('id', 'nombre', 'clave'))
+    )
+    return JsonResponse({'results': careers})
+
+
+@require_GET
+@gzip_page
+def change_feed_api(request: HttpRequest) -> JsonResponse:
+    """Cambios posteriores a ``?cursor=`` (sin cursor, desde el inicio; ``latest`` da el cursor actual)."""
+    cursor = request.GET.get('cursor', '').strip()
+    if cursor == 'latest':
+        return JsonResponse({'cursor': latest_cursor()})
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_BATCH_SIZE))
+        return JsonResponse(fetch_changes(cursor or None, limit=limit))
+    except InvalidCursor as exc:
+        return _error(str(exc), 400)
+    except CursorExpired as exc:
+        return _error(str(exc), 410)
+    except ValueError:
+        return _error("limit debe ser un entero.", 400)
+
+
+REPORTS = {
+    'inscripciones': lambda: period_report(ENROLLMENTS),
+    'cohortes': lambda: period_report(COHORTS),
+    'edades': age_distribution,
+}
+
+
+@require_GET
+@gzip_page
+def reports_api(request: HttpRequest) -> JsonResponse:
+    """Todos los reportes, o solo el indicado con ``?reporte=inscripciones|cohortes|edades``."""
+    name = request.GET.get('reporte', '').strip()
+    if not name:
+        return JsonResponse(build_reports())
+    if name not in REPORTS:
+        return _error(f"Reporte desconocido: {name}", 400)
+    return JsonResponse({name: REPORTS[name]()})
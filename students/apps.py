@@ -5,3 +5,6 @@ class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
     verbose_name = 'Gestión de Estudiantes'
+
+    def ready(self):
+        from . import db, signals  # noqa: F401 - registra los receptores
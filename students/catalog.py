@@ -0,0 +1,141 @@
+"""Catálogo en memoria de carreras y grupos.
+
+Guarda en el proceso ``Career`` id -> ``(nombre, clave)`` y ``Group`` id ->
+código para que el formulario, los filtros del listado, las exportaciones y
+las estadísticas no consulten la base de datos en cada uso.
+
+Igual que ``fragment_cache``, la vigencia la marca una versión en la caché de
+Django (``STUDENTS_FRAGMENT_CACHE_ALIAS``, compartida entre procesos): cada
+lectura compara la versión y recarga si cambió. Las señales de ``Career`` y
+``Group`` la incrementan al confirmar la transacción; el proceso que hizo el
+cambio descarta su copia de inmediato.
+"""
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Career, Group
+
+VERSION_KEY = 'students:catalog:version'
+
+
+@dataclass(frozen=True)
+class _Catalog:
+    version: int
+    careers: dict[int, tuple[str, str]]
+    groups: dict[int, str]
+    group_ids: dict[str, int]
+
+
+_catalog: _Catalog | None = None
+_lock = threading.Lock()
+
+
+def _shared_cache():
+    return caches[getattr(settings, 'STUDENTS_FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def _current_version() -> int:
+    cache = _shared_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _bump_version() -> None:
+    cache = _shared_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _load() -> _Catalog:
+    global _catalog
+    # La versión se lee antes que los datos: un cambio posterior la incrementa y fuerza otra recarga
+    version = _current_version()
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        return catalog
+    careers = {pk: (nombre, clave) for pk, nombre, clave in Career.objects.values_list('pk', 'nombre', 'clave')}
+    groups = dict(Group.objects.values_list('pk', 'codigo'))
+    catalog = _Catalog(version, careers, groups, {codigo.lower(): pk for pk, codigo in groups.items()})
+    with _lock:
+        _catalog = catalog
+    return catalog
+
+
+def careers() -> dict[int, tuple[str, str]]:
+    """Carreras por id como ``(nombre, clave)``, en el orden de ``Career.Meta.ordering``."""
+    return _load().careers
+
+
+def career_name(career_id: int | None) -> str:
+    """Nombre de la carrera; cadena vacía si el id no existe."""
+    entry = _load().careers.get(career_id)
+    return entry[0] if entry else ''
+
+
+def career_choices() -> list[tuple[str, str]]:
+    """Opciones para un ``<select>`` de carreras con la opción vacía al inicio."""
+    return [('', '---------')] + [(str(pk), nombre) for pk, (nombre, _clave) in careers().items()]
+
+
+def career(career_id: int) -> Career | None:
+    """Instancia de ``Career`` armada desde el catálogo (sin consulta), o ``None`` si no existe."""
+    entry = _load().careers.get(career_id)
+    if entry is None:
+        return None
+    instance = Career(pk=career_id, nombre=entry[0], clave=entry[1])
+    instance._state.adding = False
+    return instance
+
+
+def group_codes() -> dict[int, str]:
+    """Códigos de grupo por id, en orden alfabético."""
+    return _load().groups
+
+
+def groups() -> list[str]:
+    """Códigos de grupo en orden alfabético."""
+    return list(_load().groups.values())
+
+
+def group_code(group_id: int | None) -> str:
+    """Código del grupo; cadena vacía si el id no existe."""
+    return _load().groups.get(group_id, '')
+
+
+def group_id(code: str) -> int | None:
+    """Id del grupo con ese código (sin distinguir mayúsculas ni espacios a los lados)."""
+    return _load().group_ids.get(code.strip().lower())
+
+
+def group_choices() -> list[tuple[str, str]]:
+    """Opciones para un ``<select>`` de grupos con la opción vacía al inicio."""
+    return [('', '---------')] + [(str(pk), codigo) for pk, codigo in _load().groups.items()]
+
+
+def group(group_id: int) -> Group | None:
+    """Instancia de ``Group`` armada desde el catálogo (sin consulta), o ``None`` si no existe."""
+    codigo = _load().groups.get(group_id)
+    if codigo is None:
+        return None
+    instance = Group(pk=group_id, codigo=codigo)
+    instance._state.adding = False
+    return instance
+
+
+def invalidate_catalog() -> None:
+    """Descarta la copia de este proceso y, al confirmar la transacción, la de los demás."""
+    global _catalog
+    with _lock:
+        _catalog = None
+    transaction.on_commit(_bump_version)
@@ -0,0 +1,200 @@
+"""Feed incremental de cambios de estudiantes para sincronizar otros sistemas.
+
+En lugar de descargar la exportación completa, el consumidor guarda un
+cursor opaco y pide los cambios posteriores:
+
+- Altas y modificaciones: filas con ``(updated_at, id)`` mayor que el
+  cursor, recorridas con el índice ``student_updated_idx``.
+- Bajas: ``StudentTombstone`` con ``id`` mayor que el cursor.
+
+Renombrar una carrera o un grupo actualiza ``updated_at`` de sus
+estudiantes (ver ``signals.touch_students_on_rename``), así que vuelven a
+aparecer en el feed con el código nuevo. Un ``QuerySet.update()`` directo
+sobre ``Career`` o ``Group`` no envía señales y obliga a sincronizar desde
+cero.
+
+Cada lote está acotado por ``limit``, así que el costo depende del número de
+cambios y no del tamaño de la tabla. Se omiten los cambios de los últimos
+``CHANGE_FEED_SETTLE_SECONDS`` para no adelantar el cursor sobre una
+transacción que aún no confirma. El consumidor aplica primero ``changes`` y
+después ``deletes``.
+
+``compact_tombstones`` borra bajas antiguas y guarda en ``ChangeCounter``
+el último id compactado: un cursor anterior a ese punto ya no puede
+reanudarse (``CursorExpired``) y debe sincronizarse desde cero.
+"""
+from __future__ import annotations
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, Max
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ChangeCounter, Student, StudentTombstone
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+COMPACTED_COUNTER = 'tombstones_compacted'
+
+CHANGE_FIELDS = (
+    'id',
+    'nombre',
+    'apellido_paterno',
+    'apellido_materno',
+    'matricula',
+    'correo',
+    'telefono',
+    'direccion',
+    'fecha_nacimiento',
+    'grupo',
+    'grupo_id',
+    'carrera_id',
+    'estado',
+    'fecha_inscripcion',
+    'created_at',
+    'updated_at',
+)
+# Campo publicado -> ruta en la base de datos: el grupo se publica con su código
+CHANGE_SOURCES = {'grupo': 'grupo__codigo'}
+
+
+class InvalidCursor(ValueError):
+    """El cursor no se pudo decodificar."""
+
+
+class CursorExpired(Exception):
+    """Las bajas posteriores al cursor ya se compactaron; hay que sincronizar desde cero."""
+
+
+def encode_feed_cursor(updated_at: datetime | None, student_id: int, tombstone_id: int) -> str:
+    raw = json.dumps(
+        {'u': updated_at.isoformat() if updated_at else None, 'i': student_id, 't': tombstone_id},
+        separators=(',', ':'),
+    ).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_feed_cursor(token: str) -> tuple[datetime | None, int, int]:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        updated_at = parse_datetime(data['u']) if data['u'] else None
+        return updated_at, int(data['i']), int(data['t'])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Cursor inválido.") from exc
+
+
+def compacted_upto() -> int:
+    """Id de la última baja eliminada por la compactación (0 si nunca se ha compactado)."""
+    return ChangeCounter.objects.filter(nombre=COMPACTED_COUNTER).values_list('valor', flat=True).first() or 0
+
+
+def _settled_until() -> datetime:
+    """Límite del feed: lo escrito en los últimos ``CHANGE_FEED_SETTLE_SECONDS`` aún no se entrega."""
+    return timezone.now() - timedelta(seconds=getattr(settings, 'CHANGE_FEED_SETTLE_SECONDS', 2))
+
+
+def latest_cursor() -> str:
+    """Cursor que apunta al estado actual, p. ej. después de una exportación completa.
+
+    Se detiene en el mismo límite que ``fetch_changes``: un cursor más adelante
+    saltaría las escrituras recientes que aún no confirman.
+    """
+    until = _settled_until()
+    with transaction.atomic():
+        head = (
+            Student.objects.filter(updated_at__lte=until)
+            .order_by('-updated_at', '-pk')
+            .values_list('updated_at', 'pk')
+            .first()
+            or (None, 0)
+        )
+        tombstones = StudentTombstone.objects.all()
+        first_recent = tombstones.filter(deleted_at__gt=until).order_by('pk').values_list('pk', flat=True).first()
+        if first_recent is not None:
+            tombstones = tombstones.filter(pk__lt=first_recent)
+        tombstone = tombstones.aggregate(last=Max('pk'))['last'] or compacted_upto()
+    return encode_feed_cursor(head[0], head[1], tombstone)
+
+
+def _after_condition(updated_at: datetime, student_id: int) -> RawSQL:
+    """``(updated_at, id) > (%s, %s)`` para recorrer el índice desde el cursor."""
+    opts = Student._meta
+    columns = f'"{opts.db_table}"."{opts.get_field("updated_at").column}", "{opts.db_table}"."{opts.pk.column}"'
+    value = connection.ops.adapt_datetimefield_value(updated_at)
+    return RawSQL(f"({columns}) > (%s, %s)", [value, student_id], output_field=BooleanField())
+
+
+def fetch_changes(cursor: str | None = None, limit: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Devuelve hasta ``limit`` altas/modificaciones y ``limit`` bajas posteriores al cursor.
+
+    El resultado incluye el ``cursor`` para la siguiente llamada y
+    ``has_more`` si quedaron cambios pendientes en alguno de los dos flujos.
+    """
+    limit = max(1, min(limit, MAX_BATCH_SIZE))
+    compacted = compacted_upto()
+    if cursor:
+        updated_at, student_id, tombstone_id = decode_feed_cursor(cursor)
+        if tombstone_id < compacted:
+            raise CursorExpired("El cursor es anterior a la última compactación de bajas.")
+    else:
+        updated_at, student_id, tombstone_id = None, 0, compacted
+
+    until = _settled_until()
+
+    # Ambas lecturas dentro de la misma transacción ven el mismo estado
+    with transaction.atomic():
+        students = Student.objects.filter(updated_at__lte=until).order_by('updated_at', 'pk')
+        if updated_at is not None:
+            students = students.filter(_after_condition(updated_at, student_id))
+        rows = students.values_list(*(CHANGE_SOURCES.get(name, name) for name in CHANGE_FIELDS))[:limit + 1]
+        changes = [dict(zip(CHANGE_FIELDS, row)) for row in rows]
+
+        tombstones = (
+            StudentTombstone.objects.filter(pk__gt=tombstone_id)
+            .order_by('pk')
+            .values('pk', 'student_id', 'matricula', 'deleted_at')
+        )
+        deletes = list(tombstones[:limit + 1])
+
+    # Se corta en la primera baja reciente: saltarla y avanzar el cursor la perdería
+    for index, row in enumerate(deletes):
+        if row['deleted_at'] > until:
+            deletes = deletes[:index]
+            break
+    has_more = len(changes) > limit or len(deletes) > limit
+    changes = changes[:limit]
+    deletes = deletes[:limit]
+    if changes:
+        updated_at, student_id = changes[-1]['updated_at'], changes[-1]['id']
+    if deletes:
+        tombstone_id = deletes[-1]['pk']
+    return {
+        'changes': changes,
+        'deletes': [
+            {'id': row['student_id'], 'matricula': row['matricula'], 'deleted_at': row['deleted_at']}
+            for row in deletes
+        ],
+        'cursor': encode_feed_cursor(updated_at, student_id, tombstone_id),
+        'has_more': has_more,
+    }
+
+
+@transaction.atomic
+def compact_tombstones(older_than: timedelta) -> int:
+    """Borra las bajas más antiguas que ``older_than``; devuelve cuántas se eliminaron."""
+    expired = StudentTombstone.objects.filter(deleted_at__lt=timezone.now() - older_than)
+    last_id = expired.aggregate(last=Max('pk'))['last']
+    if last_id is None:
+        return 0
+    # Se borra hasta last_id (no por fecha) para que el punto de compactación sea exacto
+    deleted, _ = StudentTombstone.objects.filter(pk__lte=last_id).delete()
+    ChangeCounter.objects.update_or_create(
+        nombre=COMPACTED_COUNTER,
+        defaults={'valor': max(last_id, compacted_upto())},
+    )
+    return deleted
@@ -0,0 +1,153 @@
+"""ETag y Last-Modified para el detalle, el listado y las exportaciones.
+
+Las funciones se usan con el decorador ``condition`` de Django, que responde
+``304 Not Modified`` antes de ejecutar la vista (sin consultar la página,
+renderizar plantillas ni generar archivos) cuando el cliente ya tiene la
+versión vigente.
+
+- Detalle: ``updated_at`` del estudiante más el nombre de su carrera y el código de su grupo.
+- Listado y exportaciones: marca de agua de la tabla formada por el máximo
+  de ``updated_at`` (índice ``student_updated_idx``), el total de
+  estudiantes (suma de ``StudentStat``) y el contador ``ChangeCounter``, que
+  cubre bajas y cambios de carreras o grupos.
+
+``Last-Modified`` toma además la fecha del contador para que un cliente que
+solo envía ``If-Modified-Since`` también note bajas y cambios de carreras o grupos.
+
+Cada representación lleva su propio prefijo (página HTML, exportación, API)
+y la ETag incluye la ruta con su query string, así que los filtros y los
+formatos nunca comparten validador. La página del listado pinta un
+formulario con token CSRF: su ETag incluye el secreto CSRF del cliente y no
+publica ``Last-Modified`` (un ``If-Modified-Since`` solo no puede distinguir
+sesiones).
+
+Las ETag son débiles (``W/``): el contenido equivale aunque los bytes
+cambien, p. ej. el enmascarado del token CSRF o los metadatos del xlsx.
+"""
+from __future__ import annotations
+import hashlib
+from datetime import datetime
+from typing import NamedTuple
+
+from django.contrib.messages import get_messages
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Sum
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.utils import timezone
+
+from .models import ChangeCounter, Student, StudentStat
+
+STUDENTS_COUNTER = 'students'
+
+
+class Watermark(NamedTuple):
+    last_modified: datetime | None
+    total: int
+    changes: int
+    changed_at: datetime | None
+
+
+def bump_change_counter(nombre: str = STUDENTS_COUNTER) -> None:
+    """Incrementa el contador indicado, creándolo si no existe."""
+    counters = ChangeCounter.objects.filter(nombre=nombre)
+    # update() no aplica auto_now, por eso la fecha se asigna explícitamente
+    if counters.update(valor=F('valor') + 1, actualizado=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            ChangeCounter.objects.create(nombre=nombre, valor=1)
+    except IntegrityError:
+        counters.update(valor=F('valor') + 1, actualizado=timezone.now())
+
+
+def _counter_state() -> tuple[int, datetime | None]:
+    state = ChangeCounter.objects.filter(nombre=STUDENTS_COUNTER).values_list('valor', 'actualizado').first()
+    return state or (0, None)
+
+
+def _latest(*moments: datetime | None) -> datetime | None:
+    return max((moment for moment in moments if moment is not None), default=None)
+
+
+def table_watermark() -> Watermark:
+    """Marca de agua barata de la tabla de estudiantes (tres consultas sobre índices o tablas pequeñas)."""
+    last_modified = Student.objects.aggregate(last=Max('updated_at'))['last']
+    total = StudentStat.objects.aggregate(total=Sum('total'))['total'] or 0
+    return Watermark(last_modified, total, *_counter_state())
+
+
+def _weak_etag(*parts) -> str:
+    digest = hashlib.blake2b('|'.join(map(str, parts)).encode('utf-8'), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _has_pending_messages(request: HttpRequest) -> bool:
+    # Un 304 dejaría sin mostrar los mensajes pendientes; len() no los marca como leídos
+    return bool(len(get_messages(request)))
+
+
+def _request_watermark(request: HttpRequest) -> Watermark:
+    """Calcula la marca de agua una sola vez por petición (la piden ETag y Last-Modified)."""
+    if not hasattr(request, '_students_watermark'):
+        request._students_watermark = table_watermark()
+    return request._students_watermark
+
+
+def _list_etag(request: HttpRequest, representation: str, *extra) -> str | None:
+    if _has_pending_messages(request):
+        return None
+    return _weak_etag(representation, request.get_full_path(), *extra, *_request_watermark(request))
+
+
+def list_etag(request: HttpRequest, *args, **kwargs) -> str | None:
+    """Exportaciones CSV/Excel: la ruta distingue el formato y la query string los filtros."""
+    return _list_etag(request, 'export')
+
+
+def list_page_etag(request: HttpRequest, *args, **kwargs) -> str | None:
+    """Página HTML del listado; el secreto CSRF (no el token enmascarado, que cambia en cada render) la liga al cliente."""
+    get_token(request)
+    return _list_etag(request, 'html', request.META.get('CSRF_COOKIE', ''))
+
+
+def api_list_etag(request: HttpRequest, *args, **kwargs) -> str | None:
+    return _list_etag(request, 'api')
+
+
+def list_last_modified(request: HttpRequest, *args, **kwargs) -> datetime | None:
+    if _has_pending_messages(request):
+        return None
+    watermark = _request_watermark(request)
+    return _latest(watermark.last_modified, watermark.changed_at)
+
+
+def _student_version(request: HttpRequest, pk: int) -> tuple[datetime, str, str] | None:
+    if not hasattr(request, '_student_version'):
+        request._student_version = (
+            Student.objects.filter(pk=pk).values_list('updated_at', 'carrera__nombre', 'grupo__codigo').first()
+        )
+    return request._student_version
+
+
+def student_etag(request: HttpRequest, pk: int) -> str | None:
+    version = _student_version(request, pk)
+    if version is None or _has_pending_messages(request):
+        return None
+    return _weak_etag('html', pk, *version)
+
+
+def api_student_etag(request: HttpRequest, pk: int) -> str | None:
+    version = _student_version(request, pk)
+    if version is None:
+        return None
+    # ?fields= cambia la representación
+    return _weak_etag('api', request.get_full_path(), *version)
+
+
+def student_last_modified(request: HttpRequest, pk: int) -> datetime | None:
+    version = _student_version(request, pk)
+    if version is None or _has_pending_messages(request):
+        return None
+    # Un cambio de carrera o de grupo no toca updated_at, pero sí la fecha del contador
+    return _latest(version[0], _counter_state()[1])
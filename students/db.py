@@ -0,0 +1,22 @@
+"""Perfil de conexión para SQLite aplicado con la señal ``connection_created``."""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs) -> None:
+    """Aplica ``settings.SQLITE_PRAGMAS`` (WAL, synchronous, caché, mmap...) a cada conexión nueva.
+
+    ``journal_mode=WAL`` permite lecturas concurrentes con una escritura y
+    ``busy_timeout`` hace que las escrituras esperen el bloqueo en lugar de
+    fallar de inmediato con "database is locked".
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value};")
@@ -0,0 +1,193 @@
+"""Exportaciones CSV/Excel en segundo plano con una cola en la base de datos.
+
+La vista crea un ``ExportJob`` pendiente con el formato y los filtros del
+listado; ``manage.py run_export_worker`` reclama trabajos (uno a la vez por
+proceso), escribe el archivo en ``EXPORT_JOBS_DIR`` por bloques y actualiza
+``filas_procesadas`` en cada bloque para que el usuario vea el avance. Un
+trabajo cuyo worker dejó de reportar avance por ``EXPORT_JOBS_STALE_SECONDS``
+vuelve a tomarse. ``cleanup_exports`` borra los archivos terminados por
+antigüedad y por tamaño total (y los parciales abandonados).
+
+Con ``EXPORT_PARALLEL_WORKERS`` mayor a 1, los trabajos de al menos
+``EXPORT_PARALLEL_MIN_ROWS`` filas se generan con ``parallel_export``
+(varios procesos por trabajo); el avance se reporta por rango terminado.
+"""
+from __future__ import annotations
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ExportJob, Student
+from .parallel_export import export_students_csv_parallel, export_students_excel_parallel
+from .services import export_students_excel_file, filter_students, stream_students_csv
+
+logger = logging.getLogger(__name__)
+
+FILTER_KEYS = ('q', 'group', 'status')
+
+
+def export_dir() -> Path:
+    path = Path(settings.EXPORT_JOBS_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def job_path(job: ExportJob) -> Path:
+    return export_dir() / f"{job.token}.{job.formato}"
+
+
+def enqueue_export(formato: str, filters: dict) -> ExportJob:
+    """Encola una exportación con los filtros del listado (``q``, ``group``, ``status``)."""
+    clean = {key: filters[key].strip() for key in FILTER_KEYS if filters.get(key, '').strip()}
+    return ExportJob.objects.create(formato=formato, filtros=clean)
+
+
+def claim_next_job(worker: str) -> ExportJob | None:
+    """Toma el trabajo pendiente más antiguo (o uno abandonado) y lo marca en proceso."""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.EXPORT_JOBS_STALE_SECONDS)
+    claimable = Q(estado=ExportJob.STATUS_PENDING) | Q(
+        estado=ExportJob.STATUS_RUNNING, heartbeat_at__lt=stale_before
+    )
+    with transaction.atomic():
+        candidate = (
+            ExportJob.objects.filter(claimable).order_by('created_at').values_list('pk', flat=True).first()
+        )
+        if candidate is None:
+            return None
+        # Actualización condicional: si otro worker lo tomó primero no se modifica ninguna fila
+        claimed = ExportJob.objects.filter(claimable, pk=candidate).update(
+            estado=ExportJob.STATUS_RUNNING,
+            worker=worker,
+            started_at=now,
+            heartbeat_at=now,
+            filas_procesadas=0,
+            error='',
+        )
+    return ExportJob.objects.get(pk=candidate) if claimed else None
+
+
+class ClaimLost(Exception):
+    """Otro worker volvió a tomar el trabajo (este dejó de reportar avance a tiempo)."""
+
+
+def claimed_jobs(job: ExportJob):
+    """Queryset del trabajo solo mientras siga reclamado por este worker (``worker`` y ``started_at``)."""
+    return ExportJob.objects.filter(
+        pk=job.pk, estado=ExportJob.STATUS_RUNNING, worker=job.worker, started_at=job.started_at
+    )
+
+
+def run_job(job: ExportJob) -> None:
+    """Genera el archivo del trabajo registrando el avance; los errores quedan en el trabajo.
+
+    Todas las actualizaciones se limitan al reclamo de este worker: si otro lo
+    retomó por falta de avance, este deja de escribir y descarta su archivo
+    parcial, que además es propio de cada reclamo.
+    """
+    jobs = claimed_jobs(job)
+    filters = job.filtros or {}
+    students = filter_students(
+        Student.objects.all(),
+        query=filters.get('q', ''),
+        group=filters.get('group', ''),
+        status=filters.get('status', ''),
+    )
+    final_path = job_path(job)
+    claim = int(job.started_at.timestamp() * 1_000_000)
+    partial_path = final_path.with_name(f"{final_path.name}.{claim}.part")
+
+    def progress(count: int) -> None:
+        if not jobs.update(filas_procesadas=count, heartbeat_at=timezone.now()):
+            raise ClaimLost
+
+    try:
+        total = students.count()
+        if not jobs.update(total_filas=total):
+            raise ClaimLost
+        if settings.EXPORT_PARALLEL_WORKERS > 1 and total >= settings.EXPORT_PARALLEL_MIN_ROWS:
+            export = export_students_excel_parallel if job.formato == 'xlsx' else export_students_csv_parallel
+            export(students, partial_path, progress=progress)
+        elif job.formato == 'xlsx':
+            export_students_excel_file(students, output=str(partial_path), progress=progress)
+        else:
+            with partial_path.open('wb') as handle:
+                for chunk in stream_students_csv(students, progress=progress):
+                    handle.write(chunk)
+        # El cambio de estado bloquea la fila hasta publicar el archivo: un reclamo simultáneo espera o ya ganó
+        with transaction.atomic():
+            finished = jobs.update(
+                estado=ExportJob.STATUS_DONE,
+                archivo=final_path.name,
+                tamano_bytes=partial_path.stat().st_size,
+                finished_at=timezone.now(),
+            )
+            if not finished:
+                raise ClaimLost
+            os.replace(partial_path, final_path)
+    except ClaimLost:
+        logger.warning("La exportación %s fue retomada por otro worker; se descarta este intento", job.token)
+        partial_path.unlink(missing_ok=True)
+    except Exception as exc:
+        logger.exception("Falló la exportación %s", job.token)
+        partial_path.unlink(missing_ok=True)
+        jobs.update(estado=ExportJob.STATUS_FAILED, error=str(exc), finished_at=timezone.now())
+
+
+def worker_loop(poll_interval: float = 2.0, once: bool = False, name: str | None = None) -> int:
+    """Procesa trabajos hasta que se detenga el proceso; con ``once`` termina al vaciar la cola."""
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+    while True:
+        job = claim_next_job(name)
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        logger.info("Worker %s procesa la exportación %s", name, job.token)
+        run_job(job)
+        processed += 1
+
+
+def cleanup_exports(max_age: timedelta | None = None, max_total_bytes: int | None = None) -> int:
+    """Expira exportaciones terminadas más antiguas que ``max_age`` o que excedan el tamaño total.
+
+    Se conservan las más recientes mientras quepan en ``max_total_bytes``.
+    Devuelve el número de archivos eliminados.
+    """
+    if max_age is None:
+        max_age = timedelta(hours=settings.EXPORT_JOBS_MAX_AGE_HOURS)
+    if max_total_bytes is None:
+        max_total_bytes = settings.EXPORT_JOBS_MAX_TOTAL_MB * 1024 * 1024
+    cutoff = timezone.now() - max_age
+
+    finished = (
+        ExportJob.objects.filter(estado=ExportJob.STATUS_DONE)
+        .order_by('-finished_at')
+        .values_list('pk', 'token', 'formato', 'finished_at', 'tamano_bytes')
+    )
+    kept_bytes = 0
+    expired: list[int] = []
+    directory = export_dir()
+    for pk, token, formato, finished_at, size in finished:
+        size = size or 0
+        if finished_at >= cutoff and kept_bytes + size <= max_total_bytes:
+            kept_bytes += size
+            continue
+        (directory / f"{token}.{formato}").unlink(missing_ok=True)
+        expired.append(pk)
+    ExportJob.objects.filter(pk__in=expired).update(estado=ExportJob.STATUS_EXPIRED, archivo='')
+    # Parciales de reclamos que murieron sin limpiar (cada reclamo escribe el suyo)
+    for partial in directory.glob('*.part'):
+        if partial.stat().st_mtime < cutoff.timestamp():
+            partial.unlink(missing_ok=True)
+    return len(expired)
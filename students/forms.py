@@ -2,7 +2,25 @@
 import re
 from django import forms
 from django.core.validators import RegexValidator
-from .models import Career, Student
+from . import catalog
+from .models import Student
+
+
+class CatalogChoiceField(forms.ChoiceField):
+    """Selector alimentado por el catálogo en memoria (``catalog``).
+
+    Sustituye a ``ModelChoiceField`` para no consultar la base de datos al
+    pintar las opciones ni al validar; ``clean`` devuelve la instancia que
+    arma ``instance`` a partir del id elegido.
+    """
+
+    def __init__(self, choices, instance, **kwargs):
+        super().__init__(choices=choices, **kwargs)
+        self.instance = instance
+
+    def clean(self, value):
+        value = super().clean(value)
+        return self.instance(int(value)) if value else None
 
 
 class StudentForm(forms.ModelForm):
@@ -20,19 +38,15 @@ class StudentForm(forms.ModelForm):
         regex=r"^[+0-9][0-9\-\s]{5,}$",
         message="Usa solo números, espacios o guiones (mínimo 6 caracteres).",
     )
-    group_validator = RegexValidator(
-        regex=r"^[A-Za-z0-9\-\s]+$",
-        message="El grupo solo permite letras, números y guiones.",
-    )
 
     nombre = forms.CharField(label="Nombre", max_length=100, validators=[name_validator])
     apellido_paterno = forms.CharField(label="Apellido paterno", max_length=100, validators=[name_validator])
     apellido_materno = forms.CharField(label="Apellido materno", max_length=100, validators=[name_validator])
-    carrera = forms.ModelChoiceField(label="Carrera", queryset=Career.objects.all())
+    carrera = CatalogChoiceField(catalog.career_choices, catalog.career, label="Carrera")
     matricula = forms.CharField(label="Matrícula", max_length=20, validators=[matricula_validator])
     correo = forms.EmailField(label="Correo electrónico")
     telefono = forms.CharField(label="Teléfono", max_length=15, validators=[phone_validator])
-    grupo = forms.CharField(label="Grupo", max_length=10, validators=[group_validator])
+    grupo = CatalogChoiceField(catalog.group_choices, catalog.group, label="Grupo")
     estado = forms.ChoiceField(label="Estado", choices=Student.STATUS_CHOICES)
     direccion = forms.CharField(label="Dirección", widget=forms.Textarea(attrs={'rows': 2}))
     fecha_nacimiento = forms.DateField(label="Fecha de nacimiento", widget=forms.DateInput(attrs={'type': 'date'}))
@@ -68,6 +82,12 @@ class StudentForm(forms.ModelForm):
             if isinstance(field.widget, forms.TextInput):
                 field.widget.attrs['maxlength'] = getattr(field, 'max_length', '') or ''
 
+    def _get_validation_exclusions(self):
+        # Carrera y grupo ya se validaron contra el catálogo; se evitan las consultas de existencia de las llaves
+        exclusions = super()._get_validation_exclusions()
+        exclusions.update({'carrera', 'grupo'})
+        return exclusions
+
     def clean_telefono(self):
         """Valida longitud y formato del teléfono."""
         phone = self.cleaned_data.get('telefono', '').strip()
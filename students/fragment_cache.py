@@ -0,0 +1,141 @@
+"""Caché versionada de fragmentos renderizados (dashboard, gráficas y detalle).
+
+Cada llave incluye un número de generación que se incrementa al guardar o
+borrar un ``Student`` o una ``Career`` (ver ``signals``), así que las
+entradas anteriores quedan inaccesibles sin depender de un TTL. La
+generación vive en la caché de Django (``STUDENTS_FRAGMENT_CACHE_ALIAS``),
+que debe ser compartida entre procesos (p. ej. ``FileBasedCache``) para que
+todos vean los cambios.
+
+Los fragmentos se guardan en una LRU propia del proceso
+(``STUDENTS_FRAGMENT_CACHE='lru'``) o en la misma caché de Django
+(``'django'``); con ``'off'`` siempre se recalculan. ``fragment_cache_stats``
+reporta aciertos y fallos por fragmento.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+T = TypeVar('T')
+
+GENERATION_KEY = 'students:fragments:generation'
+
+_MISSING = object()
+
+_lru: OrderedDict[str, Any] = OrderedDict()
+_lru_lock = threading.Lock()
+_counters: dict[str, list[int]] = {}
+_counters_lock = threading.Lock()
+
+
+def _mode() -> str:
+    return getattr(settings, 'STUDENTS_FRAGMENT_CACHE', 'lru')
+
+
+def _shared_cache():
+    return caches[getattr(settings, 'STUDENTS_FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def current_generation() -> int:
+    """Generación vigente; se inicializa con la hora para no repetir valores si la caché se vacía."""
+    cache = _shared_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation() -> None:
+    """Invalida todos los fragmentos incrementando la generación."""
+    cache = _shared_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_fragments() -> None:
+    """Incrementa la generación al confirmar la transacción en curso (o de inmediato en autocommit).
+
+    Hacerlo antes del commit permitiría que otra petición guardara datos viejos
+    bajo la generación nueva.
+    """
+    transaction.on_commit(bump_generation)
+
+
+def _count(name: str, hit: bool) -> None:
+    with _counters_lock:
+        counters = _counters.setdefault(name, [0, 0])
+        counters[0 if hit else 1] += 1
+
+
+def _lru_get(key: str) -> Any:
+    with _lru_lock:
+        value = _lru.get(key, _MISSING)
+        if value is not _MISSING:
+            _lru.move_to_end(key)
+        return value
+
+
+def _lru_set(key: str, value: Any) -> None:
+    max_entries = getattr(settings, 'STUDENTS_FRAGMENT_CACHE_SIZE', 1024)
+    with _lru_lock:
+        _lru[key] = value
+        _lru.move_to_end(key)
+        while len(_lru) > max_entries:
+            _lru.popitem(last=False)
+
+
+def get_or_set(name: str, parts: tuple, producer: Callable[[], T]) -> T:
+    """Devuelve el fragmento ``name`` (con sus ``parts``) o lo calcula con ``producer``."""
+    mode = _mode()
+    if mode == 'off':
+        return producer()
+
+    key = ':'.join(['students:fragment', str(current_generation()), name, *map(str, parts)])
+    if mode == 'django':
+        cache = _shared_cache()
+        value = cache.get(key, _MISSING)
+    else:
+        value = _lru_get(key)
+    _count(name, value is not _MISSING)
+    if value is not _MISSING:
+        return value
+
+    value = producer()
+    if mode == 'django':
+        # Sin TTL: la generación es la que invalida; la caché depura por MAX_ENTRIES
+        cache.set(key, value, timeout=None)
+    else:
+        _lru_set(key, value)
+    return value
+
+
+def fragment_cache_stats() -> dict[str, dict]:
+    """Aciertos, fallos y tasa de aciertos por fragmento en este proceso."""
+    with _counters_lock:
+        counters = {name: list(values) for name, values in sorted(_counters.items())}
+    return {
+        name: {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
+        for name, (hits, misses) in counters.items()
+    }
+
+
+def clear_fragments() -> None:
+    """Vacía la LRU local y los contadores, e invalida la caché compartida."""
+    with _lru_lock:
+        _lru.clear()
+    with _counters_lock:
+        _counters.clear()
+    bump_generation()
@@ -0,0 +1,285 @@
+"""Importación masiva de estudiantes desde CSV o XLSX.
+
+Los archivos usan las mismas columnas que genera la exportación
+(``EXPORT_COLUMNS``). Las filas se leen como flujo, se validan por lotes con
+las mismas reglas de ``StudentForm`` y se escriben con ``bulk_create`` dentro
+de una transacción por lote.
+"""
+from __future__ import annotations
+import csv
+import datetime
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from .catalog import invalidate_catalog
+from .forms import StudentForm
+from .models import Career, Group, Student, group_code_validator
+from .services import EXPORT_COLUMNS
+from .stats import rebuild_stats
+
+# Encabezado del archivo -> campo del modelo ('Registrado' se ignora)
+COLUMN_FIELDS = {header: name for header, name in EXPORT_COLUMNS if name != 'created_at'}
+COLUMN_FIELDS['Carrera'] = 'carrera'
+COLUMN_FIELDS['Grupo'] = 'grupo'
+UPDATE_FIELDS = [name for name in COLUMN_FIELDS.values() if name != 'matricula'] + ['updated_at']
+NAME_FIELDS = ('nombre', 'apellido_paterno', 'apellido_materno')
+STATUS_VALUES = {value for value, _ in Student.STATUS_CHOICES}
+DEFAULT_BATCH_SIZE = 1000
+
+
+@dataclass
+class RowError:
+    """Error de validación de una fila del archivo (la fila 2 es la primera de datos)."""
+
+    row: int
+    matricula: str
+    messages: list[str]
+
+
+@dataclass
+class ImportReport:
+    """Resumen de una importación con errores por fila y rendimiento."""
+
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(path: str | Path) -> Iterator[dict]:
+    """Lee el archivo como flujo de diccionarios encabezado -> valor."""
+    path = Path(path)
+    if path.suffix.lower() == '.xlsx':
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [str(value).strip() if value is not None else '' for value in next(rows, ())]
+            for values in rows:
+                if not any(value not in (None, '') for value in values):
+                    continue
+                yield dict(zip(headers, values))
+        finally:
+            workbook.close()
+        return
+
+    with path.open(newline='', encoding='utf-8-sig') as handle:
+        yield from csv.DictReader(handle)
+
+
+def _as_text(value) -> str:
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _as_date(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    # Se aceptan fechas ISO con o sin hora, como las escribe la exportación
+    return datetime.date.fromisoformat(_as_text(value)[:10])
+
+
+def _career_map() -> dict[str, int]:
+    """Mapa en memoria de clave y nombre (en minúsculas) de carrera a su id."""
+    mapping: dict[str, int] = {}
+    for pk, nombre, clave in Career.objects.values_list('pk', 'nombre', 'clave'):
+        mapping[clave.casefold()] = pk
+        mapping[nombre.casefold()] = pk
+    return mapping
+
+
+def _group_map() -> dict[str, int]:
+    """Mapa en memoria de código de grupo (en minúsculas) a su id."""
+    return {codigo.lower(): pk for pk, codigo in Group.objects.values_list('pk', 'codigo')}
+
+
+def _resolve_groups(valid: list[tuple[int, dict]], groups: dict[str, int], create: bool) -> None:
+    """Sustituye el código de grupo por ``grupo_id``, creando los grupos que no existan."""
+    missing = {}
+    for _, data in valid:
+        missing.setdefault(data['grupo'].lower(), data['grupo'])
+    missing = {key: codigo for key, codigo in missing.items() if key not in groups}
+    if missing and create:
+        Group.objects.bulk_create([Group(codigo=codigo) for codigo in missing.values()], ignore_conflicts=True)
+        groups.update(
+            (codigo.lower(), pk)
+            for pk, codigo in Group.objects.annotate(codigo_ci=Lower('codigo'))
+            .filter(codigo_ci__in=list(missing))
+            .values_list('pk', 'codigo')
+        )
+        # bulk_create no envía señales
+        invalidate_catalog()
+    for _, data in valid:
+        data['grupo_id'] = groups.get(data.pop('grupo').lower())
+
+
+def validate_row(raw: dict, careers: dict[str, int]) -> tuple[dict, list[str]]:
+    """Limpia una fila con las reglas de ``StudentForm``; devuelve datos y errores."""
+    data: dict = {}
+    errors: list[str] = []
+    for header, name in COLUMN_FIELDS.items():
+        data[name] = _as_text(raw.get(header))
+        if not data[name]:
+            errors.append(f"{header}: este campo es obligatorio.")
+
+    for name in NAME_FIELDS:
+        if data[name] and not StudentForm.name_validator.regex.match(data[name]):
+            errors.append(f"{name}: {StudentForm.name_validator.message}")
+    if data['matricula'] and not StudentForm.matricula_validator.regex.match(data['matricula']):
+        errors.append(f"matricula: {StudentForm.matricula_validator.message}")
+    if data['telefono'] and (
+        len(data['telefono']) < 6 or not StudentForm.phone_validator.regex.match(data['telefono'])
+    ):
+        errors.append(f"telefono: {StudentForm.phone_validator.message}")
+    if data['grupo'] and not group_code_validator.regex.match(data['grupo']):
+        errors.append(f"grupo: {group_code_validator.message}")
+    if data['correo']:
+        try:
+            validate_email(data['correo'])
+        except ValidationError:
+            errors.append("correo: introduce una dirección de correo válida.")
+    if data['estado'] and data['estado'] not in STATUS_VALUES:
+        errors.append(f"estado: '{data['estado']}' no es una opción válida.")
+
+    for name in ('nombre', 'apellido_paterno', 'apellido_materno', 'matricula', 'telefono', 'grupo'):
+        model = Group if name == 'grupo' else Student
+        max_length = model._meta.get_field('codigo' if name == 'grupo' else name).max_length
+        if len(data[name]) > max_length:
+            errors.append(f"{name}: máximo {max_length} caracteres.")
+
+    for name, header in (('fecha_nacimiento', 'Fecha de nacimiento'), ('fecha_inscripcion', 'Fecha de inscripción')):
+        if data[name]:
+            try:
+                data[name] = _as_date(raw.get(header))
+            except ValueError:
+                errors.append(f"{name}: fecha inválida, usa el formato AAAA-MM-DD.")
+
+    carrera = data.pop('carrera')
+    if carrera:
+        data['carrera_id'] = careers.get(carrera.casefold())
+        if data['carrera_id'] is None:
+            errors.append(f"carrera: '{carrera}' no existe en el catálogo.")
+    return data, errors
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[list[tuple[int, dict]]]:
+    batch: list[tuple[int, dict]] = []
+    for number, raw in enumerate(rows, start=2):
+        batch.append((number, raw))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_students(
+    rows: Iterable[dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    upsert: bool = False,
+    dry_run: bool = False,
+) -> ImportReport:
+    """Valida e inserta filas por lotes.
+
+    Con ``upsert=True`` las matrículas existentes se actualizan
+    (``ON CONFLICT (matricula) DO UPDATE``); si no, se reportan como error.
+    Cada lote se escribe en su propia transacción y al final se reconstruye
+    la tabla ``StudentStat``.
+    """
+    report = ImportReport()
+    careers = _career_map()
+    groups = _group_map()
+    seen_matriculas: set[str] = set()
+    seen_correos: set[str] = set()
+    started = time.perf_counter()
+
+    for batch in _chunks(rows, batch_size):
+        valid: list[tuple[int, dict]] = []
+        for number, raw in batch:
+            report.processed += 1
+            data, errors = validate_row(raw, careers)
+            matricula = data.get('matricula', '')
+            correo = data.get('correo', '').casefold()
+            if matricula and matricula in seen_matriculas:
+                errors.append("matricula: repetida dentro del archivo.")
+            if correo and correo in seen_correos:
+                errors.append("correo: repetido dentro del archivo.")
+            seen_matriculas.add(matricula)
+            seen_correos.add(correo)
+            if errors:
+                report.errors.append(RowError(number, matricula, errors))
+            else:
+                valid.append((number, data))
+
+        # Una consulta por lote para detectar conflictos con la base de datos
+        existing = set(
+            Student.objects.filter(matricula__in=[data['matricula'] for _, data in valid])
+            .values_list('matricula', flat=True)
+        )
+        taken_by = {
+            correo.casefold(): matricula
+            for matricula, correo in Student.objects.filter(
+                correo__in=[data['correo'] for _, data in valid]
+            ).values_list('matricula', 'correo')
+        }
+        _resolve_groups(valid, groups, create=not dry_run)
+        students: list[Student] = []
+        updates = 0
+        for number, data in valid:
+            owner = taken_by.get(data['correo'].casefold())
+            if data['matricula'] in existing and not upsert:
+                report.errors.append(RowError(number, data['matricula'], ["matricula: ya existe en la base de datos."]))
+                continue
+            if owner is not None and owner != data['matricula']:
+                report.errors.append(RowError(number, data['matricula'], ["correo: pertenece a otro estudiante."]))
+                continue
+            updates += data['matricula'] in existing
+            students.append(Student(**data))
+
+        if dry_run or not students:
+            continue
+        with transaction.atomic():
+            if upsert:
+                Student.objects.bulk_create(
+                    students,
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=['matricula'],
+                    update_fields=UPDATE_FIELDS,
+                )
+            else:
+                Student.objects.bulk_create(students, batch_size=batch_size)
+        report.created += len(students) - updates
+        report.updated += updates
+
+    # bulk_create no envía señales; se recalculan los conteos materializados una vez
+    # (rebuild_stats también invalida los fragmentos en caché)
+    if report.created or report.updated:
+        rebuild_stats()
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def write_error_report(errors: Iterable[RowError], path: str | Path) -> None:
+    """Guarda el reporte de errores por fila como CSV."""
+    with Path(path).open('w', newline='', encoding='utf-8-sig') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['Fila', 'Matrícula', 'Errores'])
+        for error in errors:
+            writer.writerow([error.row, error.matricula, ' | '.join(error.messages)])
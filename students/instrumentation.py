@@ -0,0 +1,295 @@
+"""Instrumentación opcional del tiempo de cada petición.
+
+``PerformanceMiddleware`` (activo solo con ``PERFORMANCE_INSTRUMENTATION``)
+mide por vista el tiempo total, número y tiempo de consultas SQL (vía
+``connection.execute_wrapper``), tiempo de render de plantillas, tamaño de la
+respuesta y tiempo en HTTP saliente (lo reporta ``university_client``).
+Agrega un encabezado ``Server-Timing``, acumula histogramas en memoria del
+proceso (ver ``metrics_snapshot`` y ``prometheus_text``) y registra las
+peticiones lentas con sus consultas más costosas.
+"""
+from __future__ import annotations
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('students.performance')
+
+# Límites superiores (ms) de las cubetas del histograma, al estilo Prometheus
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+ROLLING_WINDOW = 1000
+TOP_QUERIES = 5
+
+
+@dataclass
+class RequestMetrics:
+    """Mediciones acumuladas durante una petición."""
+
+    sql_count: int = 0
+    sql_time: float = 0.0
+    template_time: float = 0.0
+    http_count: int = 0
+    http_time: float = 0.0
+    queries: list[tuple[float, str]] = field(default_factory=list)
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar('request_metrics', default=None)
+
+
+@contextmanager
+def track_http() -> Iterator[None]:
+    """Suma la duración del bloque al tiempo de HTTP saliente de la petición en curso."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.http_count += 1
+        metrics.http_time += time.perf_counter() - started
+
+
+@contextmanager
+def _measuring(metrics: RequestMetrics) -> Iterator[None]:
+    """Atribuye a ``metrics`` las consultas SQL y plantillas que ocurran dentro del bloque."""
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(_sql_wrapper(metrics)))
+            yield
+    finally:
+        _current.reset(token)
+
+
+def _sql_wrapper(metrics: RequestMetrics):
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            metrics.sql_count += 1
+            metrics.sql_time += duration
+            metrics.queries.append((duration, sql))
+    return wrapper
+
+
+_template_patch_lock = threading.Lock()
+_template_patched = False
+
+
+def _patch_template_render() -> None:
+    """Envuelve el render de plantillas de Django para medir su duración (una sola vez)."""
+    global _template_patched
+    with _template_patch_lock:
+        if _template_patched:
+            return
+        from django.template.backends.django import Template
+
+        original = Template.render
+
+        def render(self, context=None, request=None):
+            metrics = _current.get()
+            if metrics is None:
+                return original(self, context, request)
+            started = time.perf_counter()
+            try:
+                return original(self, context, request)
+            finally:
+                metrics.template_time += time.perf_counter() - started
+
+        Template.render = render
+        _template_patched = True
+
+
+class ViewStats:
+    """Histograma acumulado y ventana deslizante de duraciones de una vista."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.http_ms = 0.0
+        self.bytes = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.recent: deque[float] = deque(maxlen=ROLLING_WINDOW)
+
+    def observe(self, duration_ms: float, metrics: RequestMetrics, size: int | None) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.sql_count += metrics.sql_count
+        self.sql_ms += metrics.sql_time * 1000
+        self.template_ms += metrics.template_time * 1000
+        self.http_ms += metrics.http_time * 1000
+        self.bytes += size or 0
+        self.buckets[bisect.bisect_left(BUCKETS_MS, duration_ms)] += 1
+        self.recent.append(duration_ms)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self.recent)
+
+        def percentile(fraction: float) -> float:
+            if not recent:
+                return 0.0
+            return round(recent[min(len(recent) - 1, int(fraction * len(recent)))], 3)
+
+        def mean(total: float) -> float:
+            return round(total / self.count, 3) if self.count else 0.0
+
+        return {
+            'count': self.count,
+            'mean_ms': mean(self.total_ms),
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'sql_per_request': mean(self.sql_count),
+            'sql_ms': mean(self.sql_ms),
+            'template_ms': mean(self.template_ms),
+            'http_ms': mean(self.http_ms),
+            'response_bytes': mean(self.bytes),
+            'buckets': dict(zip([*map(str, BUCKETS_MS), '+Inf'], self.buckets)),
+        }
+
+
+_stats: dict[str, ViewStats] = {}
+_stats_lock = threading.Lock()
+
+
+def record(view_name: str, duration_ms: float, metrics: RequestMetrics, size: int | None) -> None:
+    with _stats_lock:
+        _stats.setdefault(view_name, ViewStats()).observe(duration_ms, metrics, size)
+
+
+def metrics_snapshot() -> dict[str, dict]:
+    """Resumen por vista con percentiles de la ventana reciente e histograma acumulado."""
+    with _stats_lock:
+        return {name: stats.snapshot() for name, stats in sorted(_stats.items())}
+
+
+def prometheus_text() -> str:
+    """Expone el histograma acumulado en formato de texto de Prometheus."""
+    lines = [
+        '# HELP students_request_duration_ms Duración de peticiones por vista.',
+        '# TYPE students_request_duration_ms histogram',
+    ]
+    with _stats_lock:
+        for name, stats in sorted(_stats.items()):
+            cumulative = 0
+            for bound, count in zip([*map(str, BUCKETS_MS), '+Inf'], stats.buckets):
+                cumulative += count
+                lines.append(f'students_request_duration_ms_bucket{{view="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'students_request_duration_ms_sum{{view="{name}"}} {stats.total_ms:.3f}')
+            lines.append(f'students_request_duration_ms_count{{view="{name}"}} {stats.count}')
+
+    from .fragment_cache import fragment_cache_stats
+
+    fragments = fragment_cache_stats()
+    for outcome in ('hits', 'misses'):
+        lines.append(f'# TYPE students_fragment_cache_{outcome}_total counter')
+        for name, counters in fragments.items():
+            lines.append(f'students_fragment_cache_{outcome}_total{{fragment="{name}"}} {counters[outcome]}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+class PerformanceMiddleware:
+    """Mide cada petición y publica ``Server-Timing``; se desactiva si la opción está apagada."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFORMANCE_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'PERFORMANCE_SLOW_REQUEST_MS', 500)
+        _patch_template_render()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        started = time.perf_counter()
+        with _measuring(metrics):
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'unresolved'
+        # Server-Timing sale antes que el cuerpo: en respuestas en streaming solo cubre la vista
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.sql_time * 1000:.2f};desc="{metrics.sql_count} consultas"',
+            f'tpl;dur={metrics.template_time * 1000:.2f}',
+            f'http;dur={metrics.http_time * 1000:.2f}',
+            f'total;dur={(time.perf_counter() - started) * 1000:.2f}',
+        ])
+        if not response.streaming:
+            self.finish(request, view_name, started, metrics, len(response.content))
+        elif response.is_async:
+            response.streaming_content = self._measure_async_stream(
+                response.streaming_content, request, view_name, started, metrics
+            )
+        else:
+            # El cuerpo (y sus consultas) se genera al iterar, después de salir de esta función
+            response.streaming_content = self._measure_stream(
+                response.streaming_content, request, view_name, started, metrics
+            )
+        return response
+
+    def _measure_stream(self, content, request, view_name: str, started: float, metrics: RequestMetrics):
+        size = 0
+        chunks = iter(content)
+        try:
+            while True:
+                with _measuring(metrics):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.finish(request, view_name, started, metrics, size)
+
+    async def _measure_async_stream(self, content, request, view_name: str, started: float, metrics: RequestMetrics):
+        # Las consultas corren en hilos de sync_to_async, fuera del alcance de execute_wrapper: solo tiempo y bytes
+        size = 0
+        try:
+            async for chunk in content:
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.finish(request, view_name, started, metrics, size)
+
+    def finish(self, request, view_name: str, started: float, metrics: RequestMetrics, size: int) -> None:
+        """Registra la petición completa (en streaming, al terminar de enviar el cuerpo)."""
+        total_ms = (time.perf_counter() - started) * 1000
+        record(view_name, total_ms, metrics, size)
+        if total_ms >= self.slow_ms:
+            top = sorted(metrics.queries, reverse=True)[:TOP_QUERIES]
+            logger.warning(
+                "Petición lenta %s %s (%s): %.1fms, %d consultas SQL (%.1fms), plantillas %.1fms, "
+                "HTTP saliente %.1fms, %d bytes\n%s",
+                request.method,
+                request.path,
+                view_name,
+                total_ms,
+                metrics.sql_count,
+                metrics.sql_time * 1000,
+                metrics.template_time * 1000,
+                metrics.http_time * 1000,
+                size,
+                '\n'.join(f"  {duration * 1000:.1f}ms {sql[:300]}" for duration, sql in top),
+            )
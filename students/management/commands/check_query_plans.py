@@ -0,0 +1,130 @@
+"""Verifica con EXPLAIN QUERY PLAN que las vistas no escaneen ni ordenen la tabla de estudiantes."""
+from __future__ import annotations
+import datetime
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from students.changefeed import encode_feed_cursor
+from students.models import Career, Group, Student
+from students.services import paginate_students
+
+# Recorrido completo de la tabla sin índice (los recorridos "USING INDEX" son ordenados y se permiten)
+FULL_SCAN = re.compile(r'^SCAN students_student(?: AS \w+)?$')
+TEMP_SORT = 'USE TEMP B-TREE'
+
+
+def plan_problems(sql: str, plan: list[str]) -> list[str]:
+    """Devuelve las líneas del plan que indican escaneo completo u ordenamiento temporal."""
+    problems = [line for line in plan if FULL_SCAN.match(line)]
+    # Los resultados de búsqueda FTS se ordenan en memoria: solo son las coincidencias
+    if ' MATCH ' not in sql:
+        problems += [line for line in plan if line.startswith(TEMP_SORT)]
+    return problems
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta las vistas principales sobre una base de pruebas, obtiene el plan de cada consulta "
+        "a students_student y falla si aparece un escaneo completo o un ordenamiento temporal."
+    )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if connection.vendor != 'sqlite':
+            raise CommandError("Este verificador solo interpreta planes de SQLite.")
+        setup_test_environment()
+        original_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            failures = self.check_views()
+        finally:
+            connection.creation.destroy_test_db(original_name, verbosity=0)
+            teardown_test_environment()
+
+        if failures:
+            for label, sql, problems in failures:
+                self.stderr.write(f"[{label}] {'; '.join(problems)}\n    {sql[:400]}")
+            raise CommandError(f"{len(failures)} consultas con escaneo completo u ordenamiento temporal.")
+        self.stdout.write(self.style.SUCCESS("Todas las consultas usan índices sin ordenamientos temporales."))
+
+    def seed(self) -> Student:
+        career = Career.objects.create(nombre="Ingeniería en Sistemas", clave="ISC")
+        group = Group.objects.create(codigo="1A", carrera=career)
+        students = [
+            Student.objects.create(
+                nombre=nombre,
+                apellido_paterno=apellido,
+                apellido_materno="López",
+                matricula=f"Q{index}",
+                correo=f"q{index}@example.com",
+                telefono="5555555555",
+                direccion="Calle 1",
+                fecha_nacimiento=datetime.date(2000, 1, 1),
+                grupo=group,
+                carrera=career,
+                fecha_inscripcion=datetime.date(2024, 1, 1),
+            )
+            for index, (nombre, apellido) in enumerate([("Ana", "García"), ("Luis", "Núñez"), ("Sofía", "Pérez")])
+        ]
+        return students[0]
+
+    def urls(self, student: Student) -> list[tuple[str, str, dict]]:
+        list_url = reverse('students:student_list')
+        cursor = paginate_students(Student.objects.all(), page_size=1)['next_cursor']
+        return [
+            ('dashboard', reverse('students:dashboard'), {}),
+            ('listado', list_url, {}),
+            ('listado página 2', list_url, {'page_size': 1, 'after': cursor}),
+            ('listado por estado', list_url, {'status': 'Inscrito', 'after': cursor}),
+            ('listado por grupo', list_url, {'group': '1a', 'after': cursor}),
+            ('listado grupo y estado', list_url, {'group': '1a', 'status': 'Inscrito'}),
+            ('búsqueda', list_url, {'q': 'gar'}),
+            ('detalle', reverse('students:student_detail', args=[student.pk]), {}),
+            ('formulario', reverse('students:student_create'), {}),
+            ('exportar CSV', reverse('students:export_csv'), {'status': 'Inscrito'}),
+            ('exportar Excel', reverse('students:export_excel'), {'group': '1a'}),
+            ('API listado', reverse('students:api_student_list'), {'page_size': 1, 'after': cursor}),
+            ('API detalle', reverse('students:api_student_detail', args=[student.pk]), {}),
+            (
+                'API cambios',
+                reverse('students:api_changes'),
+                {'cursor': encode_feed_cursor(student.updated_at, student.pk, 0)},
+            ),
+        ]
+
+    def check_views(self) -> list[tuple[str, str, list[str]]]:
+        student = self.seed()
+        client = Client()
+        failures = []
+        for label, url, params in self.urls(student):
+            statements: list[tuple[str, tuple]] = []
+
+            def capture(execute, sql, sql_params, many, context):
+                if sql.lstrip().upper().startswith('SELECT') and 'students_student' in sql:
+                    statements.append((sql, sql_params))
+                return execute(sql, sql_params, many, context)
+
+            with connection.execute_wrapper(capture):
+                response = client.get(url, params)
+                # Las respuestas en streaming ejecutan sus consultas al consumirse
+                if response.streaming:
+                    for _ in response.streaming_content:
+                        pass
+            if response.status_code != 200:
+                raise CommandError(f"{label}: la vista respondió {response.status_code}.")
+
+            for sql, sql_params in statements:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}", sql_params)
+                    plan = [row[3] for row in cursor.fetchall()]
+                problems = plan_problems(sql, plan)
+                if problems:
+                    failures.append((label, sql, problems))
+                elif self.verbosity > 1:
+                    self.stdout.write(f"[{label}] " + ' | '.join(plan))
+        return failures
@@ -0,0 +1,22 @@
+"""Comando para eliminar exportaciones en segundo plano antiguas o que exceden el espacio."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from students.export_jobs import cleanup_exports
+
+
+class Command(BaseCommand):
+    help = "Elimina los archivos de exportaciones terminadas por antigüedad y por tamaño total."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-age-hours', type=float, default=settings.EXPORT_JOBS_MAX_AGE_HOURS)
+        parser.add_argument('--max-total-mb', type=float, default=settings.EXPORT_JOBS_MAX_TOTAL_MB)
+
+    def handle(self, *args, **options):
+        removed = cleanup_exports(
+            max_age=timedelta(hours=options['max_age_hours']),
+            max_total_bytes=int(options['max_total_mb'] * 1024 * 1024),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Exportaciones eliminadas: {removed}."))
@@ -0,0 +1,26 @@
+"""Comando para compactar las bajas registradas por el feed de cambios."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from students.changefeed import compact_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Elimina las bajas (StudentTombstone) más antiguas que la retención. Los consumidores con un cursor "
+        "anterior deberán sincronizarse desde cero."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.CHANGE_FEED_TOMBSTONE_RETENTION_DAYS,
+            help="Días de retención (por defecto CHANGE_FEED_TOMBSTONE_RETENTION_DAYS)",
+        )
+
+    def handle(self, *args, **options):
+        deleted = compact_tombstones(timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f"Bajas compactadas: {deleted}."))
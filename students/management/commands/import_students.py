@@ -0,0 +1,42 @@
+"""Comando para importar estudiantes de forma masiva desde CSV o XLSX."""
+from django.core.management.base import BaseCommand, CommandError
+
+from students.importer import DEFAULT_BATCH_SIZE, import_students, read_rows, write_error_report
+
+
+class Command(BaseCommand):
+    help = "Importa estudiantes desde un archivo CSV/XLSX con las columnas de la exportación."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Ruta del archivo .csv o .xlsx")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Filas por lote y transacción")
+        parser.add_argument('--upsert', action='store_true', help="Actualiza estudiantes existentes por matrícula")
+        parser.add_argument('--dry-run', action='store_true', help="Solo valida, no escribe en la base de datos")
+        parser.add_argument('--errors', metavar='CSV', help="Guarda el reporte de errores por fila en este archivo")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size debe ser mayor que cero.")
+        try:
+            report = import_students(
+                read_rows(options['path']),
+                batch_size=options['batch_size'],
+                upsert=options['upsert'],
+                dry_run=options['dry_run'],
+            )
+        except FileNotFoundError as exc:
+            raise CommandError(f"No se encontró el archivo: {exc.filename}") from exc
+
+        for error in report.errors[:20]:
+            self.stderr.write(f"Fila {error.row} ({error.matricula or 'sin matrícula'}): {'; '.join(error.messages)}")
+        if len(report.errors) > 20:
+            self.stderr.write(f"... y {len(report.errors) - 20} filas más con errores.")
+        if options['errors']:
+            write_error_report(report.errors, options['errors'])
+            self.stdout.write(f"Reporte de errores guardado en {options['errors']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Procesadas {report.processed} filas en {report.elapsed:.2f}s "
+            f"({report.rows_per_second:,.0f} filas/s): {report.created} creadas, "
+            f"{report.updated} actualizadas, {len(report.errors)} con errores."
+        ))
@@ -0,0 +1,16 @@
+"""Comando para reconstruir el índice de búsqueda de estudiantes."""
+from django.core.management.base import BaseCommand, CommandError
+
+from students.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice FTS5 de búsqueda a partir de la tabla de estudiantes."
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError(
+                "El índice FTS5 no existe; aplica las migraciones en una base SQLite compilada con FTS5."
+            )
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS("Índice de búsqueda reconstruido."))
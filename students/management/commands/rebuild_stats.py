@@ -0,0 +1,30 @@
+"""Comando para reconstruir o verificar la tabla de estadísticas materializada."""
+from django.core.management.base import BaseCommand, CommandError
+
+from students.catalog import group_code
+from students.stats import check_stats, rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla StudentStat a partir de los estudiantes o verifica su consistencia."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Solo compara la tabla con los conteos reales y termina con error si difieren",
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            mismatches = check_stats()
+            for (grupo_id, carrera_id, estado), stored, live in mismatches:
+                grupo = group_code(grupo_id) or grupo_id
+                self.stderr.write(f"{grupo} · carrera {carrera_id} · {estado}: guardado {stored}, real {live}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} conteos inconsistentes; ejecuta rebuild_stats.")
+            self.stdout.write(self.style.SUCCESS("Las estadísticas materializadas son consistentes."))
+            return
+
+        rows = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(f"Estadísticas reconstruidas ({rows} filas)."))
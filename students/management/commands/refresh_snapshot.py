@@ -0,0 +1,25 @@
+"""Comando para actualizar el snapshot columnar de estudiantes."""
+from django.core.management.base import BaseCommand
+
+from students.snapshot import refresh_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza el snapshot columnar (arreglos .npy en STUDENTS_SNAPSHOT_DIR) con los cambios posteriores a su "
+        "cursor, o lo reconstruye completo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help="Reconstruye desde la tabla completa (p. ej. tras QuerySet.update() o cargas masivas)",
+        )
+
+    def handle(self, *args, **options):
+        result = refresh_snapshot(full=options['full'])
+        mode = "completo" if result['mode'] == 'full' else "incremental"
+        self.stdout.write(
+            self.style.SUCCESS(f"Snapshot {mode}: {result['rows']} filas, {result['changes']} cambios aplicados.")
+        )
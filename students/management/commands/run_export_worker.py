@@ -0,0 +1,67 @@
+"""Comando que procesa las exportaciones en segundo plano con un grupo de procesos."""
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+def _serve(poll_interval: float, once: bool) -> None:
+    # Los procesos se crean con "spawn" (también en Windows), así que inicializan Django por su cuenta
+    import django
+
+    django.setup()
+    from students.export_jobs import worker_loop
+
+    worker_loop(poll_interval=poll_interval, once=once)
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de exportaciones CSV/Excel y limpia periódicamente los archivos terminados."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help="Procesos worker en paralelo")
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=settings.EXPORT_JOBS_POLL_SECONDS,
+            help="Segundos de espera cuando la cola está vacía",
+        )
+        parser.add_argument('--once', action='store_true', help="Termina en cuanto la cola quede vacía")
+        parser.add_argument(
+            '--cleanup-interval',
+            type=float,
+            default=300,
+            help="Segundos entre limpiezas de exportaciones antiguas",
+        )
+
+    def handle(self, *args, **options):
+        from students.export_jobs import cleanup_exports, worker_loop
+
+        cleanup_exports()
+        if options['processes'] <= 1:
+            processed = worker_loop(poll_interval=options['poll'], once=options['once'])
+            self.stdout.write(self.style.SUCCESS(f"Exportaciones procesadas: {processed}."))
+            return
+
+        context = multiprocessing.get_context('spawn')
+        # Sin daemon: con EXPORT_PARALLEL_WORKERS cada worker crea sus propios procesos
+        workers = [
+            context.Process(target=_serve, args=(options['poll'], options['once']))
+            for _ in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"{len(workers)} workers de exportación en ejecución.")
+        try:
+            while any(worker.is_alive() for worker in workers):
+                deadline = time.monotonic() + options['cleanup_interval']
+                for worker in workers:
+                    worker.join(timeout=max(0.0, deadline - time.monotonic()))
+                removed = cleanup_exports()
+                if removed:
+                    self.stdout.write(f"Exportaciones expiradas: {removed}.")
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+        self.stdout.write(self.style.SUCCESS("Workers de exportación detenidos."))
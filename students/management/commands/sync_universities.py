@@ -0,0 +1,39 @@
+"""Comando para sincronizar el catálogo local de universidades."""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from students.universities import catalog_synced_at, download_catalog, read_catalog_file, sync_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga el conjunto completo de universidades (desde la API Hipolabs o un archivo JSON) en la tabla local "
+        "que usan las búsquedas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help="Archivo JSON con el formato de /search de Hipolabs (sin descargar)")
+        parser.add_argument(
+            '--if-older-than',
+            type=float,
+            metavar='HORAS',
+            help="Solo sincroniza si la última sincronización tiene más de HORAS (para ejecutarlo periódicamente)",
+        )
+
+    def handle(self, *args, **options):
+        max_age = options['if_older_than']
+        synced_at = catalog_synced_at()
+        if max_age is not None and synced_at and timezone.now() - synced_at < timedelta(hours=max_age):
+            self.stdout.write(f"El catálogo se sincronizó el {synced_at:%Y-%m-%d %H:%M}; no se actualiza.")
+            return
+
+        try:
+            records = read_catalog_file(options['file']) if options['file'] else download_catalog()
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"No fue posible obtener las universidades: {exc}") from exc
+        if not isinstance(records, list) or not records:
+            raise CommandError("La fuente no contiene universidades; se conserva el catálogo actual.")
+        total = sync_catalog(records)
+        self.stdout.write(self.style.SUCCESS(f"Catálogo sincronizado: {total} universidades."))
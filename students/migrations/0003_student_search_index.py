@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+COLUMNS = "nombre, apellido_paterno, apellido_materno, matricula, correo"
+NEW_VALUES = "new.id, new.nombre, new.apellido_paterno, new.apellido_materno, new.matricula, new.correo"
+OLD_VALUES = "old.id, old.nombre, old.apellido_paterno, old.apellido_materno, old.matricula, old.correo"
+
+
+def create_fts_index(apps, schema_editor):
+    """Crea el índice FTS5 y sus triggers; se omite si el motor no es SQLite o no tiene FTS5."""
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    cursor = connection.cursor()
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5');")
+    if not cursor.fetchone()[0]:
+        return
+
+    cursor.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS students_student_fts USING fts5(
+            {COLUMNS},
+            content='students_student',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        );
+        """
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS students_student_fts_ai AFTER INSERT ON students_student BEGIN
+            INSERT INTO students_student_fts(rowid, {COLUMNS}) VALUES ({NEW_VALUES});
+        END;
+        """
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS students_student_fts_ad AFTER DELETE ON students_student BEGIN
+            INSERT INTO students_student_fts(students_student_fts, rowid, {COLUMNS}) VALUES ('delete', {OLD_VALUES});
+        END;
+        """
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS students_student_fts_au AFTER UPDATE ON students_student BEGIN
+            INSERT INTO students_student_fts(students_student_fts, rowid, {COLUMNS}) VALUES ('delete', {OLD_VALUES});
+            INSERT INTO students_student_fts(rowid, {COLUMNS}) VALUES ({NEW_VALUES});
+        END;
+        """
+    )
+    cursor.execute("INSERT INTO students_student_fts(students_student_fts) VALUES ('rebuild');")
+
+
+def drop_fts_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    cursor = connection.cursor()
+    for trigger in ("students_student_fts_ai", "students_student_fts_ad", "students_student_fts_au"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger};")
+    cursor.execute("DROP TABLE IF EXISTS students_student_fts;")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("students", "0002_sync_schema"),
+    ]
+
+    operations = [migrations.RunPython(create_fts_index, drop_fts_index)]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_stats(apps, schema_editor):
+    """Llena la tabla materializada con los conteos actuales."""
+    Student = apps.get_model('students', 'Student')
+    StudentStat = apps.get_model('students', 'StudentStat')
+    rows = (
+        Student.objects.order_by()
+        .values_list('grupo', 'carrera_id', 'estado')
+        .annotate(total=Count('pk'))
+    )
+    StudentStat.objects.bulk_create(
+        StudentStat(grupo=grupo, carrera_id=carrera_id, estado=estado, total=total)
+        for grupo, carrera_id, estado, total in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_student_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grupo', models.CharField(max_length=10, verbose_name='Grupo')),
+                ('estado', models.CharField(max_length=20, verbose_name='Estado')),
+                ('total', models.IntegerField(default=0, verbose_name='Total')),
+                ('carrera', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='students.career', verbose_name='Carrera')),
+            ],
+            options={
+                'verbose_name': 'Estadística de estudiantes',
+                'verbose_name_plural': 'Estadísticas de estudiantes',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studentstat',
+            constraint=models.UniqueConstraint(fields=('grupo', 'carrera', 'estado'), name='unique_student_stat'),
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
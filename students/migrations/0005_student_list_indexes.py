@@ -0,0 +1,30 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_student_stat'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['apellido_paterno', 'apellido_materno', 'nombre', 'id'], name='student_name_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['estado', 'apellido_paterno', 'apellido_materno', 'nombre', 'id'], name='student_status_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(django.db.models.functions.text.Lower('grupo'), models.F('apellido_paterno'), models.F('apellido_materno'), models.F('nombre'), models.F('id'), name='student_group_ci_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['grupo', 'carrera', 'estado'], name='student_stats_key_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_change_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_id', models.BigIntegerField(verbose_name='Id del estudiante')),
+                ('matricula', models.CharField(max_length=20, verbose_name='Matrícula')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Eliminado')),
+            ],
+            options={
+                'verbose_name': 'Estudiante eliminado',
+                'verbose_name_plural': 'Estudiantes eliminados',
+                'indexes': [models.Index(fields=['deleted_at'], name='tombstone_deleted_idx')],
+            },
+        ),
+    ]
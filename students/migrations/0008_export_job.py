@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:42
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0007_student_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Token')),
+                ('formato', models.CharField(choices=[('csv', 'CSV'), ('xlsx', 'Excel')], max_length=4, verbose_name='Formato')),
+                ('filtros', models.JSONField(blank=True, default=dict, verbose_name='Filtros')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_proceso', 'En proceso'), ('terminado', 'Terminado'), ('error', 'Error'), ('expirado', 'Expirado')], default='pendiente', max_length=12, verbose_name='Estado')),
+                ('total_filas', models.IntegerField(blank=True, null=True, verbose_name='Total de filas')),
+                ('filas_procesadas', models.IntegerField(default=0, verbose_name='Filas procesadas')),
+                ('archivo', models.CharField(blank=True, max_length=255, verbose_name='Archivo')),
+                ('tamano_bytes', models.BigIntegerField(blank=True, null=True, verbose_name='Tamaño en bytes')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creado')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado')),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True, verbose_name='Último avance')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminado')),
+            ],
+            options={
+                'verbose_name': 'Exportación en segundo plano',
+                'verbose_name_plural': 'Exportaciones en segundo plano',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['estado', 'created_at'], name='exportjob_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0008_export_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reporte', models.CharField(max_length=30, verbose_name='Reporte')),
+                ('periodo', models.CharField(max_length=10, verbose_name='Periodo')),
+                ('datos', models.JSONField(default=dict, verbose_name='Datos')),
+                ('calculado', models.DateTimeField(auto_now=True, verbose_name='Calculado')),
+            ],
+            options={
+                'verbose_name': 'Periodo de reporte',
+                'verbose_name_plural': 'Periodos de reporte',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['fecha_inscripcion'], name='student_enrollment_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reportperiod',
+            constraint=models.UniqueConstraint(fields=('reporte', 'periodo'), name='unique_report_period'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.14 on 2026-10-17 00:55
+
+from django.db import OperationalError, migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    """Índice FTS5 de trigramas sobre el nombre normalizado; se omite sin SQLite o sin FTS5/trigram.
+
+    No usa triggers: el catálogo solo cambia con sync_universities, que lo reconstruye.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    cursor = connection.cursor()
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5');")
+    if not cursor.fetchone()[0]:
+        return
+    try:
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS students_university_fts USING fts5(
+                nombre_normalizado,
+                content='students_university',
+                content_rowid='id',
+                tokenize='trigram'
+            );
+            """
+        )
+    except OperationalError:
+        # SQLite anterior a 3.34 no tiene el tokenizador trigram
+        return
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.connection.cursor().execute("DROP TABLE IF EXISTS students_university_fts;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0009_report_period'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='University',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=255, verbose_name='Nombre')),
+                ('pais', models.CharField(max_length=100, verbose_name='País')),
+                ('codigo_pais', models.CharField(blank=True, max_length=2, verbose_name='Código de país')),
+                ('estado_provincia', models.CharField(blank=True, max_length=150, verbose_name='Estado o provincia')),
+                ('sitio_web', models.CharField(blank=True, max_length=500, verbose_name='Sitio web')),
+                ('dominio', models.CharField(blank=True, max_length=255, verbose_name='Dominio')),
+                ('nombre_normalizado', models.CharField(max_length=255, verbose_name='Nombre normalizado')),
+                ('pais_normalizado', models.CharField(max_length=100, verbose_name='País normalizado')),
+                ('sincronizado', models.DateTimeField(verbose_name='Sincronizado')),
+            ],
+            options={
+                'verbose_name': 'Universidad',
+                'verbose_name_plural': 'Universidades',
+                'indexes': [models.Index(fields=['pais_normalizado', 'nombre_normalizado'], name='university_country_idx'), models.Index(fields=['nombre_normalizado'], name='university_name_idx')],
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
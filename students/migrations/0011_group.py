@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from importlib import import_module
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Lower, Trim
+
+search_index = import_module('students.migrations.0003_student_search_index')
+
+
+def split_groups(apps, schema_editor):
+    """Crea un ``Group`` por código sin distinguir mayúsculas y enlaza estudiantes y conteos."""
+    Group = apps.get_model('students', 'Group')
+    Student = apps.get_model('students', 'Student')
+    StudentStat = apps.get_model('students', 'StudentStat')
+
+    spellings = dict(
+        Student.objects.order_by().values_list('grupo').annotate(total=models.Count('pk')).values_list('grupo', 'total')
+    )
+    by_code: dict[str, list[str]] = {}
+    for spelling in spellings:
+        by_code.setdefault(spelling.strip().lower(), []).append(spelling)
+    # Se conserva la escritura más usada (a igualdad, la primera en orden alfabético)
+    Group.objects.bulk_create(
+        Group(codigo=min(variants, key=lambda value: (-spellings[value], value)).strip())
+        for variants in by_code.values()
+    )
+    # Una sola sentencia; la subconsulta usa el índice único sobre LOWER(codigo)
+    Student.objects.update(grupo_ref=Subquery(
+        Group.objects.annotate(codigo_ci=Lower('codigo'))
+        .filter(codigo_ci=Lower(Trim(OuterRef('grupo'))))
+        .values('pk')[:1]
+    ))
+
+    # Los conteos se recalculan: dos escrituras del mismo grupo ahora comparten llave
+    StudentStat.objects.all().delete()
+    rows = (
+        Student.objects.order_by()
+        .values_list('grupo_ref', 'carrera', 'estado')
+        .annotate(total=models.Count('pk'))
+    )
+    StudentStat.objects.bulk_create(
+        StudentStat(grupo_ref_id=grupo, carrera_id=carrera, estado=estado, total=total)
+        for grupo, carrera, estado, total in rows
+    )
+
+
+def join_groups(apps, schema_editor):
+    Group = apps.get_model('students', 'Group')
+    Student = apps.get_model('students', 'Student')
+    StudentStat = apps.get_model('students', 'StudentStat')
+    for pk, codigo in Group.objects.values_list('pk', 'codigo'):
+        Student.objects.filter(grupo_ref=pk).update(grupo=codigo)
+        StudentStat.objects.filter(grupo_ref=pk).update(grupo=codigo)
+
+
+def restore_search_triggers(apps, schema_editor):
+    """SQLite reconstruye la tabla de estudiantes al cambiar la llave foránea y con ella se pierden los triggers FTS."""
+    search_index.create_fts_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0010_university'),
+    ]
+
+    operations = [
+        # Al revertir, esta operación se ejecuta al final y vuelve a crear los triggers
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.CreateModel(
+            name='Group',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.CharField(max_length=10, verbose_name='Código')),
+                ('periodo', models.CharField(blank=True, max_length=20, verbose_name='Periodo')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creado')),
+                ('carrera', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='grupos', to='students.career', verbose_name='Carrera')),
+            ],
+            options={
+                'verbose_name': 'Grupo',
+                'verbose_name_plural': 'Grupos',
+                'ordering': ['codigo'],
+                'constraints': [models.UniqueConstraint(django.db.models.functions.text.Lower('codigo'), name='unique_group_code_ci')],
+            },
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='grupo_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='students.group'),
+        ),
+        migrations.AddField(
+            model_name='studentstat',
+            name='grupo_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='students.group'),
+        ),
+        # Solo en el estado: con el valor por defecto, revertir RemoveField puede volver a crear la columna
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='student',
+                name='grupo',
+                field=models.CharField(default='', max_length=10, verbose_name='Grupo'),
+            ),
+            migrations.AlterField(
+                model_name='studentstat',
+                name='grupo',
+                field=models.CharField(default='', max_length=10, verbose_name='Grupo'),
+            ),
+        ]),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_group_ci_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='student',
+            name='student_stats_key_idx',
+        ),
+        migrations.RemoveConstraint(
+            model_name='studentstat',
+            name='unique_student_stat',
+        ),
+        migrations.RunPython(split_groups, join_groups),
+        migrations.RemoveField(
+            model_name='student',
+            name='grupo',
+        ),
+        migrations.RemoveField(
+            model_name='studentstat',
+            name='grupo',
+        ),
+        migrations.RenameField(
+            model_name='student',
+            old_name='grupo_ref',
+            new_name='grupo',
+        ),
+        migrations.RenameField(
+            model_name='studentstat',
+            old_name='grupo_ref',
+            new_name='grupo',
+        ),
+        migrations.AlterField(
+            model_name='student',
+            name='grupo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='estudiantes', to='students.group', verbose_name='Grupo'),
+        ),
+        migrations.AlterField(
+            model_name='studentstat',
+            name='grupo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='students.group', verbose_name='Grupo'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['grupo', 'apellido_paterno', 'apellido_materno', 'nombre', 'id'], name='student_group_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['grupo', 'carrera', 'estado'], name='student_stats_key_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentstat',
+            constraint=models.UniqueConstraint(fields=('grupo', 'carrera', 'estado'), name='unique_student_stat'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-17 01:19
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0011_group'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='group',
+            name='codigo',
+            field=models.CharField(max_length=10, validators=[django.core.validators.RegexValidator(message='El grupo solo permite letras, números y guiones.', regex='^[A-Za-z0-9\\-\\s]+$')], verbose_name='Código'),
+        ),
+    ]
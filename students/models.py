@@ -1,5 +1,9 @@
 """Modelos de datos para el registro de estudiantes."""
+import uuid
+
+from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Career(models.Model):
@@ -18,6 +22,34 @@ class Career(models.Model):
         return f"{self.nombre} ({self.clave})"
 
 
+group_code_validator = RegexValidator(
+    regex=r"^[A-Za-z0-9\-\s]+$",
+    message="El grupo solo permite letras, números y guiones.",
+)
+
+
+class Group(models.Model):
+    """Catálogo de grupos; el código es único sin distinguir mayúsculas."""
+
+    codigo = models.CharField("Código", max_length=10, validators=[group_code_validator])
+    carrera = models.ForeignKey(
+        Career, verbose_name="Carrera", on_delete=models.PROTECT, null=True, blank=True, related_name="grupos"
+    )
+    periodo = models.CharField("Periodo", max_length=20, blank=True)
+    created_at = models.DateTimeField("Creado", auto_now_add=True)
+
+    class Meta:
+        ordering = ['codigo']
+        verbose_name = "Grupo"
+        verbose_name_plural = "Grupos"
+        constraints = [
+            models.UniqueConstraint(Lower('codigo'), name='unique_group_code_ci'),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - representación simple
+        return self.codigo
+
+
 class Student(models.Model):
     """Representa a un estudiante registrado en el sistema."""
 
@@ -41,7 +73,7 @@ class Student(models.Model):
     telefono = models.CharField("Teléfono", max_length=15)
     direccion = models.TextField("Dirección")
     fecha_nacimiento = models.DateField("Fecha de nacimiento")
-    grupo = models.CharField("Grupo", max_length=10)
+    grupo = models.ForeignKey(Group, verbose_name="Grupo", on_delete=models.PROTECT, related_name="estudiantes")
     carrera = models.ForeignKey(Career, verbose_name="Carrera", on_delete=models.PROTECT, related_name="estudiantes")
     estado = models.CharField("Estado", max_length=20, choices=STATUS_CHOICES, default='Inscrito')
     fecha_inscripcion = models.DateField("Fecha de inscripción")
@@ -52,6 +84,24 @@ class Student(models.Model):
         ordering = ['apellido_paterno', 'apellido_materno', 'nombre']
         verbose_name = "Estudiante"
         verbose_name_plural = "Estudiantes"
+        # Cada índice termina con el orden del listado (más la pk) para paginar sin ordenar en memoria
+        indexes = [
+            models.Index(fields=['apellido_paterno', 'apellido_materno', 'nombre', 'id'], name='student_name_order_idx'),
+            models.Index(
+                fields=['estado', 'apellido_paterno', 'apellido_materno', 'nombre', 'id'],
+                name='student_status_order_idx',
+            ),
+            # El filtro de grupo resuelve el código a su id con el catálogo y compara enteros
+            models.Index(
+                fields=['grupo', 'apellido_paterno', 'apellido_materno', 'nombre', 'id'],
+                name='student_group_order_idx',
+            ),
+            models.Index(fields=['grupo', 'carrera', 'estado'], name='student_stats_key_idx'),
+            # MAX(updated_at) para la marca de agua de ETag/Last-Modified
+            models.Index(fields=['updated_at'], name='student_updated_idx'),
+            # Rangos por mes/año de inscripción para los reportes
+            models.Index(fields=['fecha_inscripcion'], name='student_enrollment_idx'),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover - representación simple
         return f"{self.full_name} ({self.matricula})"
@@ -60,3 +110,176 @@ class Student(models.Model):
     def full_name(self) -> str:
         """Devuelve el nombre completo del estudiante."""
         return f"{self.nombre} {self.apellido_paterno} {self.apellido_materno}".strip()
+
+
+class StudentStat(models.Model):
+    """Conteo materializado de estudiantes por grupo, carrera y estado.
+
+    Se actualiza por deltas desde las señales de ``Student`` para que el
+    dashboard lea unas cuantas filas en lugar de agregar toda la tabla.
+    """
+
+    grupo = models.ForeignKey(Group, verbose_name="Grupo", on_delete=models.CASCADE, related_name="+")
+    carrera = models.ForeignKey(Career, verbose_name="Carrera", on_delete=models.CASCADE, related_name="+")
+    estado = models.CharField("Estado", max_length=20)
+    total = models.IntegerField("Total", default=0)
+
+    class Meta:
+        verbose_name = "Estadística de estudiantes"
+        verbose_name_plural = "Estadísticas de estudiantes"
+        constraints = [
+            models.UniqueConstraint(fields=['grupo', 'carrera', 'estado'], name='unique_student_stat'),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - representación simple
+        return f"{self.grupo_id} · {self.carrera_id} · {self.estado}: {self.total}"
+
+
+class ChangeCounter(models.Model):
+    """Contador con nombre para marcas de agua internas.
+
+    ``students`` se incrementa al borrar estudiantes y al modificar carreras
+    (cambios que no mueven ``Student.updated_at``); junto con el máximo de
+    ``updated_at`` y el total de filas forma la marca de agua de listados y
+    exportaciones (ver ``students/conditional.py``). ``tombstones_compacted``
+    guarda hasta qué baja se compactó el feed de cambios.
+    """
+
+    nombre = models.CharField("Nombre", max_length=50, unique=True)
+    valor = models.BigIntegerField("Valor", default=0)
+    actualizado = models.DateTimeField("Actualizado", auto_now=True)
+
+    class Meta:
+        verbose_name = "Contador de cambios"
+        verbose_name_plural = "Contadores de cambios"
+
+    def __str__(self) -> str:  # pragma: no cover - representación simple
+        return f"{self.nombre}: {self.valor}"
+
+
+class StudentTombstone(models.Model):
+    """Registro de un estudiante borrado para el feed de cambios.
+
+    Lo crea la señal ``post_delete`` (vista, admin o ``QuerySet.delete``); el
+    comando ``compact_tombstones`` elimina los que superan la retención.
+    """
+
+    student_id = models.BigIntegerField("Id del estudiante")
+    matricula = models.CharField("Matrícula", max_length=20)
+    deleted_at = models.DateTimeField("Eliminado", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Estudiante eliminado"
+        verbose_name_plural = "Estudiantes eliminados"
+        indexes = [models.Index(fields=['deleted_at'], name='tombstone_deleted_idx')]
+
+    def __str__(self) -> str:  # pragma: no cover - representación simple
+        return f"{self.matricula} ({self.deleted_at:%Y-%m-%d %H:%M})"
+
+
+class University(models.Model):
+    """Universidad del catálogo local sincronizado desde Hipolabs (``sync_universities``).
+
+    ``nombre_normalizado`` y ``pais_normalizado`` guardan el texto sin
+    acentos, en minúsculas y con espacios simples para buscar con índices.
+    """
+
+    nombre = models.CharField("Nombre", max_length=255)
+    pais = models.CharField("País", max_length=100)
+    codigo_pais = models.CharField("Código de país", max_length=2, blank=True)
+    estado_provincia = models.CharField("Estado o provincia", max_length=150, blank=True)
+    sitio_web = models.CharField("Sitio web", max_length=500, blank=True)
+    dominio = models.CharField("Dominio", max_length=255, blank=True)
+    nombre_normalizado = models.CharField("Nombre normalizado", max_length=255)
+    pais_normalizado = models.CharField("País normalizado", max_length=100)
+    sincronizado = models.DateTimeField("Sincronizado")
+
+    class Meta:
+        verbose_name = "Universidad"
+        verbose_name_plural = "Universidades"
+        indexes = [
+            models.Index(fields=['pais_normalizado', 'nombre_normalizado'], name='university_country_idx'),
+            models.Index(fields=['nombre_normalizado'], name='university_name_idx'),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - representación simple
+        return f"{self.nombre} ({self.pais})"
+
+
+class ReportPeriod(models.Model):
+    """Agregado ya calculado de un periodo de reporte (mes de inscripción o cohorte).
+
+    Solo se guardan periodos cerrados (anteriores al mes o año en curso); las
+    señales de ``Student`` borran los periodos afectados por un cambio y
+    ``rebuild_stats`` los borra todos (ver ``students/reports.py``).
+    """
+
+    reporte = models.CharField("Reporte", max_length=30)
+    periodo = models.CharField("Periodo", max_length=10)
+    datos = models.JSONField("Datos", default=dict)
+    calculado = models.DateTimeField("Calculado", auto_now=True)
+
+    class Meta:
+        verbose_name = "Periodo de reporte"
+        verbose_name_plural = "Periodos de reporte"
+        constraints = [
+            models.UniqueConstraint(fields=['reporte', 'periodo'], name='unique_report_period'),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - representación simple
+        return f"{self.reporte} · {self.periodo}"
+
+
+class ExportJob(models.Model):
+    """Exportación CSV/Excel encolada para generarse fuera de la petición.
+
+    La crea la vista de exportación en segundo plano y la procesa
+    ``manage.py run_export_worker`` (ver ``students/export_jobs.py``).
+    """
+
+    FORMAT_CHOICES = [('csv', 'CSV'), ('xlsx', 'Excel')]
+    STATUS_PENDING = 'pendiente'
+    STATUS_RUNNING = 'en_proceso'
+    STATUS_DONE = 'terminado'
+    STATUS_FAILED = 'error'
+    STATUS_EXPIRED = 'expirado'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_DONE, 'Terminado'),
+        (STATUS_FAILED, 'Error'),
+        (STATUS_EXPIRED, 'Expirado'),
+    ]
+
+    token = models.UUIDField("Token", default=uuid.uuid4, unique=True, editable=False)
+    formato = models.CharField("Formato", max_length=4, choices=FORMAT_CHOICES)
+    filtros = models.JSONField("Filtros", default=dict, blank=True)
+    estado = models.CharField("Estado", max_length=12, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total_filas = models.IntegerField("Total de filas", null=True, blank=True)
+    filas_procesadas = models.IntegerField("Filas procesadas", default=0)
+    archivo = models.CharField("Archivo", max_length=255, blank=True)
+    tamano_bytes = models.BigIntegerField("Tamaño en bytes", null=True, blank=True)
+    error = models.TextField("Error", blank=True)
+    worker = models.CharField("Worker", max_length=100, blank=True)
+    created_at = models.DateTimeField("Creado", auto_now_add=True)
+    started_at = models.DateTimeField("Iniciado", null=True, blank=True)
+    heartbeat_at = models.DateTimeField("Último avance", null=True, blank=True)
+    finished_at = models.DateTimeField("Terminado", null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Exportación en segundo plano"
+        verbose_name_plural = "Exportaciones en segundo plano"
+        indexes = [models.Index(fields=['estado', 'created_at'], name='exportjob_queue_idx')]
+
+    def __str__(self) -> str:  # pragma: no cover - representación simple
+        return f"{self.get_formato_display()} {self.token} ({self.estado})"
+
+    @property
+    def progress(self) -> int:
+        """Porcentaje de avance (0-100)."""
+        if self.estado == self.STATUS_DONE:
+            return 100
+        if not self.total_filas:
+            return 0
+        return min(100, int(self.filas_procesadas * 100 / self.total_filas))
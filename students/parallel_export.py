@@ -0,0 +1,269 @@
+"""Exportación CSV/Excel en paralelo por rangos de llave con varios procesos.
+
+La tabla filtrada se divide en rangos contiguos de ``EXPORT_PARALLEL_CHUNK_SIZE``
+filas sobre la llave del listado (``LIST_ORDERING``, que termina en la pk):
+los límites se obtienen recorriendo solo el índice del orden. Cada rango se
+formatea en un proceso de un ``ProcessPoolExecutor`` con su propia conexión a
+la base de datos, y el proceso principal escribe los resultados en orden, así
+que el archivo es idéntico al de la exportación secuencial con el mismo orden.
+
+- CSV: cada proceso devuelve sus filas ya codificadas y se concatenan.
+- Excel: cada proceso genera el XML de sus filas (celdas ``inlineStr`` y
+  fechas con los estilos del libro) y se insertan en la única hoja de un
+  libro write-only generado por openpyxl con el encabezado.
+
+Los procesos se crean con ``spawn``, por eso este módulo no importa modelos
+al cargarse: el inicializador de cada proceso configura Django antes de
+recibir trabajo.
+"""
+from __future__ import annotations
+import csv
+import multiprocessing
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import IO, Callable, Iterable, Iterator
+
+from django.conf import settings
+
+SHEET_PATH = 'xl/worksheets/sheet1.xml'
+# Nivel de compresión del xlsx: la hoja se comprime en el proceso principal
+SHEET_COMPRESSLEVEL = 1
+
+
+def _init_worker(database_name: str) -> None:
+    # La base puede ser distinta a la de settings (p. ej. la de pruebas o benchmarks)
+    import django
+
+    settings.DATABASES['default']['NAME'] = database_name
+    django.setup()
+
+
+def default_workers() -> int:
+    return max(1, int(getattr(settings, 'EXPORT_PARALLEL_WORKERS', 1)))
+
+
+def default_chunk_size() -> int:
+    return max(1, int(getattr(settings, 'EXPORT_PARALLEL_CHUNK_SIZE', 50000)))
+
+
+def shard_bounds(students, chunk_size: int) -> list[tuple[list | None, list | None]]:
+    """Divide el queryset en rangos ``(después de, hasta incluir)`` de ``chunk_size`` filas.
+
+    ``None`` significa sin límite. Cada límite es la llave de la última fila
+    del rango, obtenida con un salto de ``chunk_size`` filas sobre el índice
+    del orden a partir del límite anterior.
+    """
+    from .services import LIST_ORDERING, _keyset_condition
+
+    keys = students.order_by(*LIST_ORDERING).values_list(*LIST_ORDERING)
+    bounds = []
+    lower = None
+    while True:
+        page = keys if lower is None else keys.filter(_keyset_condition(lower, backwards=False))
+        upper = page[chunk_size - 1:chunk_size].first()
+        if upper is None:
+            bounds.append((lower, None))
+            return bounds
+        bounds.append((lower, list(upper)))
+        lower = list(upper)
+
+
+def _shard_queryset(query, lower: list | None, upper: list | None):
+    from .models import Student
+    from .services import LIST_ORDERING, _keyset_condition
+
+    students = Student.objects.all()
+    students.query = query
+    if lower is not None:
+        students = students.filter(_keyset_condition(lower, backwards=False))
+    if upper is not None:
+        students = students.filter(_keyset_condition(upper, backwards=True, inclusive=True))
+    return students.order_by(*LIST_ORDERING)
+
+
+def _csv_shard(query, lower: list | None, upper: list | None) -> tuple[int, bytes]:
+    """Filas del rango como CSV en UTF-8 (sin encabezado)."""
+    from .services import iter_export_rows
+
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    count = 0
+    for row in iter_export_rows(_shard_queryset(query, lower, upper)):
+        writer.writerow(row)
+        count += 1
+    return count, buffer.getvalue().encode('utf-8')
+
+
+def _xlsx_shard(query, lower: list | None, upper: list | None, date_style: int, datetime_style: int) -> tuple[int, bytes]:
+    """Filas del rango como elementos ``<row>`` de SpreadsheetML.
+
+    Las filas y celdas van sin referencia (``r``): la posición es la del
+    orden en la hoja, así que no hace falta conocer el tamaño de los rangos
+    anteriores.
+    """
+    from datetime import date, datetime
+    from xml.sax.saxutils import escape
+
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    from openpyxl.compat.strings import safe_string
+    from openpyxl.utils.datetime import to_excel
+
+    from .services import iter_export_rows
+
+    def cell(value) -> str:
+        if value is None:
+            return '<c/>'
+        # safe_string redondea los números igual que openpyxl
+        if isinstance(value, datetime):
+            return f'<c s="{datetime_style}"><v>{safe_string(to_excel(value))}</v></c>'
+        if isinstance(value, date):
+            return f'<c s="{date_style}"><v>{safe_string(to_excel(value))}</v></c>'
+        if isinstance(value, (int, float)):
+            return f'<c><v>{safe_string(value)}</v></c>'
+        text = escape(ILLEGAL_CHARACTERS_RE.sub('', str(value)))
+        space = ' xml:space="preserve"' if text != text.strip() else ''
+        return f'<c t="inlineStr"><is><t{space}>{text}</t></is></c>'
+
+    parts = []
+    for row in iter_export_rows(_shard_queryset(query, lower, upper)):
+        parts.append('<row>' + ''.join(map(cell, row)) + '</row>')
+    return len(parts), ''.join(parts).encode('utf-8')
+
+
+def _run_shards(func: Callable, tasks: list[tuple], workers: int) -> Iterator[tuple[int, bytes]]:
+    """Ejecuta los rangos y los entrega en orden, con a lo sumo ``2 * workers`` pendientes."""
+    from django.db import connection
+
+    # Una base en memoria no es visible desde otros procesos
+    in_memory = getattr(connection, 'is_in_memory_db', lambda: False)()
+    if workers <= 1 or len(tasks) <= 1 or in_memory:
+        for task in tasks:
+            yield func(*task)
+        return
+
+    context = multiprocessing.get_context('spawn')
+    database_name = str(connection.settings_dict['NAME'])
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(database_name,),
+    ) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(func, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _open_output(output: IO[bytes] | str | Path):
+    if isinstance(output, (str, Path)):
+        return open(output, 'wb')
+    return None
+
+
+def export_students_csv_parallel(
+    students,
+    output: IO[bytes] | str | Path,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Escribe el CSV de ``students`` (en el orden del listado) y devuelve las filas escritas.
+
+    Produce los mismos bytes que ``stream_students_csv`` sobre el queryset
+    ordenado por ``LIST_ORDERING``.
+    """
+    from .services import EXPORT_COLUMNS
+
+    workers = workers or default_workers()
+    bounds = shard_bounds(students, chunk_size or default_chunk_size())
+    tasks = [(students.query, lower, upper) for lower, upper in bounds]
+    header = StringIO()
+    csv.writer(header, lineterminator='\n').writerow([name for name, _ in EXPORT_COLUMNS])
+
+    opened = _open_output(output)
+    handle = opened or output
+    count = 0
+    try:
+        handle.write(header.getvalue().encode('utf-8-sig'))
+        for rows, data in _run_shards(_csv_shard, tasks, workers):
+            handle.write(data)
+            count += rows
+            if progress is not None:
+                progress(count)
+    finally:
+        if opened is not None:
+            opened.close()
+    return count
+
+
+def _xlsx_template() -> tuple[bytes, int, int]:
+    """Libro write-only con el encabezado y los índices de estilo de fecha y fecha con hora."""
+    from datetime import date, datetime
+
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    from .services import EXPORT_COLUMNS
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    # Las celdas no se agregan a la hoja; solo registran los formatos en el libro
+    date_style = WriteOnlyCell(sheet, value=date(2000, 1, 1)).style_id
+    datetime_style = WriteOnlyCell(sheet, value=datetime(2000, 1, 1)).style_id
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue(), date_style, datetime_style
+
+
+def _write_xlsx(template: bytes, shards: Iterable[tuple[int, bytes]], output, progress) -> int:
+    count = 0
+    with zipfile.ZipFile(BytesIO(template)) as source, zipfile.ZipFile(
+        output, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=SHEET_COMPRESSLEVEL
+    ) as target:
+        for info in source.infolist():
+            if info.filename != SHEET_PATH:
+                target.writestr(info, source.read(info))
+                continue
+            head, tail = source.read(info).split(b'</sheetData>', 1)
+            with target.open(SHEET_PATH, 'w', force_zip64=True) as sheet:
+                sheet.write(head)
+                for rows, data in shards:
+                    sheet.write(data)
+                    count += rows
+                    if progress is not None:
+                        progress(count)
+                sheet.write(b'</sheetData>' + tail)
+    return count
+
+
+def export_students_excel_parallel(
+    students,
+    output: IO[bytes] | str | Path,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Escribe el xlsx de ``students`` en una sola hoja y devuelve las filas escritas.
+
+    El contenido equivale al de ``export_students_excel_file`` sobre el
+    queryset ordenado por ``LIST_ORDERING``.
+    """
+    workers = workers or default_workers()
+    template, date_style, datetime_style = _xlsx_template()
+    bounds = shard_bounds(students, chunk_size or default_chunk_size())
+    tasks = [(students.query, lower, upper, date_style, datetime_style) for lower, upper in bounds]
+    shards = _run_shards(_xlsx_shard, tasks, workers)
+    opened = _open_output(output)
+    try:
+        return _write_xlsx(template, shards, opened or output, progress)
+    finally:
+        if opened is not None:
+            opened.close()
@@ -0,0 +1,137 @@
+"""Filas de solo lectura para el listado, las exportaciones y las estadísticas.
+
+Armar instancias de ``Student`` cuesta memoria (``__dict__``, ``ModelState``)
+y CPU (``Model.__init__`` y las señales ``pre_init``/``post_init``) aunque
+solo se lean unos cuantos campos. Estas clases con ``__slots__`` se llenan
+directamente con las tuplas de ``values_list`` y traen ya calculados
+``full_name``, ``grupo`` (el código) y ``carrera_nombre`` con el catálogo en
+memoria (``catalog``), sin JOIN.
+
+``iter_rows`` las produce de forma perezosa con un cursor por bloques;
+``as_rows`` acepta además listas de instancias para los llamadores que ya
+las tienen.
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import ClassVar, Iterable, Iterator, TypeVar
+
+from django.db.models import QuerySet
+
+from . import catalog
+from .models import Student
+
+ROW_CHUNK_SIZE = 2000
+
+RowT = TypeVar('RowT', bound='ReadModel')
+
+
+class ReadModel(ABC):
+    """Base de las filas: ``fields`` son las columnas que se leen, en orden.
+
+    Cada subclase declara sus ``__slots__`` (``fields`` más los campos
+    calculados); ``fields`` siempre incluye ``pk``.
+    """
+
+    __slots__ = ()
+    fields: ClassVar[tuple[str, ...]] = ()
+    pk: int
+
+    @abstractmethod
+    def __init__(self, values: tuple, careers: dict[int, str], groups: dict[int, str]) -> None:
+        """Llena la fila con una tupla en el orden de ``fields`` y los nombres del catálogo."""
+
+    @property
+    def id(self) -> int:
+        return self.pk
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.pk}>"
+
+
+class StatRow(ReadModel):
+    """Llave de conteo de un estudiante (grupo, carrera y estado)."""
+
+    fields = ('pk', 'grupo_id', 'carrera_id', 'estado')
+    __slots__ = fields + ('grupo', 'carrera_nombre')
+
+    def __init__(self, values: tuple, careers: dict[int, str], groups: dict[int, str]) -> None:
+        self.pk, self.grupo_id, self.carrera_id, self.estado = values
+        self.grupo = groups.get(self.grupo_id, '')
+        self.carrera_nombre = careers.get(self.carrera_id, '')
+
+
+class StudentListRow(ReadModel):
+    """Columnas que pinta el listado; empieza con ``LIST_ORDERING`` para paginar por llave."""
+
+    fields = (
+        'apellido_paterno', 'apellido_materno', 'nombre', 'pk',
+        'matricula', 'correo', 'grupo_id', 'carrera_id', 'estado',
+    )
+    __slots__ = fields + ('full_name', 'grupo', 'carrera_nombre')
+
+    def __init__(self, values: tuple, careers: dict[int, str], groups: dict[int, str]) -> None:
+        (
+            self.apellido_paterno, self.apellido_materno, self.nombre, self.pk,
+            self.matricula, self.correo, self.grupo_id, self.carrera_id, self.estado,
+        ) = values
+        self.full_name = f"{self.nombre} {self.apellido_paterno} {self.apellido_materno}".strip()
+        self.grupo = groups.get(self.grupo_id, '')
+        self.carrera_nombre = careers.get(self.carrera_id, '')
+
+
+class StudentRow(ReadModel):
+    """Todas las columnas de la exportación."""
+
+    fields = (
+        'pk', 'nombre', 'apellido_paterno', 'apellido_materno', 'matricula', 'correo', 'telefono',
+        'direccion', 'fecha_nacimiento', 'grupo_id', 'carrera_id', 'estado', 'fecha_inscripcion', 'created_at',
+    )
+    __slots__ = fields + ('full_name', 'grupo', 'carrera_nombre')
+
+    def __init__(self, values: tuple, careers: dict[int, str], groups: dict[int, str]) -> None:
+        (
+            self.pk, self.nombre, self.apellido_paterno, self.apellido_materno, self.matricula, self.correo,
+            self.telefono, self.direccion, self.fecha_nacimiento, self.grupo_id, self.carrera_id, self.estado,
+            self.fecha_inscripcion, self.created_at,
+        ) = values
+        self.full_name = f"{self.nombre} {self.apellido_paterno} {self.apellido_materno}".strip()
+        self.grupo = groups.get(self.grupo_id, '')
+        self.carrera_nombre = careers.get(self.carrera_id, '')
+
+
+def names() -> tuple[dict[int, str], dict[int, str]]:
+    """Nombres de carrera y códigos de grupo por id, tomados una vez del catálogo."""
+    careers = {pk: nombre for pk, (nombre, _clave) in catalog.careers().items()}
+    return careers, catalog.group_codes()
+
+
+def row_values(students: QuerySet[Student], row_class: type[ReadModel] = StudentRow) -> QuerySet:
+    """Queryset de ``values_list`` con las columnas de ``row_class`` (paginable con ``paginate_students``)."""
+    return students.values_list(*row_class.fields)
+
+
+def rows_from_values(values: Iterable[tuple], row_class: type[RowT] = StudentRow) -> Iterator[RowT]:
+    """Convierte tuplas en el orden de ``row_class.fields`` en filas."""
+    careers, groups = names()
+    return (row_class(row, careers, groups) for row in values)
+
+
+def iter_rows(
+    students: QuerySet[Student],
+    row_class: type[RowT] = StudentRow,
+    chunk_size: int = ROW_CHUNK_SIZE,
+) -> Iterator[RowT]:
+    """Recorre el queryset como filas, leyendo del cursor de ``chunk_size`` en ``chunk_size``."""
+    return rows_from_values(row_values(students, row_class).iterator(chunk_size=chunk_size), row_class)
+
+
+def as_rows(students: Iterable, row_class: type[RowT] = StudentRow) -> Iterator[RowT]:
+    """Filas a partir de un queryset (sin instanciar modelos) o de instancias ya cargadas."""
+    if isinstance(students, QuerySet):
+        return iter_rows(students, row_class)
+    careers, groups = names()
+    return (
+        student if isinstance(student, row_class)
+        else row_class(tuple(getattr(student, field) for field in row_class.fields), careers, groups)
+        for student in students
+    )
@@ -0,0 +1,227 @@
+"""Reportes de inscripciones por mes, estados por cohorte y edades por carrera y grupo.
+
+- Inscripciones por mes y estados por cohorte (año de inscripción) se
+  agregan en la base de datos con ``TruncMonth``/``TruncYear`` y ``GROUP BY``
+  sobre el índice ``student_enrollment_idx``. Los periodos cerrados (antes
+  del mes o año en curso) se guardan en ``ReportPeriod`` y no se vuelven a
+  calcular; el periodo en curso (y los posteriores) se calcula en cada
+  consulta. Las señales de ``Student`` borran los periodos que toca un
+  cambio y ``rebuild_stats`` (cargas masivas) los borra todos; los
+  ``QuerySet.update()`` no pasan por las señales.
+- La distribución de edades se agrupa con ``np.searchsorted``/``np.bincount``
+  sobre el snapshot columnar cuando existe (``refresh_snapshot``) y, si no,
+  con un ``CASE`` por rango de fecha de nacimiento en la base de datos.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Case, Count, Func, IntegerField, Max, Min, Q, Value, When
+from django.db.models.functions import TruncMonth, TruncYear
+from django.utils import timezone
+
+from . import catalog, fragment_cache
+from .models import ReportPeriod, Student
+from .snapshot import load_snapshot
+
+# Una edad pertenece al rango que empieza en el mayor límite alcanzado
+AGE_EDGES = (18, 21, 24, 27, 30)
+AGE_LABELS = ('<18', '18-20', '21-23', '24-26', '27-29', '30+')
+
+
+@dataclass(frozen=True)
+class PeriodReport:
+    """Conteo por periodo de inscripción con desglose por ``breakdown``."""
+
+    name: str
+    trunc: type[Func]
+    breakdown: str
+    months: int
+
+    def period(self, value: date) -> str:
+        return f"{value:%Y-%m}" if self.months == 1 else f"{value:%Y}"
+
+    def start(self, period: str) -> date:
+        year, _, month = period.partition('-')
+        return date(int(year), int(month or 1), 1)
+
+    def following(self, period: str) -> str:
+        start = self.start(period)
+        index = start.year * 12 + start.month - 1 + self.months
+        return self.period(date(index // 12, index % 12 + 1, 1))
+
+    def periods(self, first: date, last: date) -> list[str]:
+        periods = [self.period(first)]
+        while periods[-1] < self.period(last):
+            periods.append(self.following(periods[-1]))
+        return periods
+
+
+ENROLLMENTS = PeriodReport('inscripciones', TruncMonth, 'carrera_id', months=1)
+COHORTS = PeriodReport('cohortes', TruncYear, 'estado', months=12)
+PERIOD_REPORTS = (ENROLLMENTS, COHORTS)
+
+
+def _runs(report: PeriodReport, periods: list[str]) -> list[tuple[date, date]]:
+    """Agrupa periodos consecutivos en rangos ``[inicio, fin)`` de fechas."""
+    runs: list[list[str]] = []
+    for period in periods:
+        if runs and report.following(runs[-1][-1]) == period:
+            runs[-1].append(period)
+        else:
+            runs.append([period])
+    return [(report.start(run[0]), report.start(report.following(run[-1]))) for run in runs]
+
+
+def _compute(report: PeriodReport, periods: list[str]) -> dict[str, dict]:
+    """Agrega los periodos indicados con una sola consulta ``GROUP BY``."""
+    if not periods:
+        return {}
+    ranges = Q()
+    for start, end in _runs(report, periods):
+        ranges |= Q(fecha_inscripcion__gte=start, fecha_inscripcion__lt=end)
+    rows = (
+        Student.objects.filter(ranges)
+        .order_by()
+        .annotate(periodo=report.trunc('fecha_inscripcion'))
+        .values_list('periodo', report.breakdown)
+        .annotate(total=Count('pk'))
+    )
+    result = {period: {'total': 0, 'detalle': {}} for period in periods}
+    for moment, key, total in rows:
+        data = result[report.period(moment)]
+        data['total'] += total
+        data['detalle'][str(key)] = total
+    return result
+
+
+def period_report(report: PeriodReport, today: date | None = None) -> list[dict]:
+    """Filas ``{'periodo', 'total', 'detalle'}`` desde la primera inscripción hasta el periodo en curso."""
+    today = today or timezone.localdate()
+    span = Student.objects.aggregate(first=Min('fecha_inscripcion'), last=Max('fecha_inscripcion'))
+    if span['first'] is None:
+        return []
+    current = report.period(today)
+    periods = report.periods(span['first'], max(span['last'], today))
+
+    stored = dict(ReportPeriod.objects.filter(reporte=report.name).values_list('periodo', 'datos'))
+    missing = [period for period in periods if period < current and period not in stored]
+    if missing:
+        # En la misma transacción que la lectura: un cambio concurrente no puede colarse entre ambas
+        with transaction.atomic():
+            computed = _compute(report, missing)
+            ReportPeriod.objects.bulk_create(
+                [ReportPeriod(reporte=report.name, periodo=period, datos=data) for period, data in computed.items()],
+                ignore_conflicts=True,
+            )
+        stored.update(computed)
+    stored.update(_compute(report, [period for period in periods if period >= current]))
+    return [{'periodo': period, **stored[period]} for period in periods]
+
+
+def invalidate_periods(dates: Iterable[date | None]) -> None:
+    """Borra los periodos guardados que contienen alguna de las fechas de inscripción."""
+    keys = Q()
+    for value in {value for value in dates if isinstance(value, date)}:
+        for report in PERIOD_REPORTS:
+            keys |= Q(reporte=report.name, periodo=report.period(value))
+    if keys:
+        ReportPeriod.objects.filter(keys).delete()
+
+
+def invalidate_reports() -> None:
+    """Borra todos los periodos guardados (tras cargas que no envían señales)."""
+    ReportPeriod.objects.all().delete()
+
+
+def _age_limits(today: date) -> list[date]:
+    """Fecha de nacimiento máxima para cada edad de ``AGE_EDGES``, de la mayor edad a la menor."""
+    limits = []
+    for age in reversed(AGE_EDGES):
+        try:
+            limits.append(today.replace(year=today.year - age))
+        except ValueError:  # 29 de febrero
+            limits.append(today.replace(year=today.year - age, day=28))
+    return limits
+
+
+def _ages_from_snapshot(snapshot, today: date) -> dict[tuple[str, str], list[int]]:
+    epoch = date(1970, 1, 1).toordinal()
+    limits = np.array([limit.toordinal() - epoch for limit in _age_limits(today)], dtype=np.int32)
+    births = snapshot.columns['fecha_nacimiento']
+    buckets = len(limits) - np.searchsorted(limits, births, side='left')
+    careers = snapshot.columns['carrera'].astype(np.int64)
+    groups = snapshot.columns['grupo'].astype(np.int64)
+    shape = (len(snapshot.categories['carrera']), len(snapshot.categories['grupo']), len(AGE_LABELS))
+    counts = np.bincount(
+        np.ravel_multi_index([careers, groups, buckets], shape), minlength=int(np.prod(shape))
+    ).reshape(shape)
+    career_labels = snapshot.labels('carrera')
+    group_labels = snapshot.labels('grupo')
+    return {
+        (career_labels[career], group_labels[group]): counts[career, group].tolist()
+        for career, group in zip(*np.nonzero(counts.sum(axis=2)))
+    }
+
+
+def _ages_from_database(today: date) -> dict[tuple[str, str], list[int]]:
+    limits = _age_limits(today)
+    bucket = Case(
+        *(
+            When(fecha_nacimiento__lte=limit, then=Value(len(AGE_LABELS) - 1 - index))
+            for index, limit in enumerate(limits)
+        ),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    rows = (
+        Student.objects.order_by()
+        .annotate(rango=bucket)
+        .values_list('carrera_id', 'grupo_id', 'rango')
+        .annotate(total=Count('pk'))
+    )
+    careers = {pk: nombre for pk, (nombre, _clave) in catalog.careers().items()}
+    groups = catalog.group_codes()
+    result: dict[tuple[str, str], list[int]] = {}
+    for career_id, group_id, rango, total in rows:
+        key = (careers.get(career_id, str(career_id)), groups.get(group_id, str(group_id)))
+        result.setdefault(key, [0] * len(AGE_LABELS))[rango] += total
+    return result
+
+
+def age_distribution(today: date | None = None) -> dict:
+    """Estudiantes por rango de edad (``AGE_LABELS``) para cada carrera y grupo."""
+    today = today or timezone.localdate()
+    snapshot = load_snapshot()
+
+    def compute() -> dict:
+        if snapshot is not None:
+            counts = _ages_from_snapshot(snapshot, today)
+            source = {'fuente': 'snapshot', 'actualizado': snapshot.meta['generated_at']}
+        else:
+            counts = _ages_from_database(today)
+            source = {'fuente': 'base de datos', 'actualizado': timezone.now().isoformat()}
+        rows = [
+            {'carrera': career, 'grupo': group, 'conteos': values, 'total': sum(values)}
+            for (career, group), values in sorted(counts.items())
+        ]
+        totals = [sum(row['conteos'][index] for row in rows) for index in range(len(AGE_LABELS))]
+        return {'corte': today.isoformat(), 'rangos': list(AGE_LABELS), 'filas': rows, 'totales': totals, **source}
+
+    version = snapshot.path.name if snapshot is not None else 'db'
+    return fragment_cache.get_or_set('report_ages', (today.isoformat(), version), compute)
+
+
+def build_reports(today: date | None = None) -> dict:
+    """Los tres reportes, con los nombres de carrera del desglose de inscripciones."""
+    today = today or timezone.localdate()
+    return {
+        'inscripciones': period_report(ENROLLMENTS, today),
+        'cohortes': period_report(COHORTS, today),
+        'edades': age_distribution(today),
+        'carreras': {str(pk): nombre for pk, (nombre, _clave) in catalog.careers().items()},
+        'estados': [value for value, _ in Student.STATUS_CHOICES],
+    }
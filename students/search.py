@@ -0,0 +1,106 @@
+"""Búsqueda de estudiantes con un índice FTS5 de SQLite.
+
+La tabla virtual ``students_student_fts`` usa ``students_student`` como
+contenido externo y se mantiene sincronizada con triggers (ver migración
+0003), por lo que también cubre ``bulk_create`` y el admin. El tokenizador
+``unicode61 remove_diacritics 2`` permite buscar "nunez" y encontrar "Núñez".
+Si el índice no existe (otro motor o SQLite sin FTS5) se usa el filtro
+``icontains`` de siempre.
+"""
+from __future__ import annotations
+import re
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import Student
+
+FTS_TABLE = 'students_student_fts'
+
+_available: bool = False
+
+
+def fts_available() -> bool:
+    """Indica si el índice FTS5 existe en la base de datos actual."""
+    global _available
+    if _available:
+        return True
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        _available = cursor.fetchone() is not None
+    return _available
+
+
+def build_match_query(query: str) -> str:
+    """Convierte el texto del usuario en una expresión MATCH de prefijos unidos con AND.
+
+    Cada palabra se cita para que los operadores de FTS5 no se interpreten,
+    p. ej. ``ana.gar`` -> ``"ana"* "gar"*``.
+    """
+    return ' '.join(f'"{token}"*' for token in re.findall(r'\w+', query))
+
+
+def _orm_filter(students: QuerySet[Student], query: str) -> QuerySet[Student]:
+    return students.filter(
+        Q(nombre__icontains=query)
+        | Q(apellido_paterno__icontains=query)
+        | Q(apellido_materno__icontains=query)
+        | Q(matricula__icontains=query)
+        | Q(correo__icontains=query)
+    )
+
+
+def search_students(students: QuerySet[Student], query: str) -> QuerySet[Student]:
+    """Filtra el queryset con el índice FTS5 o, si no está disponible, con ``icontains``."""
+    match = build_match_query(query)
+    if not match or not fts_available():
+        return _orm_filter(students, query)
+    return students.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+    )
+
+
+def ranked_student_ids(
+    students: QuerySet[Student],
+    query: str,
+    boundary: list | None = None,
+    backwards: bool = False,
+    limit: int = 50,
+) -> list[tuple[int, float]] | None:
+    """Devuelve ``(id, bm25)`` de las coincidencias dentro de ``students``, de más a menos relevante.
+
+    ``bm25`` es negativo y menor mientras más relevante, así que el orden es
+    ``(bm25, id)`` ascendente; ``boundary`` es la llave ``[bm25, id]`` a partir
+    de la cual se continúa (hacia atrás con ``backwards``). Las puntuaciones se
+    calculan una sola vez en una CTE materializada: como subconsulta correlacionada
+    FTS5 tendría que evaluar la búsqueda por cada fila. Devuelve ``None`` si no
+    hay índice FTS5.
+    """
+    match = build_match_query(query)
+    if not match or not fts_available():
+        return None
+    ids_sql, ids_params = students.order_by().values('pk').query.sql_with_params()
+    params = [match, *ids_params]
+    condition = ''
+    if boundary is not None:
+        condition = f"AND (rank, id) {'<' if backwards else '>'} (%s, %s)"
+        params += boundary
+    direction = 'DESC' if backwards else 'ASC'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH ranked AS MATERIALIZED ("
+            f"SELECT rowid AS id, bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s) "
+            f"SELECT id, rank FROM ranked WHERE id IN ({ids_sql}) {condition} "
+            f"ORDER BY rank {direction}, id {direction} LIMIT %s",
+            [*params, limit],
+        )
+        return [(pk, rank) for pk, rank in cursor.fetchall()]
+
+
+def rebuild_index() -> None:
+    """Reconstruye el índice completo a partir de ``students_student``."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
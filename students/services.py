@@ -1,30 +1,73 @@
 """Servicios de negocio y utilidades de datos."""
 from __future__ import annotations
-from typing import Iterable
-from io import BytesIO
+from typing import IO, Callable, Iterable, Iterator
+from io import BytesIO, StringIO
+import asyncio
+import base64
+import csv
+import json
+import tempfile
+import httpx
 import pandas as pd
-import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db.models import BooleanField, Count, QuerySet
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
-from .models import Student
+from . import catalog
+from .models import Student, StudentStat, University
+from .read_models import StatRow, StudentRow, as_rows
+from .search import ranked_student_ids, search_students
+from .universities import search_catalog, search_catalog_many
+from .university_client import get_client
+
+
+STATUS_LABELS = ['Inscrito', 'Baja temporal', 'Baja definitiva', 'Egresado']
+
+# Orden del listado: Meta.ordering de Student más la pk como desempate
+LIST_ORDERING = ('apellido_paterno', 'apellido_materno', 'nombre', 'pk')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+API_MAX_PAGE_SIZE = 10000
+COUNT_LIMIT = 10000
+MAX_UNIVERSITY_QUERIES = 12
+
+# Columnas de exportación (encabezado, campo en la base de datos)
+EXPORT_COLUMNS = [
+    ('Nombre', 'nombre'),
+    ('Apellido paterno', 'apellido_paterno'),
+    ('Apellido materno', 'apellido_materno'),
+    # Carrera y grupo se resuelven con el catálogo en memoria en vez de un JOIN
+    ('Carrera', 'carrera_id'),
+    ('Matrícula', 'matricula'),
+    ('Correo', 'correo'),
+    ('Teléfono', 'telefono'),
+    ('Grupo', 'grupo_id'),
+    ('Estado', 'estado'),
+    ('Fecha de nacimiento', 'fecha_nacimiento'),
+    ('Fecha de inscripción', 'fecha_inscripcion'),
+    ('Dirección', 'direccion'),
+    ('Registrado', 'created_at'),
+]
+EXPORT_CHUNK_SIZE = 2000
 
 
 def generate_group_stats(students: Iterable[Student]) -> list[dict]:
     """Genera estadísticas por grupo y carrera utilizando pandas."""
-    if not students:
+    rows = [(s.grupo, s.estado, s.carrera_nombre) for s in as_rows(students, StatRow)]
+    if not rows:
         return []
-    data = [{'grupo': s.grupo, 'estado': s.estado, 'carrera': s.carrera.nombre} for s in students]
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(rows, columns=['grupo', 'estado', 'carrera'])
     grouped = df.groupby(['grupo', 'carrera']).size().reset_index(name='total')
     return grouped.to_dict(orient='records')
 
 
 def generate_career_stats(students: Iterable[Student]) -> list[dict]:
     """Devuelve el conteo de estudiantes por carrera."""
-    if not students:
+    careers = [s.carrera_nombre for s in as_rows(students, StatRow)]
+    if not careers:
         return []
-    df = pd.DataFrame([{'carrera': s.carrera.nombre} for s in students])
-    grouped = df['carrera'].value_counts().reset_index()
+    grouped = pd.Series(careers, name='carrera').value_counts().reset_index()
     grouped.columns = ['carrera', 'total']
     return grouped.to_dict(orient='records')
 
@@ -37,55 +80,347 @@ def count_status(students: Iterable[Student]) -> dict:
         'Baja definitiva': 0,
         'Egresado': 0,
     }
-    if not students:
+    statuses = [s.estado for s in as_rows(students, StatRow)]
+    if not statuses:
         return template
-    df = pd.DataFrame([{'estado': s.estado} for s in students])
-    counts = df['estado'].value_counts().to_dict()
+    counts = pd.Series(statuses, name='estado').value_counts().to_dict()
     template.update(counts)
     return template
 
 
+def compute_dashboard_stats(students: QuerySet[Student] | None = None) -> dict:
+    """Calcula todas las métricas del dashboard sin crear instancias del modelo.
+
+    Sin argumentos lee la tabla materializada ``StudentStat`` (unas cuantas
+    filas por grupo); con un queryset ejecuta un único
+    ``GROUP BY grupo, carrera, estado`` sobre él. En ambos casos el resto de
+    conteos se derivan en Python y las estructuras devueltas son las mismas
+    que producen ``count_status``, ``generate_group_stats`` y
+    ``generate_career_stats``.
+    """
+    if students is None:
+        rows = (
+            StudentStat.objects.filter(total__gt=0)
+            .values_list('grupo_id', 'carrera_id', 'estado', 'total')
+        )
+    else:
+        rows = (
+            students.order_by()
+            .values_list('grupo_id', 'carrera_id', 'estado')
+            .annotate(total=Count('pk'))
+        )
+    careers = catalog.careers()
+
+    status_counts = {label: 0 for label in STATUS_LABELS}
+    by_group: dict[tuple[str, str], int] = {}
+    by_career: dict[str, int] = {}
+    groups: set[str] = set()
+    students_total = 0
+    for grupo_id, carrera_id, estado, total in rows:
+        grupo = catalog.group_code(grupo_id)
+        carrera = careers[carrera_id][0] if carrera_id in careers else ''
+        status_counts[estado] = status_counts.get(estado, 0) + total
+        by_group[(grupo, carrera)] = by_group.get((grupo, carrera), 0) + total
+        by_career[carrera] = by_career.get(carrera, 0) + total
+        groups.add(grupo)
+        students_total += total
+
+    # Mismo orden que pandas: groupby ordena por llaves y value_counts por total descendente
+    stats_by_group = [
+        {'grupo': grupo, 'carrera': carrera, 'total': total}
+        for (grupo, carrera), total in sorted(by_group.items())
+    ]
+    career_stats = [
+        {'carrera': carrera, 'total': total}
+        for carrera, total in sorted(by_career.items(), key=lambda item: (-item[1], item[0]))
+    ]
+    return {
+        'students_total': students_total,
+        'status_counts': status_counts,
+        'groups_count': len(groups),
+        'stats_by_group': stats_by_group,
+        'career_stats': career_stats,
+    }
+
+
+def filter_students(
+    students: QuerySet[Student],
+    query: str = '',
+    group: str = '',
+    status: str = '',
+) -> QuerySet[Student]:
+    """Aplica los filtros del listado (texto libre, grupo y estado)."""
+    if query:
+        students = search_students(students, query)
+    if group:
+        # El código se resuelve a su id en el catálogo (sin distinguir mayúsculas) y se filtra por el entero
+        group_id = catalog.group_id(group)
+        students = students.filter(grupo_id=group_id) if group_id is not None else students.none()
+    if status:
+        students = students.filter(estado=status)
+    return students
+
+
+def encode_cursor(values: Iterable) -> str:
+    """Serializa la llave de ordenamiento de una fila en un token opaco para la URL."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str | None, length: int = len(LIST_ORDERING)) -> list | None:
+    """Decodifica un cursor de ``length`` valores; devuelve ``None`` si viene vacío o alterado."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    # Cada valor termina como parámetro SQL: solo escalares JSON y el pk como entero.
+    if any(isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))) for value in values):
+        return None
+    if not isinstance(values[-1], int):
+        return None
+    return values
+
+
+def _keyset_condition(values: list, backwards: bool, inclusive: bool = False) -> RawSQL:
+    """Construye ``(a, b, c, pk) > (x, y, z, id)`` como comparación de tuplas.
+
+    SQLite resuelve la comparación de tuplas como una búsqueda por rango en
+    el índice del orden del listado, en lugar de recorrerlo desde el inicio.
+    Con ``inclusive`` la comparación incluye la fila del cursor (``>=``/``<=``).
+    """
+    opts = Student._meta
+    columns = ', '.join(
+        f'"{opts.db_table}"."{(opts.pk if field == "pk" else opts.get_field(field)).column}"'
+        for field in LIST_ORDERING
+    )
+    placeholders = ', '.join(['%s'] * len(LIST_ORDERING))
+    operator = ('<' if backwards else '>') + ('=' if inclusive else '')
+    return RawSQL(f"({columns}) {operator} ({placeholders})", values, output_field=BooleanField())
+
+
+def paginate_students(
+    students: QuerySet[Student],
+    after: str | None = None,
+    before: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_page_size: int = MAX_PAGE_SIZE,
+) -> dict:
+    """Pagina por llave (keyset) sobre ``LIST_ORDERING``.
+
+    En lugar de ``OFFSET`` se filtra a partir de la última fila vista, por lo
+    que una página profunda cuesta lo mismo que la primera. Devuelve las filas
+    de la página y los cursores ``next_cursor``/``previous_cursor`` (o ``None``).
+    Acepta querysets de modelos, de ``values()`` que incluyan los campos de
+    ``LIST_ORDERING`` o de ``values_list()`` que empiecen con ellos.
+    """
+    page_size = max(1, min(page_size, max_page_size))
+    after_values = decode_cursor(after)
+    before_values = None if after_values else decode_cursor(before)
+    backwards = before_values is not None
+
+    ordering = [f'-{field}' for field in LIST_ORDERING] if backwards else list(LIST_ORDERING)
+    students = students.order_by(*ordering)
+    boundary = before_values if backwards else after_values
+    if boundary is not None:
+        students = students.filter(_keyset_condition(boundary, backwards))
+
+    # Se pide una fila extra solo para saber si existe otra página
+    items = list(students[:page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    if backwards:
+        items.reverse()
+
+    def key(item: Student | dict | tuple) -> list:
+        if isinstance(item, tuple):
+            return list(item[:len(LIST_ORDERING)])
+        if isinstance(item, dict):
+            return [item[field] for field in LIST_ORDERING]
+        return [getattr(item, field) for field in LIST_ORDERING]
+
+    has_next = (not backwards and has_more) or backwards
+    has_previous = (backwards and has_more) or (not backwards and after_values is not None)
+    return {
+        'items': items,
+        'next_cursor': encode_cursor(key(items[-1])) if items and has_next else None,
+        'previous_cursor': encode_cursor(key(items[0])) if items and has_previous else None,
+        'page_size': page_size,
+    }
+
+
+def paginate_search(
+    students: QuerySet[Student],
+    query: str,
+    after: str | None = None,
+    before: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_page_size: int = MAX_PAGE_SIZE,
+) -> dict | None:
+    """Pagina por llave ``(bm25, pk)`` las coincidencias de ``query``, de más a menos relevante.
+
+    Misma forma de resultado que ``paginate_students``, pero ``items`` son las
+    pks en orden de relevancia (``students`` ya debe venir filtrado por la
+    búsqueda y los demás filtros). Devuelve ``None`` sin índice FTS5; en ese
+    caso se pagina con ``paginate_students``.
+    """
+    page_size = max(1, min(page_size, max_page_size))
+    after_values = decode_cursor(after, length=2)
+    before_values = None if after_values else decode_cursor(before, length=2)
+    backwards = before_values is not None
+
+    ranked = ranked_student_ids(
+        students, query, boundary=before_values if backwards else after_values, backwards=backwards,
+        limit=page_size + 1,
+    )
+    if ranked is None:
+        return None
+    has_more = len(ranked) > page_size
+    ranked = ranked[:page_size]
+    if backwards:
+        ranked.reverse()
+
+    has_next = (not backwards and has_more) or backwards
+    has_previous = (backwards and has_more) or (not backwards and after_values is not None)
+    return {
+        'items': [pk for pk, _rank in ranked],
+        'next_cursor': encode_cursor([ranked[-1][1], ranked[-1][0]]) if ranked and has_next else None,
+        'previous_cursor': encode_cursor([ranked[0][1], ranked[0][0]]) if ranked and has_previous else None,
+        'page_size': page_size,
+    }
+
+
+def count_students_capped(students: QuerySet[Student], limit: int = COUNT_LIMIT) -> tuple[int, bool]:
+    """Cuenta filas hasta ``limit``; el segundo valor indica si se alcanzó el tope.
+
+    ``COUNT(*)`` sobre una subconsulta con ``LIMIT`` deja de leer en cuanto
+    llega al tope, así que el costo está acotado aun con tablas enormes.
+    """
+    total = students.order_by()[:limit + 1].count()
+    return min(total, limit), total > limit
+
+
 def fetch_universities(
     country: str | None = None,
     name: str | None = None,
     limit: int = 30,
 ) -> dict:
-    """Consume la API Hipolabs para listar universidades.
+    """Lista universidades desde el catálogo local o, si está vacío, desde la API Hipolabs.
 
-    Si la API no responde, devolvemos datos de ejemplo y anotamos
-    la advertencia para mostrarla en la interfaz.
+    Con el catálogo sincronizado (``sync_universities``) la búsqueda se
+    resuelve en la base de datos. Sin él, las respuestas se sirven desde la
+    caché del cliente compartido; solo si la API falla y no hay ninguna copia
+    guardada devolvemos datos de ejemplo y anotamos la advertencia para
+    mostrarla en la interfaz.
     """
+    if University.objects.exists():
+        return search_catalog(country=country, name=name, limit=limit)
 
-    base_url = settings.UNIVERSITIES_API_BASE_URL.rstrip('/')
-    params: dict[str, str] = {}
-    if country:
-        params['country'] = country
-    if name:
-        params['name'] = name
-
+    client = get_client()
     try:
-        response = requests.get(f"{base_url}/search", params=params, timeout=12)
-        response.raise_for_status()
-        payload = response.json()
+        payload, _stale = client.search(country=country, name=name)
     except Exception as exc:  # pragma: no cover - dependiente de la red
+        params = {key: value for key, value in (('country', country), ('name', name)) if value}
         return _fallback_university_data(params, warning=str(exc))
 
-    records: list[dict] = []
-    for entry in payload[:limit]:
-        web_pages = entry.get('web_pages') or []
-        domains = entry.get('domains') or []
-        records.append({
-            'name': entry.get('name'),
-            'country': entry.get('country'),
-            'alpha_two_code': entry.get('alpha_two_code'),
-            'website': web_pages[0] if web_pages else None,
-            'domain': domains[0] if domains else None,
-        })
-
+    records = [_university_record(entry) for entry in payload[:limit]]
     chart = _build_university_chart(records)
     return {'records': records, 'chart': chart}
 
 
+def university_queries(countries: Iterable[str], names: Iterable[str]) -> list[tuple[str | None, str | None]]:
+    """Combina cada país con cada nombre (sin repetidos); una lista vacía equivale a "sin filtro"."""
+    def unique(values: Iterable[str]) -> list[str | None]:
+        seen: dict[str, str] = {}
+        for value in values:
+            value = ' '.join((value or '').split())
+            if value:
+                seen.setdefault(value.casefold(), value)
+        return list(seen.values()) or [None]
+
+    queries = [(country, name) for country in unique(countries) for name in unique(names)]
+    if len(queries) > MAX_UNIVERSITY_QUERIES:
+        raise ValueError(f"Se permiten como máximo {MAX_UNIVERSITY_QUERIES} combinaciones de país y nombre.")
+    return queries
+
+
+async def fetch_universities_many(
+    queries: list[tuple[str | None, str | None]],
+    limit: int = 30,
+    concurrency: int | None = None,
+    deadline: float | None = None,
+) -> dict:
+    """Resuelve varias búsquedas ``(country, name)`` a la vez y une los resultados.
+
+    Con el catálogo local es una sola consulta SQL. Si no, las búsquedas se
+    lanzan en paralelo contra Hipolabs (como máximo ``concurrency`` a la vez
+    y cada una con ``deadline`` segundos), así que la latencia total se
+    acerca a la de la búsqueda más lenta. Los resultados se deduplican por
+    dominio y la gráfica cuenta todas las universidades unidas; las búsquedas
+    que fallan se reportan en ``errors`` y solo si fallan todas se devuelven
+    los datos de ejemplo.
+    """
+    if await University.objects.aexists():
+        return await sync_to_async(search_catalog_many)(queries, limit=limit)
+
+    client = get_client()
+    semaphore = asyncio.Semaphore(concurrency or settings.UNIVERSITIES_ASYNC_CONCURRENCY)
+    deadline = deadline or settings.UNIVERSITIES_ASYNC_DEADLINE
+
+    async def run(http, country: str | None, name: str | None) -> list[dict]:
+        async with semaphore:
+            # El plazo cuenta desde que la búsqueda obtiene su turno, no desde que entra en la cola
+            payload, _stale = await asyncio.wait_for(client.asearch(country=country, name=name, http=http), deadline)
+            return payload
+
+    # Un cliente por lote: las búsquedas comparten conexiones y se cierran al terminar
+    async with client.async_http() as http:
+        results = await asyncio.gather(
+            *(run(http, country, name) for country, name in queries), return_exceptions=True
+        )
+
+    merged: dict[str, dict] = {}
+    errors: list[str] = []
+    for (country, name), result in zip(queries, results):
+        if isinstance(result, BaseException):
+            label = ' / '.join(value for value in (country, name) if value) or 'todas'
+            if isinstance(result, asyncio.TimeoutError):
+                reason = f"sin respuesta en {deadline:g} s"
+            elif isinstance(result, httpx.HTTPStatusError):
+                reason = f"HTTP {result.response.status_code}"
+            else:
+                reason = str(result) or type(result).__name__
+            errors.append(f"{label}: {reason}")
+            continue
+        for entry in result:
+            record = _university_record(entry)
+            merged.setdefault(record['domain'] or f"{record['name']}|{record['country']}", record)
+
+    if errors and len(errors) == len(queries):
+        return _fallback_university_data({}, warning='; '.join(errors))
+    records = list(merged.values())
+    data = {'records': records[:limit], 'chart': _build_university_chart(records)}
+    if errors:
+        data['errors'] = errors
+    return data
+
+
+def _university_record(entry: dict) -> dict:
+    web_pages = entry.get('web_pages') or []
+    domains = entry.get('domains') or []
+    return {
+        'name': entry.get('name'),
+        'country': entry.get('country'),
+        'alpha_two_code': entry.get('alpha_two_code'),
+        'website': web_pages[0] if web_pages else None,
+        'domain': domains[0] if domains else None,
+    }
+
+
 def _build_university_chart(records: list[dict]) -> dict:
     """Genera datos listos para Chart.js con el conteo por país."""
     if not records:
@@ -131,27 +466,100 @@ def _fallback_university_data(params: dict, warning: str | None = None) -> dict:
 
 
 def dataframe_from_students(students: Iterable[Student]) -> pd.DataFrame:
-    """Crea un DataFrame a partir de una lista/queryset de estudiantes."""
+    """Crea un DataFrame a partir de una lista/queryset de estudiantes.
+
+    Un queryset se lee como filas ``StudentRow`` por bloques, sin instanciar
+    el modelo; el DataFrame se arma por columnas.
+    """
+    columns = [header for header, _ in EXPORT_COLUMNS]
     records = [
-        {
-            'Nombre': s.nombre,
-            'Apellido paterno': s.apellido_paterno,
-            'Apellido materno': s.apellido_materno,
-            'Carrera': s.carrera.nombre,
-            'Matrícula': s.matricula,
-            'Correo': s.correo,
-            'Teléfono': s.telefono,
-            'Grupo': s.grupo,
-            'Estado': s.estado,
-            'Fecha de nacimiento': s.fecha_nacimiento,
-            'Fecha de inscripción': s.fecha_inscripcion,
-            'Dirección': s.direccion,
+        (
+            s.nombre,
+            s.apellido_paterno,
+            s.apellido_materno,
+            s.carrera_nombre,
+            s.matricula,
+            s.correo,
+            s.telefono,
+            s.grupo,
+            s.estado,
+            s.fecha_nacimiento,
+            s.fecha_inscripcion,
+            s.direccion,
             # Excel no admite zona horaria; convertimos a naive preservando hora local
-            'Registrado': timezone.make_naive(s.created_at) if timezone.is_aware(s.created_at) else s.created_at,
-        }
-        for s in students
+            timezone.make_naive(s.created_at) if timezone.is_aware(s.created_at) else s.created_at,
+        )
+        for s in as_rows(students, StudentRow)
     ]
-    return pd.DataFrame(records)
+    # Sin filas se conserva el DataFrame vacío sin columnas de antes
+    return pd.DataFrame(records, columns=columns if records else None)
+
+
+def iter_export_rows(
+    students: QuerySet[Student],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[tuple]:
+    """Recorre los estudiantes como tuplas en el orden de ``EXPORT_COLUMNS``.
+
+    Usa ``values_list`` con un cursor por bloques, de modo que no se crean
+    instancias del modelo ni se carga la tabla completa; el nombre de la
+    carrera y el código del grupo salen del catálogo en memoria (``catalog``). Si se
+    indica ``progress`` se llama con las filas leídas cada ``chunk_size``
+    filas y al terminar.
+    """
+    fields = [field for _, field in EXPORT_COLUMNS]
+    rows = students.values_list(*fields).iterator(chunk_size=chunk_size)
+    careers = {pk: nombre for pk, (nombre, _clave) in catalog.careers().items()}
+    groups = catalog.group_codes()
+    career_index = fields.index('carrera_id')
+    group_index = fields.index('grupo_id')
+    count = 0
+    for row in rows:
+        row = list(row)
+        row[career_index] = careers.get(row[career_index])
+        row[group_index] = groups.get(row[group_index])
+        created_at = row[-1]
+        # Excel no admite zona horaria; convertimos a naive preservando hora local
+        if created_at is not None and timezone.is_aware(created_at):
+            created_at = timezone.make_naive(created_at)
+        row[-1] = created_at
+        yield tuple(row)
+        count += 1
+        if progress is not None and count % chunk_size == 0:
+            progress(count)
+    if progress is not None:
+        progress(count)
+
+
+def stream_students_csv(
+    students: QuerySet[Student],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[bytes]:
+    """Genera el CSV por bloques de bytes con memoria constante.
+
+    El primer bloque contiene el BOM y el encabezado para que la descarga
+    empiece de inmediato; después se emite un bloque cada ``chunk_size`` filas.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    yield buffer.getvalue().encode('utf-8-sig')
+
+    buffer.seek(0)
+    buffer.truncate()
+    pending = 0
+    for row in iter_export_rows(students, chunk_size=chunk_size, progress=progress):
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_size:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode('utf-8')
 
 
 def export_students_csv(students: Iterable[Student]) -> bytes:
@@ -170,17 +578,42 @@ def export_students_excel(students: Iterable[Student]) -> BytesIO:
     return output
 
 
+def export_students_excel_file(
+    students: QuerySet[Student],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    output: IO[bytes] | str | None = None,
+    progress: Callable[[int], None] | None = None,
+) -> IO[bytes] | str:
+    """Escribe el xlsx usando el modo write-only de openpyxl.
+
+    Las filas se agregan conforme llegan del cursor por bloques, así que el
+    libro nunca existe completo en memoria. Sin ``output`` se usa un archivo
+    temporal que se devuelve abierto y posicionado al inicio (se elimina solo
+    al cerrarse); con una ruta o un archivo se escribe ahí y se devuelve.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    for row in iter_export_rows(students, chunk_size=chunk_size, progress=progress):
+        sheet.append(row)
+
+    if output is not None:
+        workbook.save(output)
+        return output
+    output = tempfile.TemporaryFile(suffix='.xlsx')
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
 def build_chart_data(stats_by_group: list[dict], status_counts: dict) -> dict:
     """Crea diccionarios con datos listos para graficar en Chart.js."""
     group_labels = [f"{row['grupo']} · {row['carrera']}" for row in stats_by_group]
     group_values = [row['total'] for row in stats_by_group]
-    status_labels = ['Inscrito', 'Baja temporal', 'Baja definitiva', 'Egresado']
-    status_values = [
-        status_counts.get('Inscrito', 0),
-        status_counts.get('Baja temporal', 0),
-        status_counts.get('Baja definitiva', 0),
-        status_counts.get('Egresado', 0),
-    ]
+    status_labels = list(STATUS_LABELS)
+    status_values = [status_counts.get(label, 0) for label in STATUS_LABELS]
     return {
         'group': {'labels': group_labels, 'values': group_values},
         'status': {'labels': status_labels, 'values': status_values},
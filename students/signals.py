@@ -0,0 +1,122 @@
+"""Receptores de señales de ``Student`` (y sus catálogos) que mantienen datos derivados."""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import catalog
+from .conditional import bump_change_counter
+from .fragment_cache import invalidate_fragments
+from .models import Career, Group, Student, StudentTombstone
+from .reports import invalidate_periods
+from .stats import apply_delta, stat_key
+
+
+@receiver(pre_save, sender=Student)
+def remember_previous_stat_key(sender, instance: Student, **kwargs) -> None:
+    """Guarda la llave de conteo y la fecha de inscripción anteriores para usarlas después de guardar."""
+    previous = None
+    if instance.pk is not None:
+        previous = (
+            Student.objects.filter(pk=instance.pk)
+            .values_list('grupo_id', 'carrera_id', 'estado', 'fecha_inscripcion')
+            .first()
+        )
+    instance._previous_stat_key = previous[:3] if previous else None
+    instance._previous_report_key = previous[1:] if previous else None
+
+
+@receiver(post_save, sender=Student)
+def update_stats_on_save(sender, instance: Student, **kwargs) -> None:
+    previous = instance.__dict__.pop('_previous_stat_key', None)
+    current = stat_key(instance)
+    if previous == current:
+        return
+    if previous is not None:
+        apply_delta(previous, -1)
+    apply_delta(current, 1)
+
+
+@receiver(post_save, sender=Student)
+def invalidate_report_periods_on_save(sender, instance: Student, **kwargs) -> None:
+    """Borra los periodos de reporte guardados si cambió algo que cuentan (carrera, estado o fecha)."""
+    previous = instance.__dict__.pop('_previous_report_key', None)
+    if previous == (instance.carrera_id, instance.estado, instance.fecha_inscripcion):
+        return
+    invalidate_periods([previous[2] if previous else None, instance.fecha_inscripcion])
+
+
+@receiver(post_delete, sender=Student)
+def update_stats_on_delete(sender, instance: Student, **kwargs) -> None:
+    apply_delta(stat_key(instance), -1)
+
+
+@receiver(post_delete, sender=Student)
+def invalidate_report_periods_on_delete(sender, instance: Student, **kwargs) -> None:
+    invalidate_periods([instance.fecha_inscripcion])
+
+
+# Campos del catálogo que los estudiantes publican (feed, API, snapshot) y la relación que los enlaza
+CATALOG_LABELS = {
+    Career: (('nombre', 'clave'), 'carrera_id'),
+    Group: (('codigo',), 'grupo_id'),
+}
+
+
+@receiver(pre_save, sender=Career)
+@receiver(pre_save, sender=Group)
+def remember_previous_label(sender, instance, **kwargs) -> None:
+    fields, _relation = CATALOG_LABELS[sender]
+    previous = None
+    if instance.pk is not None:
+        previous = sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+    instance._previous_label = previous
+
+
+@receiver(post_save, sender=Career)
+@receiver(post_save, sender=Group)
+def touch_students_on_rename(sender, instance, created: bool, **kwargs) -> None:
+    """Marca como modificados a los estudiantes de una carrera o grupo renombrado.
+
+    Así el feed de cambios y el snapshot incremental, que avanzan por
+    ``updated_at``, vuelven a publicar el nombre o el código nuevos.
+    """
+    previous = instance.__dict__.pop('_previous_label', None)
+    fields, relation = CATALOG_LABELS[sender]
+    if created or previous is None or previous == tuple(getattr(instance, field) for field in fields):
+        return
+    Student.objects.filter(**{relation: instance.pk}).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=Career)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_catalog_on_change(sender, **kwargs) -> None:
+    catalog.invalidate_catalog()
+
+
+@receiver(post_delete, sender=Student)
+def record_tombstone(sender, instance: Student, **kwargs) -> None:
+    """Deja constancia de la baja para el feed de cambios (``students/changefeed.py``)."""
+    StudentTombstone.objects.create(student_id=instance.pk, matricula=instance.matricula)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=Career)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_cached_fragments(sender, **kwargs) -> None:
+    """Invalida los fragmentos en caché ante cualquier cambio de estudiantes, carreras o grupos."""
+    invalidate_fragments()
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=Career)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def count_untracked_change(sender, **kwargs) -> None:
+    """Registra bajas y cambios de carreras o grupos, que no mueven ``Student.updated_at``."""
+    bump_change_counter()
@@ -0,0 +1,316 @@
+"""Snapshot columnar de estudiantes en disco para análisis ad hoc.
+
+Cada columna se guarda como un arreglo ``.npy`` que se abre con ``mmap``, así
+que cargar el snapshot no lee la tabla ni crea objetos de Python por fila:
+
+- ``estado``, ``grupo`` y ``carrera`` se codifican con diccionario en enteros
+  pequeños (``int8``/``int16``/``int32`` según el número de valores).
+- ``fecha_nacimiento`` y ``fecha_inscripcion`` como días desde 1970-01-01
+  (``int32``); ``created_at`` y ``updated_at`` como microsegundos UTC
+  (``int64``), que se ven como ``datetime64[us]`` sin copiar.
+- Las filas van ordenadas por ``id``.
+
+``refresh_snapshot`` aplica solo los cambios posteriores al cursor del feed
+de cambios (``updated_at`` e ``id``, más las bajas), con sus mismas
+garantías: los ``QuerySet.update()`` que no tocan ``updated_at`` requieren
+``--full``. Cada actualización escribe una generación nueva en
+``STUDENTS_SNAPSHOT_DIR`` y después cambia el archivo ``CURRENT``, de modo que
+los lectores nunca ven un snapshot a medias.
+"""
+from __future__ import annotations
+import json
+import os
+import shutil
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .changefeed import MAX_BATCH_SIZE, CursorExpired, encode_feed_cursor, fetch_changes
+from .models import Career, Group, Student, StudentTombstone
+
+# 2: ``grupo`` guarda el id de ``Group`` (antes el texto)
+FORMAT_VERSION = 2
+CATEGORICAL = ('estado', 'grupo', 'carrera')
+DATES = ('fecha_nacimiento', 'fecha_inscripcion')
+DATETIMES = ('created_at', 'updated_at')
+COLUMNS = ('id', *CATEGORICAL, *DATES, *DATETIMES)
+# Campos de la base de datos en el orden de COLUMNS
+SOURCE_FIELDS = ('id', 'estado', 'grupo_id', 'carrera_id', *DATES, *DATETIMES)
+BUILD_CHUNK_SIZE = 50000
+# Generaciones que se conservan: la anterior puede seguir abierta por otro proceso
+KEEP_GENERATIONS = 2
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+_loaded: Snapshot | None = None
+
+
+def snapshot_dir() -> Path:
+    path = Path(settings.STUDENTS_SNAPSHOT_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _codes_dtype(size: int) -> np.dtype:
+    for dtype in (np.int8, np.int16, np.int32):
+        if size <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _days(value: date) -> int:
+    return value.toordinal() - _EPOCH_ORDINAL
+
+
+def _micros(value: datetime) -> int:
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, dt_timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _career_labels() -> dict[int, str]:
+    """Nombre de cada carrera; con nombres repetidos se agrega la clave para distinguirlas."""
+    careers = list(Career.objects.order_by('pk').values_list('pk', 'nombre', 'clave'))
+    names = [nombre for _, nombre, _ in careers]
+    if len(set(names)) == len(names):
+        return {pk: nombre for pk, nombre, _ in careers}
+    return {pk: f"{nombre} ({clave})" for pk, nombre, clave in careers}
+
+
+class Snapshot:
+    """Snapshot cargado: arreglos en memoria mapeada y diccionarios de las columnas codificadas."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.meta = json.loads((path / 'meta.json').read_text(encoding='utf-8'))
+        self.columns: dict[str, np.ndarray] = {
+            name: np.load(path / f'{name}.npy', mmap_mode='r') for name in COLUMNS
+        }
+        self.categories: dict[str, list] = self.meta['categories']
+
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+
+    @property
+    def generated_at(self) -> datetime:
+        return datetime.fromisoformat(self.meta['generated_at'])
+
+    def labels(self, column: str) -> list[str]:
+        """Etiquetas de una columna codificada; para ``carrera`` y ``grupo`` el nombre o código en lugar del id."""
+        if column == 'carrera':
+            careers = self.meta['careers']
+            return [careers.get(str(pk), str(pk)) for pk in self.categories['carrera']]
+        if column == 'grupo':
+            groups = self.meta['groups']
+            return [groups.get(str(pk), str(pk)) for pk in self.categories['grupo']]
+        return list(self.categories[column])
+
+    def code(self, column: str, value) -> int:
+        """Código de ``value`` en ``column`` (-1 si no aparece), para filtrar con máscaras."""
+        try:
+            return self.categories[column].index(value)
+        except ValueError:
+            return -1
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame sobre los mismos arreglos (sin copiar).
+
+        Las columnas codificadas son ``Categorical`` (``carrera`` con el nombre y ``grupo`` con el código)
+        y las fechas quedan como días ``int32``;
+        ``pd.to_datetime(df[columna], unit='D')`` las convierte.
+        """
+        data = {'id': self.columns['id']}
+        for name in CATEGORICAL:
+            data[name] = pd.Categorical.from_codes(self.columns[name], categories=self.labels(name), validate=False)
+        for name in DATES:
+            data[name] = self.columns[name]
+        for name in DATETIMES:
+            data[name] = self.columns[name].view('datetime64[us]')
+        return pd.DataFrame(data, copy=False)
+
+    def group_counts(self, by: str | tuple[str, ...], mask: np.ndarray | None = None) -> dict:
+        """Cuenta filas por una o varias columnas codificadas con ``np.bincount``.
+
+        Con una columna devuelve ``{etiqueta: total}``; con varias, llaves en
+        tupla. ``mask`` (arreglo booleano) limita las filas contadas. Solo se
+        incluyen combinaciones con al menos una fila.
+        """
+        columns = (by,) if isinstance(by, str) else tuple(by)
+        sizes = tuple(len(self.categories[name]) for name in columns)
+        codes = [self.columns[name] for name in columns]
+        if mask is not None:
+            codes = [column[mask] for column in codes]
+        flat = np.ravel_multi_index([column.astype(np.int64) for column in codes], sizes)
+        counts = np.bincount(flat, minlength=int(np.prod(sizes)))
+        labels = [self.labels(name) for name in columns]
+        result = {}
+        for index in np.flatnonzero(counts):
+            positions = np.unravel_index(index, sizes)
+            key = tuple(labels[level][position] for level, position in enumerate(positions))
+            result[key[0] if isinstance(by, str) else key] = int(counts[index])
+        return result
+
+
+def load_snapshot() -> Snapshot | None:
+    """Snapshot vigente (reutilizado mientras no cambie ``CURRENT``) o ``None`` si no existe."""
+    global _loaded
+    directory = Path(settings.STUDENTS_SNAPSHOT_DIR)
+    try:
+        generation = (directory / 'CURRENT').read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return None
+    if _loaded is None or _loaded.path.name != generation:
+        _loaded = Snapshot(directory / generation)
+    return _loaded
+
+
+class _Encoder:
+    """Convierte filas de ``SOURCE_FIELDS`` en columnas, extendiendo los diccionarios."""
+
+    def __init__(self, categories: dict[str, list] | None = None) -> None:
+        categories = categories or {name: [] for name in CATEGORICAL}
+        self.categories = {name: list(values) for name, values in categories.items()}
+        self._index = {name: {value: code for code, value in enumerate(values)} for name, values in self.categories.items()}
+
+    def _code(self, column: str, value) -> int:
+        index = self._index[column]
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self.categories[column])
+            self.categories[column].append(value)
+        return code
+
+    def encode(self, rows: list[tuple]) -> dict[str, np.ndarray]:
+        ids, estados, grupos, carreras, nacimientos, inscripciones, creados, actualizados = zip(*rows) if rows else ((),) * 8
+        return {
+            'id': np.array(ids, dtype=np.int64),
+            'estado': np.array([self._code('estado', value) for value in estados], dtype=np.int64),
+            'grupo': np.array([self._code('grupo', value) for value in grupos], dtype=np.int64),
+            'carrera': np.array([self._code('carrera', value) for value in carreras], dtype=np.int64),
+            'fecha_nacimiento': np.array([_days(value) for value in nacimientos], dtype=np.int32),
+            'fecha_inscripcion': np.array([_days(value) for value in inscripciones], dtype=np.int32),
+            'created_at': np.array([_micros(value) for value in creados], dtype=np.int64),
+            'updated_at': np.array([_micros(value) for value in actualizados], dtype=np.int64),
+        }
+
+    def finish(self, parts: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+        """Une los bloques y reduce los códigos al tipo más pequeño que los admite."""
+        columns = {
+            name: np.concatenate([part[name] for part in parts]) if parts else np.empty(0, dtype=np.int64)
+            for name in COLUMNS
+        }
+        for name in CATEGORICAL:
+            columns[name] = columns[name].astype(_codes_dtype(len(self.categories[name])))
+        for name in DATES:
+            columns[name] = columns[name].astype(np.int32)
+        return columns
+
+
+def _full_build() -> tuple[dict[str, np.ndarray], dict[str, list], str]:
+    encoder = _Encoder()
+    until = timezone.now() - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    with transaction.atomic():
+        tombstone = StudentTombstone.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        rows = Student.objects.order_by('pk').values_list(*SOURCE_FIELDS).iterator(chunk_size=BUILD_CHUNK_SIZE)
+        parts = []
+        while chunk := list(islice(rows, BUILD_CHUNK_SIZE)):
+            parts.append(encoder.encode(chunk))
+    # El cursor queda antes del margen del feed: los cambios recientes se vuelven a aplicar
+    cursor = encode_feed_cursor(until, 0, tombstone)
+    return encoder.finish(parts), encoder.categories, cursor
+
+
+def _apply_changes(snapshot: Snapshot) -> tuple[dict[str, np.ndarray], dict[str, list], str, int]:
+    """Aplica al snapshot los cambios del feed posteriores a su cursor."""
+    cursor = snapshot.meta['cursor']
+    upserts: dict[int, tuple] = {}
+    deleted: set[int] = set()
+    while True:
+        batch = fetch_changes(cursor, limit=MAX_BATCH_SIZE)
+        for row in batch['changes']:
+            upserts[row['id']] = tuple(row[field] for field in SOURCE_FIELDS)
+        for row in batch['deletes']:
+            upserts.pop(row['id'], None)
+            deleted.add(row['id'])
+        cursor = batch['cursor']
+        if not batch['has_more']:
+            break
+
+    encoder = _Encoder(snapshot.categories)
+    changed = encoder.encode(sorted(upserts.values()))
+    keep = ~np.isin(snapshot.columns['id'], np.fromiter(upserts.keys() | deleted, dtype=np.int64))
+    kept = {name: snapshot.columns[name][keep] for name in COLUMNS}
+    columns = encoder.finish([kept, changed])
+    order = np.argsort(columns['id'], kind='stable')
+    return {name: column[order] for name, column in columns.items()}, encoder.categories, cursor, len(upserts) + len(deleted)
+
+
+def _write_generation(
+    columns: dict[str, np.ndarray],
+    categories: dict[str, list],
+    cursor: str,
+    careers: dict[str, str],
+    groups: dict[str, str],
+) -> Path:
+    directory = snapshot_dir()
+    generation = f'gen-{time.time_ns()}-{os.getpid()}'
+    path = directory / generation
+    path.mkdir()
+    for name in COLUMNS:
+        np.save(path / f'{name}.npy', np.ascontiguousarray(columns[name]))
+    meta = {
+        'version': FORMAT_VERSION,
+        'generated_at': timezone.now().isoformat(),
+        'rows': int(len(columns['id'])),
+        'cursor': cursor,
+        'categories': categories,
+        'careers': careers,
+        'groups': groups,
+    }
+    (path / 'meta.json').write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+
+    pointer = directory / 'CURRENT.tmp'
+    pointer.write_text(generation, encoding='utf-8')
+    os.replace(pointer, directory / 'CURRENT')
+
+    generations = sorted(
+        (child for child in directory.iterdir() if child.is_dir() and child.name.startswith('gen-')),
+        key=lambda child: child.stat().st_mtime,
+    )
+    for old in generations[:-KEEP_GENERATIONS]:
+        # En Windows un archivo mapeado por otro proceso no se puede borrar; se reintenta en la siguiente
+        shutil.rmtree(old, ignore_errors=True)
+    return path
+
+
+def refresh_snapshot(full: bool = False) -> dict:
+    """Actualiza el snapshot (completo la primera vez, con ``full`` o si el cursor expiró).
+
+    Devuelve ``{'mode': 'full' | 'incremental', 'rows': ..., 'changes': ...}``.
+    """
+    careers = {str(pk): label for pk, label in _career_labels().items()}
+    groups = {str(pk): codigo for pk, codigo in Group.objects.order_by('pk').values_list('pk', 'codigo')}
+    current = None if full else load_snapshot()
+    if current is not None and current.meta.get('version') != FORMAT_VERSION:
+        current = None
+    if current is not None:
+        try:
+            columns, categories, cursor, changes = _apply_changes(current)
+        except CursorExpired:
+            pass
+        else:
+            # Sin cambios se conserva la generación (y su cursor) para no reescribir los arreglos
+            if changes or careers != current.meta['careers'] or groups != current.meta['groups']:
+                _write_generation(columns, categories, cursor, careers, groups)
+            return {'mode': 'incremental', 'rows': len(columns['id']), 'changes': changes}
+    columns, categories, cursor = _full_build()
+    _write_generation(columns, categories, cursor, careers, groups)
+    return {'mode': 'full', 'rows': len(columns['id']), 'changes': len(columns['id'])}
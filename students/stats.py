@@ -0,0 +1,79 @@
+"""Mantenimiento de la tabla materializada ``StudentStat``.
+
+Cada alta, cambio o baja de un estudiante aplica un delta de +1/-1 sobre la
+llave ``(grupo, carrera, estado)`` afectada. ``rebuild_stats`` recalcula la
+tabla completa y ``check_stats`` la compara contra la tabla de estudiantes.
+"""
+from __future__ import annotations
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .catalog import invalidate_catalog
+from .fragment_cache import invalidate_fragments
+from .models import Student, StudentStat
+from .reports import invalidate_reports
+
+StatKey = tuple[int, int, str]
+
+
+def stat_key(student: Student) -> StatKey:
+    """Llave de conteo de un estudiante."""
+    return (student.grupo_id, student.carrera_id, student.estado)
+
+
+def apply_delta(key: StatKey, delta: int) -> None:
+    """Suma ``delta`` al contador de la llave, creando la fila si no existe."""
+    grupo_id, carrera_id, estado = key
+    counters = StudentStat.objects.filter(grupo_id=grupo_id, carrera_id=carrera_id, estado=estado)
+    if counters.update(total=F('total') + delta):
+        return
+    try:
+        with transaction.atomic():
+            StudentStat.objects.create(grupo_id=grupo_id, carrera_id=carrera_id, estado=estado, total=delta)
+    except IntegrityError:
+        # Otro proceso creó la fila entre el UPDATE y el INSERT
+        counters.update(total=F('total') + delta)
+
+
+def live_counts() -> dict[StatKey, int]:
+    """Conteos calculados directamente sobre la tabla de estudiantes."""
+    rows = (
+        Student.objects.order_by()
+        .values_list('grupo_id', 'carrera_id', 'estado')
+        .annotate(total=Count('pk'))
+    )
+    return {(grupo_id, carrera_id, estado): total for grupo_id, carrera_id, estado, total in rows}
+
+
+def stored_counts() -> dict[StatKey, int]:
+    """Conteos guardados en la tabla materializada (sin filas en cero)."""
+    rows = StudentStat.objects.filter(total__gt=0).values_list('grupo_id', 'carrera_id', 'estado', 'total')
+    return {(grupo_id, carrera_id, estado): total for grupo_id, carrera_id, estado, total in rows}
+
+
+@transaction.atomic
+def rebuild_stats() -> int:
+    """Reemplaza la tabla materializada con los conteos actuales; devuelve las filas escritas."""
+    counts = live_counts()
+    StudentStat.objects.all().delete()
+    StudentStat.objects.bulk_create(
+        StudentStat(grupo_id=grupo_id, carrera_id=carrera_id, estado=estado, total=total)
+        for (grupo_id, carrera_id, estado), total in counts.items()
+    )
+    invalidate_fragments()
+    invalidate_catalog()
+    # Las cargas masivas no envían señales: los periodos de reporte guardados ya no son confiables
+    invalidate_reports()
+    return len(counts)
+
+
+def check_stats() -> list[tuple[StatKey, int, int]]:
+    """Devuelve las llaves cuyo conteo guardado difiere del real como ``(llave, guardado, real)``."""
+    live = live_counts()
+    stored = stored_counts()
+    return [
+        (key, stored.get(key, 0), live.get(key, 0))
+        for key in sorted(live.keys() | stored.keys(), key=str)
+        if stored.get(key, 0) != live.get(key, 0)
+    ]
@@ -0,0 +1,158 @@
+"""Catálogo local de universidades para responder búsquedas sin llamar a Hipolabs.
+
+``manage.py sync_universities`` descarga el conjunto completo (o lo lee de un
+JSON con el mismo formato) y reemplaza la tabla ``University`` en una sola
+transacción. Las búsquedas usan:
+
+- ``country``: igualdad sobre ``pais_normalizado`` (índice ``university_country_idx``,
+  que además entrega las filas ya ordenadas por nombre).
+- ``name``: subcadena sobre ``nombre_normalizado`` con el índice FTS5 de
+  trigramas ``students_university_fts`` (tres caracteres o más); con menos
+  caracteres o sin FTS5 se usa ``LIKE``.
+
+El conteo por país de la gráfica se agrega en SQL sobre todas las
+coincidencias. El índice FTS no tiene triggers: solo la sincronización
+escribe en la tabla y lo reconstruye al terminar.
+"""
+from __future__ import annotations
+import json
+import unicodedata
+from pathlib import Path
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Q
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from .models import University
+from .university_client import get_client
+
+FTS_TABLE = 'students_university_fts'
+CHART_LIMIT = 15
+SYNC_BATCH_SIZE = 2000
+
+_trigram_available: bool = False
+
+
+def normalize_text(value: str | None) -> str:
+    """Minúsculas, sin acentos y con espacios simples: ``"  Universidad  de México"`` -> ``"universidad de mexico"``."""
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+def trigram_available() -> bool:
+    """Indica si el índice FTS5 de trigramas existe en la base de datos actual."""
+    global _trigram_available
+    if _trigram_available:
+        return True
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        _trigram_available = cursor.fetchone() is not None
+    return _trigram_available
+
+
+def catalog_synced_at():
+    """Fecha de la última sincronización o ``None`` si el catálogo está vacío."""
+    return University.objects.aggregate(last=Max('sincronizado'))['last']
+
+
+def download_catalog() -> list[dict]:
+    """Descarga el conjunto completo desde ``/search`` sin filtros."""
+    return get_client().fetch_all()
+
+
+def read_catalog_file(path: str | Path) -> list[dict]:
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def _first(values) -> str:
+    return values[0] if isinstance(values, list) and values else ''
+
+
+@transaction.atomic
+def sync_catalog(records: Iterable[dict]) -> int:
+    """Reemplaza el catálogo con ``records`` (formato de Hipolabs); devuelve las universidades guardadas."""
+    now = timezone.now()
+    universities = [
+        University(
+            nombre=entry['name'].strip(),
+            pais=entry['country'].strip(),
+            codigo_pais=entry.get('alpha_two_code') or '',
+            estado_provincia=entry.get('state-province') or '',
+            sitio_web=_first(entry.get('web_pages')),
+            dominio=_first(entry.get('domains')),
+            nombre_normalizado=normalize_text(entry['name']),
+            pais_normalizado=normalize_text(entry['country']),
+            sincronizado=now,
+        )
+        for entry in records
+        if entry.get('name') and entry.get('country')
+    ]
+    University.objects.all().delete()
+    University.objects.bulk_create(universities, batch_size=SYNC_BATCH_SIZE)
+    if trigram_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return len(universities)
+
+
+def _name_condition(name: str) -> Q:
+    if len(name) >= 3 and trigram_available():
+        # La frase entre comillas se busca como subcadena; las comillas internas se duplican
+        match = '"' + name.replace('"', '""') + '"'
+        return Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    return Q(nombre_normalizado__contains=name)
+
+
+def search_catalog(country: str | None = None, name: str | None = None, limit: int = 30) -> dict:
+    """Busca en el catálogo local con la misma forma de respuesta que ``fetch_universities``."""
+    return search_catalog_many([(country, name)], limit=limit)
+
+
+def search_catalog_many(queries: Iterable[tuple[str | None, str | None]], limit: int = 30) -> dict:
+    """Une varias búsquedas ``(country, name)`` en una sola consulta; cada universidad aparece una vez."""
+    conditions = Q()
+    for country, name in queries:
+        condition = Q()
+        country_key = normalize_text(country)
+        name_key = normalize_text(name)
+        if country_key:
+            condition &= Q(pais_normalizado=country_key)
+        if name_key:
+            condition &= _name_condition(name_key)
+        if not condition:
+            # Una búsqueda sin filtros abarca todo el catálogo
+            conditions = Q()
+            break
+        conditions |= condition
+    universities = University.objects.filter(conditions)
+
+    rows = universities.order_by('nombre_normalizado').values_list(
+        'nombre', 'pais', 'codigo_pais', 'sitio_web', 'dominio'
+    )[:limit]
+    records = [
+        {
+            'name': nombre,
+            'country': pais,
+            'alpha_two_code': codigo_pais or None,
+            'website': sitio_web or None,
+            'domain': dominio or None,
+        }
+        for nombre, pais, codigo_pais, sitio_web, dominio in rows
+    ]
+    counts = (
+        universities.order_by()
+        .values_list('pais')
+        .annotate(total=Count('pk'))
+        .order_by('-total', 'pais')[:CHART_LIMIT]
+    )
+    chart = {'labels': [], 'values': []}
+    for pais, total in counts:
+        chart['labels'].append(pais)
+        chart['values'].append(total)
+    return {'records': records, 'chart': chart}
@@ -0,0 +1,223 @@
+"""Cliente HTTP para la API Hipolabs con conexiones persistentes y caché.
+
+Se reutiliza una ``requests.Session`` (keep-alive y reintentos con backoff) y
+las respuestas se guardan en una caché LRU con TTL indexada por
+``(country, name)`` normalizados. Las entradas vencidas se sirven de inmediato
+mientras un hilo en segundo plano las actualiza (stale-while-revalidate).
+
+``asearch`` es la variante asíncrona para las vistas ``async``: comparte la
+misma caché y consulta con un ``httpx.AsyncClient`` (``async_http``) que el
+llamador abre con ``async with`` para un lote de búsquedas, de modo que las
+búsquedas del lote comparten conexiones y estas se cierran al terminar; una
+consulta lenta no ocupa un hilo mientras espera.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .instrumentation import track_http
+
+CacheKey = tuple[str, str]
+
+
+def normalize_key(country: str | None, name: str | None) -> CacheKey:
+    """Normaliza los parámetros de búsqueda para usarlos como llave de caché."""
+    return (' '.join((country or '').split()).casefold(), ' '.join((name or '').split()).casefold())
+
+
+class UniversityClient:
+    """Consulta ``/search`` de Hipolabs con caché TTL + LRU y revalidación en segundo plano."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float | tuple[float, float] = (3.05, 12),
+        ttl: float = 900,
+        max_entries: int = 256,
+        retries: int = 2,
+        backoff: float = 0.3,
+        pool_size: int = 10,
+    ) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.retries = retries
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        # Solo se reintentan fallas de conexión y estados de error: reintentar un timeout de lectura
+        # multiplicaría la espera máxima de una petición fría por el número de intentos
+        retry = Retry(
+            total=retries,
+            read=0,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({'GET'}),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._cache: OrderedDict[CacheKey, tuple[float, list[dict]]] = OrderedDict()
+        self._refreshing: set[CacheKey] = set()
+        self._lock = threading.Lock()
+
+    def search(self, country: str | None = None, name: str | None = None) -> tuple[list[dict], bool]:
+        """Devuelve ``(payload, stale)`` para la búsqueda indicada.
+
+        Si no hay datos en caché se consulta la API de forma síncrona y los
+        errores se propagan; si hay datos vencidos se devuelven con
+        ``stale=True`` y se agenda una actualización.
+        """
+        key, params = self._prepare(country, name)
+        entry = self._lookup(key)
+        if entry is None:
+            return self._fetch_and_store(key, params), False
+        return self._serve(key, params, entry)
+
+    async def asearch(
+        self, country: str | None = None, name: str | None = None, http: httpx.AsyncClient | None = None
+    ) -> tuple[list[dict], bool]:
+        """Igual que ``search`` pero sin bloquear el event loop mientras se consulta la API.
+
+        ``http`` es un cliente abierto con ``async_http``; sin él se abre y
+        cierra uno solo para esta búsqueda.
+        """
+        key, params = self._prepare(country, name)
+        entry = self._lookup(key)
+        if entry is not None:
+            return self._serve(key, params, entry)
+        if http is None:
+            async with self.async_http() as http:
+                payload = await self._arequest(http, params)
+        else:
+            payload = await self._arequest(http, params)
+        self._store(key, payload)
+        return payload, False
+
+    def async_http(self) -> httpx.AsyncClient:
+        """Cliente asíncrono nuevo con la configuración de este cliente; úsalo con ``async with``.
+
+        Un ``AsyncClient`` queda ligado al event loop donde abre sus conexiones,
+        así que no se comparte entre peticiones (bajo WSGI cada una trae su loop).
+        """
+        if isinstance(self.timeout, tuple):
+            timeout = httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+        else:
+            timeout = httpx.Timeout(self.timeout)
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            transport=httpx.AsyncHTTPTransport(retries=self.retries),
+        )
+
+    def fetch_all(self) -> list[dict]:
+        """Descarga el conjunto completo (``/search`` sin filtros) sin pasar por la caché."""
+        return self._request({})
+
+    def clear(self) -> None:
+        """Vacía la caché (útil en pruebas)."""
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _prepare(country: str | None, name: str | None) -> tuple[CacheKey, dict[str, str]]:
+        params = {
+            field: ' '.join(value.split())
+            for field, value in (('country', country), ('name', name))
+            if value and value.strip()
+        }
+        return normalize_key(country, name), params
+
+    def _lookup(self, key: CacheKey) -> tuple[float, list[dict]] | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+        return entry
+
+    def _serve(self, key: CacheKey, params: dict[str, str], entry: tuple[float, list[dict]]) -> tuple[list[dict], bool]:
+        stored_at, payload = entry
+        if time.monotonic() - stored_at < self.ttl:
+            return payload, False
+        self._refresh_in_background(key, params)
+        return payload, True
+
+    def _request(self, params: dict[str, str]) -> list[dict]:
+        with track_http():
+            response = self.session.get(f"{self.base_url}/search", params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+    async def _arequest(self, http: httpx.AsyncClient, params: dict[str, str]) -> list[dict]:
+        with track_http():
+            response = await http.get('/search', params=params)
+            response.raise_for_status()
+            return response.json()
+
+    def _store(self, key: CacheKey, payload: list[dict]) -> None:
+        with self._lock:
+            self._cache[key] = (time.monotonic(), payload)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def _fetch_and_store(self, key: CacheKey, params: dict[str, str]) -> list[dict]:
+        payload = self._request(params)
+        self._store(key, payload)
+        return payload
+
+    def _refresh_in_background(self, key: CacheKey, params: dict[str, str]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh() -> None:
+            try:
+                self._fetch_and_store(key, params)
+            except Exception:  # pragma: no cover - dependiente de la red
+                # Se conserva la copia vencida; se reintentará en la siguiente consulta
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name='universities-refresh', daemon=True).start()
+
+
+_client: UniversityClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> UniversityClient:
+    """Devuelve el cliente compartido del proceso, configurado desde ``settings``.
+
+    Si cambia ``UNIVERSITIES_API_BASE_URL`` (por ejemplo con
+    ``override_settings`` apuntando a un servidor local) se crea uno nuevo.
+    """
+    global _client
+    base_url = settings.UNIVERSITIES_API_BASE_URL.rstrip('/')
+    with _client_lock:
+        if _client is None or _client.base_url != base_url:
+            _client = UniversityClient(
+                base_url,
+                timeout=settings.UNIVERSITIES_API_TIMEOUT,
+                ttl=settings.UNIVERSITIES_CACHE_TTL,
+                max_entries=settings.UNIVERSITIES_CACHE_SIZE,
+            )
+        return _client
+
+
+def reset_client() -> None:
+    """Descarta el cliente compartido para que el siguiente uso lo recree."""
+    global _client
+    with _client_lock:
+        _client = None
@@ -1,6 +1,6 @@
 """Rutas de la aplicación students."""
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'students'
 
@@ -13,5 +13,20 @@ urlpatterns = [
     path('estudiantes/<int:pk>/eliminar/', views.student_delete, name='student_delete'),
     path('estudiantes/exportar/csv/', views.export_students_csv_view, name='export_csv'),
     path('estudiantes/exportar/excel/', views.export_students_excel_view, name='export_excel'),
+    path('estudiantes/exportar/trabajos/', views.export_job_create, name='export_job_create'),
+    path('estudiantes/exportar/trabajos/<uuid:token>/', views.export_job_status, name='export_job_status'),
+    path(
+        'estudiantes/exportar/trabajos/<uuid:token>/descargar/',
+        views.export_job_download,
+        name='export_job_download',
+    ),
 path('universidades/', views.universities_view, name='universities'),
+    path('reportes/', views.reports_view, name='reports'),
+    path('metricas/', views.metrics_view, name='metrics'),
+    path('api/estudiantes/', api.student_list_api, name='api_student_list'),
+    path('api/estudiantes/<int:pk>/', api.student_detail_api, name='api_student_detail'),
+    path('api/dashboard/', api.dashboard_api, name='api_dashboard'),
+    path('api/carreras/', api.career_list_api, name='api_careers'),
+    path('api/cambios/', api.change_feed_api, name='api_changes'),
+    path('api/reportes/', api.reports_api, name='api_reports'),
 ]
@@ -1,81 +1,147 @@
 """Vistas principales del sistema de registro de estudiantes."""
 from __future__ import annotations
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.db.models import Q
-from django.http import HttpRequest, HttpResponse
+from django.db import transaction
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.http import urlencode
+from django.views.decorators.http import condition, require_POST
 
+from . import catalog, fragment_cache
+from .conditional import list_etag, list_last_modified, list_page_etag, student_etag, student_last_modified
 from .forms import StudentForm
-from .models import Student
+from .export_jobs import enqueue_export, job_path
+from .instrumentation import metrics_snapshot, prometheus_text
+from .models import ExportJob, Student
+from .read_models import StudentListRow, iter_rows, row_values, rows_from_values
+from .reports import build_reports
 from .services import (
     build_chart_data,
-    count_status,
-    export_students_csv,
-    export_students_excel,
-    fetch_universities,
-    generate_career_stats,
-    generate_group_stats,
+    DEFAULT_PAGE_SIZE,
+    compute_dashboard_stats,
+    count_students_capped,
+    export_students_excel_file,
+    fetch_universities_many,
+    filter_students,
+    paginate_search,
+    paginate_students,
+    stream_students_csv,
+    university_queries,
 )
 
 
 def dashboard(request: HttpRequest) -> HttpResponse:
-    """Pantalla principal con métricas y estadísticas rápidas."""
-    students = Student.objects.all()
-    status_counts = count_status(students)
-    groups_count = students.values('grupo').distinct().count()
-    stats_by_group = generate_group_stats(students)
-    career_stats = generate_career_stats(students)
-    charts = build_chart_data(stats_by_group, status_counts)
-    charts['career'] = {
-        'labels': [row['carrera'] for row in career_stats],
-        'values': [row['total'] for row in career_stats],
-    }
+    """Pantalla principal con métricas y estadísticas rápidas.
+
+    Los bloques de estadísticas y los datos de las gráficas salen de la caché
+    de fragmentos; las estadísticas solo se calculan si alguno falta.
+    """
+    computed: dict = {}
+
+    def stats() -> dict:
+        if not computed:
+            computed.update(compute_dashboard_stats())
+        return computed
+
+    def charts() -> dict:
+        data = build_chart_data(stats()['stats_by_group'], stats()['status_counts'])
+        data['career'] = {
+            'labels': [row['carrera'] for row in stats()['career_stats']],
+            'values': [row['total'] for row in stats()['career_stats']],
+        }
+        return data
 
     context = {
-        'students_total': students.count(),
-        'status_counts': status_counts,
-        'groups_count': groups_count,
-        'stats_by_group': stats_by_group,
-        'charts': charts,
-        'career_stats': career_stats,
+        'stats_html': fragment_cache.get_or_set(
+            'dashboard_stats', (), lambda: render_to_string('students/_dashboard_stats.html', stats())
+        ),
+        'groups_html': fragment_cache.get_or_set(
+            'dashboard_groups', (), lambda: render_to_string('students/_dashboard_groups.html', stats())
+        ),
+        'charts': fragment_cache.get_or_set('dashboard_charts', (), charts),
     }
     return render(request, 'students/dashboard.html', context)
 
 
+def _list_filters(request: HttpRequest) -> tuple[str, str, str]:
+    """Lee los filtros ``q``, ``group`` y ``status`` compartidos por listado y exportaciones."""
+    return (
+        request.GET.get('q', '').strip(),
+        request.GET.get('group', '').strip(),
+        request.GET.get('status', '').strip(),
+    )
+
+
+@condition(etag_func=list_page_etag)
 def student_list(request: HttpRequest) -> HttpResponse:
     """Lista y filtro de estudiantes."""
-    query = request.GET.get('q', '').strip()
-    group_filter = request.GET.get('group', '').strip()
-    status_filter = request.GET.get('status', '').strip()
-
-    students = Student.objects.select_related('carrera').all()
-    if query:
-        students = students.filter(
-            Q(nombre__icontains=query)
-            | Q(apellido_paterno__icontains=query)
-            | Q(apellido_materno__icontains=query)
-            | Q(matricula__icontains=query)
-            | Q(correo__icontains=query)
-        )
-    if group_filter:
-        students = students.filter(grupo__iexact=group_filter)
-    if status_filter:
-        students = students.filter(estado=status_filter)
-
-    groups = Student.objects.values_list('grupo', flat=True).distinct()
+    query, group_filter, status_filter = _list_filters(request)
+
+    try:
+        page_size = int(request.GET.get('page_size', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        page_size = DEFAULT_PAGE_SIZE
+
+    students = filter_students(
+        Student.objects.all(),
+        query=query,
+        group=group_filter,
+        status=status_filter,
+    )
+    cursors = {'after': request.GET.get('after'), 'before': request.GET.get('before'), 'page_size': page_size}
+    # Con búsqueda se ordena por relevancia (bm25); sin índice FTS5 se cae al orden alfabético
+    page = paginate_search(students, query, **cursors) if query else None
+    if page is not None:
+        by_pk = {row.pk: row for row in iter_rows(students.filter(pk__in=page['items']), StudentListRow)}
+        rows = [by_pk[pk] for pk in page['items'] if pk in by_pk]
+    else:
+        # Tuplas de values_list convertidas en filas ligeras; carrera y grupo salen del catálogo sin JOIN
+        page = paginate_students(row_values(students, StudentListRow), **cursors)
+        rows = list(rows_from_values(page['items'], StudentListRow))
+    total, total_capped = count_students_capped(students)
+
+    groups = catalog.groups()
+
+    # Los enlaces de paginación conservan los filtros activos
+    filter_params = {'q': query, 'group': group_filter, 'status': status_filter}
+    filter_params = {key: value for key, value in filter_params.items() if value}
+    base_params = {**filter_params, 'page_size': page['page_size']}
+    next_url = f"?{urlencode({**base_params, 'after': page['next_cursor']})}" if page['next_cursor'] else None
+    previous_url = f"?{urlencode({**base_params, 'before': page['previous_cursor']})}" if page['previous_cursor'] else None
 
     return render(
         request,
         'students/student_list.html',
-        {'students': students, 'query': query, 'group_filter': group_filter, 'status_filter': status_filter, 'groups': groups},
+        {
+            'students': rows,
+            'students_total': total,
+            'students_total_capped': total_capped,
+            'next_url': next_url,
+            'filter_querystring': urlencode(filter_params),
+            'previous_url': previous_url,
+            'query': query,
+            'group_filter': group_filter,
+            'status_filter': status_filter,
+            'groups': groups,
+        },
     )
 
 
+@condition(etag_func=student_etag, last_modified_func=student_last_modified)
 def student_detail(request: HttpRequest, pk: int) -> HttpResponse:
-    """Detalle de un estudiante específico."""
-    student = get_object_or_404(Student, pk=pk)
-    return render(request, 'students/student_detail.html', {'student': student})
+    """Detalle de un estudiante específico (el fragmento renderizado se guarda en caché)."""
+
+    def detail() -> str:
+        student = get_object_or_404(Student.objects.select_related('carrera', 'grupo'), pk=pk)
+        return render_to_string('students/_student_detail.html', {'student': student})
+
+    detail_html = fragment_cache.get_or_set('student_detail', (pk,), detail)
+    return render(request, 'students/student_detail.html', {'detail_html': detail_html})
 
 
 def student_create(request: HttpRequest) -> HttpResponse:
@@ -83,7 +149,8 @@ def student_create(request: HttpRequest) -> HttpResponse:
     if request.method == 'POST':
         form = StudentForm(request.POST)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
             messages.success(request, 'Estudiante creado correctamente.')
             return redirect('students:student_list')
         messages.error(request, 'Revisa los campos obligatorios e intenta nuevamente.')
@@ -98,7 +165,8 @@ def student_update(request: HttpRequest, pk: int) -> HttpResponse:
     if request.method == 'POST':
         form = StudentForm(request.POST, instance=student)
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
             messages.success(request, 'Estudiante actualizado correctamente.')
             return redirect('students:student_detail', pk=student.pk)
         messages.error(request, 'No se pudo actualizar, valida los campos.')
@@ -111,45 +179,142 @@ def student_delete(request: HttpRequest, pk: int) -> HttpResponse:
     """Elimina un estudiante tras confirmación."""
     student = get_object_or_404(Student, pk=pk)
     if request.method == 'POST':
-        student.delete()
+        with transaction.atomic():
+            student.delete()
         messages.success(request, 'Estudiante eliminado correctamente.')
         return redirect('students:student_list')
     return render(request, 'students/student_confirm_delete.html', {'student': student})
 
 
-def universities_view(request: HttpRequest) -> HttpResponse:
-    """Muestra universidades consultadas desde la API Hipolabs."""
+def _multi_values(request: HttpRequest, field: str) -> list[str]:
+    """Valores repetidos (``?country=A&country=B``) o separados por ``;`` en un mismo campo."""
+    return [part for value in request.GET.getlist(field) for part in value.split(';') if part.strip()]
+
+
+async def universities_view(request: HttpRequest) -> HttpResponse:
+    """Muestra universidades del catálogo local o de la API Hipolabs; acepta varios países y nombres."""
     data: dict | None = None
     error: str | None = None
     warning: str | None = None
-    country = request.GET.get('country') or None
-    name = request.GET.get('name') or None
+    countries = _multi_values(request, 'country')
+    names = _multi_values(request, 'name')
     try:
-        data = fetch_universities(country=country, name=name, limit=30)
+        data = await fetch_universities_many(university_queries(countries, names), limit=30)
+    except ValueError as exc:
+        error = str(exc)
     except Exception as exc:  # pragma: no cover - manejo de conectividad
         error = f"No fue posible obtener universidades: {exc}"
     if data and data.get('warning'):
         warning = f"Mostrando datos de ejemplo porque la API respondió con: {data['warning']}"
-    context = {'data': data, 'error': error, 'warning': warning, 'filters': {'country': country or '', 'name': name or ''}}
-    return render(request, 'students/external_api.html', context)
+    elif data and data.get('errors'):
+        warning = f"Algunas búsquedas no respondieron: {'; '.join(data['errors'])}"
+    context = {
+        'data': data,
+        'error': error,
+        'warning': warning,
+        'filters': {'country': '; '.join(countries), 'name': '; '.join(names)},
+    }
+    # Los context processors (sesión, mensajes) leen la base de datos, que solo admite llamadas síncronas
+    return await sync_to_async(render)(request, 'students/external_api.html', context)
 
 
-def export_students_csv_view(request: HttpRequest) -> HttpResponse:
-    """Devuelve todos los estudiantes en formato CSV descargable."""
+@condition(etag_func=list_etag, last_modified_func=list_last_modified)
+def export_students_csv_view(request: HttpRequest) -> StreamingHttpResponse:
+    """Transmite los estudiantes (con los filtros del listado) como CSV descargable."""
+    query, group_filter, status_filter = _list_filters(request)
+    students = filter_students(Student.objects.all(), query=query, group=group_filter, status=status_filter)
     filename = f"estudiantes_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    content = export_students_csv(Student.objects.all())
-    response = HttpResponse(content, content_type='text/csv; charset=utf-8')
+    response = StreamingHttpResponse(stream_students_csv(students), content_type='text/csv; charset=utf-8')
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
 
-def export_students_excel_view(request: HttpRequest) -> HttpResponse:
-    """Devuelve todos los estudiantes en formato Excel (xlsx)."""
+@condition(etag_func=list_etag, last_modified_func=list_last_modified)
+def export_students_excel_view(request: HttpRequest) -> FileResponse:
+    """Devuelve los estudiantes (con los filtros del listado) en formato Excel (xlsx)."""
+    query, group_filter, status_filter = _list_filters(request)
+    students = filter_students(Student.objects.all(), query=query, group=group_filter, status=status_filter)
     filename = f"estudiantes_{timezone.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    buffer = export_students_excel(Student.objects.all())
-    response = HttpResponse(
-        buffer.getvalue(),
+    # FileResponse envía el temporal por bloques y lo cierra (y borra) al terminar
+    response = FileResponse(
+        export_students_excel_file(students),
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     )
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
+
+
+@require_POST
+def export_job_create(request: HttpRequest) -> HttpResponse:
+    """Encola una exportación con los filtros actuales del listado y redirige a su estado."""
+    formato = request.POST.get('formato', 'csv')
+    if formato not in dict(ExportJob.FORMAT_CHOICES):
+        messages.error(request, 'Formato de exportación no válido.')
+        return redirect('students:student_list')
+    job = enqueue_export(formato, request.POST)
+    return redirect('students:export_job_status', token=job.token)
+
+
+def export_job_status(request: HttpRequest, token) -> HttpResponse:
+    """Estado y avance de una exportación en segundo plano (HTML o ``?format=json``)."""
+    job = get_object_or_404(ExportJob, token=token)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'estado': job.estado,
+            'progreso': job.progress,
+            'filas_procesadas': job.filas_procesadas,
+            'total_filas': job.total_filas,
+            'tamano_bytes': job.tamano_bytes,
+            'error': job.error,
+            'descarga': reverse('students:export_job_download', args=[job.token])
+            if job.estado == ExportJob.STATUS_DONE else None,
+        })
+    return render(request, 'students/export_job.html', {'job': job})
+
+
+def export_job_download(request: HttpRequest, token) -> FileResponse:
+    """Descarga el archivo de una exportación terminada."""
+    job = get_object_or_404(ExportJob, token=token, estado=ExportJob.STATUS_DONE)
+    path = job_path(job)
+    if not path.exists():
+        raise Http404("El archivo de la exportación ya no está disponible.")
+    content_type = (
+        'text/csv; charset=utf-8' if job.formato == 'csv'
+        else 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    filename = f"estudiantes_{timezone.localtime(job.created_at).strftime('%Y%m%d_%H%M%S')}.{job.formato}"
+    return FileResponse(path.open('rb'), as_attachment=True, filename=filename, content_type=content_type)
+
+
+def reports_view(request: HttpRequest) -> HttpResponse:
+    """Inscripciones por mes, estados por cohorte y edades por carrera y grupo."""
+    reports = build_reports()
+    estados = reports['estados']
+    cohorts = [
+        {
+            'periodo': row['periodo'],
+            'total': row['total'],
+            'estados': [row['detalle'].get(estado, 0) for estado in estados],
+        }
+        for row in reversed(reports['cohortes'])
+    ]
+    charts = {
+        'enrollments': {
+            'labels': [row['periodo'] for row in reports['inscripciones']],
+            'values': [row['total'] for row in reports['inscripciones']],
+        },
+        'ages': {'labels': reports['edades']['rangos'], 'values': reports['edades']['totales']},
+    }
+    context = {'estados': estados, 'cohorts': cohorts, 'ages': reports['edades'], 'charts': charts}
+    return render(request, 'students/reports.html', context)
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Publica las métricas de rendimiento del proceso en JSON o texto de Prometheus."""
+    if not settings.PERFORMANCE_INSTRUMENTATION:
+        raise Http404("La instrumentación de rendimiento está desactivada.")
+    if not (settings.DEBUG or request.user.is_staff):
+        raise Http404
+    if request.GET.get('format') == 'prometheus':
+        return HttpResponse(prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+    return JsonResponse({'views': metrics_snapshot(), 'fragment_cache': fragment_cache.fragment_cache_stats()})